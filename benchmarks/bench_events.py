@@ -0,0 +1,108 @@
+"""
+事件分发基准测试。
+将录制的事件轨迹以最快速度回放到无头窗口中，统计 EventHandler.handle_event（包括 set_hover_ui 与
+Renderer.coordinate_hit_test）对每种事件的分发耗时百分位，以及总吞吐量（事件/秒）。
+回放不依赖真实时间，同样的轨迹、同样的参数总是产生同样的分发过程，可以作为回归基准。
+
+录制真实会话的轨迹：
+    window.event_recorder = fantas.EventRecorder("session.fevt")
+    window.mainloop()    # 退出主循环时自动保存
+
+用法：
+    python benchmarks/bench_events.py --trace session.fevt --json events.json
+    python benchmarks/bench_events.py --synthetic 20000    # 没有录制的轨迹时使用合成轨迹
+"""
+import random
+import argparse
+
+from common import fantas, summarize, print_table, write_json
+from bench_renderer import KINDS, build_tree
+
+def synthesize_trace(size: tuple[int, int], count: int, seed: int = 0) -> list[tuple[int, tuple]]:
+    """
+    合成一段事件轨迹：鼠标随机游走，夹杂点击、滚轮和键盘输入，每帧若干个事件。
+    Args:
+        size  (tuple[int, int]): 窗口尺寸。
+        count (int)            : 事件数量（近似）。
+        seed  (int)            : 随机种子。
+    Returns:
+        list[tuple[int, tuple]]: 帧列表，格式与 fantas.load_event_trace() 相同。
+    """
+    rng = random.Random(seed)
+    recorder = fantas.EventRecorder()
+    x, y = size[0] // 2, size[1] // 2
+    buttons = (0, 0, 0)
+    produced = 0
+    while produced < count:
+        events = []
+        for _ in range(rng.randrange(1, 6)):
+            dx, dy = rng.randrange(-24, 25), rng.randrange(-24, 25)
+            x, y = min(max(x + dx, 0), size[0] - 1), min(max(y + dy, 0), size[1] - 1)
+            events.append(fantas.Event(fantas.MOUSEMOTION, pos=(x, y), rel=(dx, dy), buttons=buttons, touch=False))
+            r = rng.random()
+            if r < 0.03:
+                buttons = (1, 0, 0) if buttons[0] == 0 else (0, 0, 0)
+                event_type = fantas.MOUSEBUTTONDOWN if buttons[0] else fantas.MOUSEBUTTONUP
+                events.append(fantas.Event(event_type, pos=(x, y), button=1, touch=False))
+            elif r < 0.05:
+                events.append(fantas.Event(fantas.MOUSEWHEEL, x=0, y=rng.choice((-1, 1)), flipped=False, precise_x=0.0, precise_y=float(rng.choice((-1, 1))), touch=False))
+            elif r < 0.08:
+                key = rng.randrange(ord("a"), ord("z") + 1)
+                events.append(fantas.Event(fantas.KEYDOWN, key=key, mod=0, unicode=chr(key), scancode=0))
+                events.append(fantas.Event(fantas.TEXTINPUT, text=chr(key)))
+                events.append(fantas.Event(fantas.KEYUP, key=key, mod=0, unicode=chr(key), scancode=0))
+        recorder.record(events)
+        produced += len(events)
+    return recorder.frames
+
+def main():
+    parser = argparse.ArgumentParser(description="事件分发基准测试")
+    parser.add_argument("--trace", default=None, help="事件轨迹文件，由 fantas.EventRecorder 录制")
+    parser.add_argument("--synthetic", type=int, default=20000, help="没有指定轨迹文件时，合成轨迹的事件数量")
+    parser.add_argument("--size", default="1920x1080", help="窗口尺寸，形如 1920x1080")
+    parser.add_argument("--kinds", default="gradient,image-ignore,image-scale,text", help="UI 树的元素种类，见 bench_renderer.py")
+    parser.add_argument("--count", type=int, default=200, help="UI 树顶层元素数量")
+    parser.add_argument("--depth", type=int, default=2, help="UI 树的层数")
+    parser.add_argument("--fanout", type=int, default=3, help="每个元素的子元素数量")
+    parser.add_argument("--repeat", type=int, default=3, help="回放次数")
+    parser.add_argument("--render", action="store_true", help="回放时每帧同时执行渲染")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--json", default=None, help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    kinds = tuple(k for k in args.kinds.split(",") if k)
+    for kind in kinds:
+        if kind not in KINDS:
+            raise SystemExit(f"未知的元素种类：{kind}")
+    frames = fantas.load_event_trace(args.trace) if args.trace else synthesize_trace(size, args.synthetic, args.seed)
+
+    window = fantas.HeadlessWindow(fantas.WindowConfig(window_size=size))
+    window.append(build_tree(size, kinds, args.count, args.depth, args.fanout, args.seed))
+    replayer = fantas.EventReplayer(frames)
+
+    latencies: dict[str, list[int]] = {}
+    total_events = total_ns = 0
+    for _ in range(args.repeat):
+        total_events += replayer.replay(window, args.render)
+        total_ns += replayer.total_ns
+        for event_type, samples in replayer.latencies.items():
+            latencies.setdefault(fantas.event.event_name(event_type), []).extend(samples)
+    latencies["All"] = [t for samples in latencies.values() for t in samples]
+
+    results = {name: summarize(samples) for name, samples in latencies.items()}
+    # 分发吞吐量只计算事件分发本身，总吞吐量还包括每帧的帧函数与渲染命令生成（以及渲染）
+    dispatch_ns = sum(latencies["All"])
+    results["All"]["events_per_s"] = total_events / dispatch_ns * 1e9 if dispatch_ns else 0.0
+    results["All"]["wall_events_per_s"] = total_events / total_ns * 1e9 if total_ns else 0.0
+    print(f"{len(frames)} 帧，{total_events // args.repeat} 个事件，回放 {args.repeat} 次")
+    print(f"分发吞吐量 {results['All']['events_per_s']:,.0f} 事件/秒，总吞吐量 {results['All']['wall_events_per_s']:,.0f} 事件/秒，分发耗时（毫秒）：")
+    print_table(results)
+    if args.json:
+        params = vars(args).copy()
+        del params["json"]
+        params["frames"] = len(frames)
+        write_json(args.json, "events", params, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+渲染器基准测试。
+用参数化的合成 UI 树（Label、Text、TextLabel、各种 FillMode 的 Image、LinearGradientLabel）在无头窗口中运行若干帧，
+分别统计 PreRender（生成渲染命令）、Render（执行渲染命令）和 HitTest（坐标命中测试）三个阶段的耗时百分位。
+
+用法：
+    python benchmarks/bench_renderer.py --count 500 --depth 2 --frames 200 --json result.json
+    python benchmarks/compare.py base.json result.json
+"""
+import random
+import argparse
+
+from common import fantas, summarize, print_table, write_json
+
+KINDS = ("label", "text", "textlabel", "gradient") + tuple(f"image-{mode.name.lower()}" for mode in fantas.FillMode)
+
+LOREM = "The quick brown fox jumps over the lazy dog. 敏捷的棕色狐狸跳过了懒狗。"
+
+def make_element(kind: str, rect: fantas.Rect, rng: random.Random, assets: dict) -> fantas.UI:
+    """
+    创建一个指定种类的元素。
+    Args:
+        kind   (str)          : 元素种类，见 KINDS。
+        rect   (fantas.Rect)  : 元素区域（相对于父元素）。
+        rng    (random.Random): 随机数生成器。
+        assets (dict)         : 共享的字体与图像资源。
+    Returns:
+        fantas.UI: 元素。
+    """
+    color = fantas.Color(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+    if kind == "label":
+        label = fantas.Label(rect=rect)
+        label.label_style.bgcolor = color
+        label.label_style.border_radius = rng.choice((0, 6))
+        label.label_style.border_width = rng.choice((0, 2))
+        return label
+    if kind == "text":
+        return fantas.Text(rect=rect, text=LOREM, text_style=assets["text_style"].copy(), align_mode=rng.choice(tuple(fantas.TextAlignMode)))
+    if kind == "textlabel":
+        text_label = fantas.TextLabel(rect=rect, text=LOREM, text_style=assets["text_style"].copy(), align_mode=rng.choice(tuple(fantas.TextAlignMode)))
+        text_label.label_style.bgcolor = color
+        return text_label
+    if kind == "gradient":
+        return fantas.LinearGradientLabel(rect=rect, start_color=color, end_color=fantas.Color("#0063bf"), start_pos=rect.topleft, end_pos=rect.bottomright)
+    fill_mode = fantas.FillMode[kind.removeprefix("image-").upper()]
+    return fantas.Image(surface=assets["image"], rect=rect, fill_mode=fill_mode)
+
+def build_tree(size: tuple[int, int], kinds: tuple[str, ...], count: int, depth: int, fanout: int, seed: int = 0) -> fantas.UI:
+    """
+    构建合成 UI 树：count 个顶层元素，每个元素下有 fanout 个子元素，共 depth 层。
+    Args:
+        size   (tuple[int, int]): 窗口尺寸。
+        kinds  (tuple[str, ...]): 参与构建的元素种类，按顺序循环使用。
+        count  (int)            : 顶层元素数量。
+        depth  (int)            : 树的层数（1 表示没有嵌套）。
+        fanout (int)            : 每个元素的子元素数量。
+        seed   (int)            : 随机种子。
+    Returns:
+        fantas.UI: 根节点。
+    """
+    rng = random.Random(seed)
+    assets = {"text_style": fantas.TextStyle(font=fantas.Font(None), size=14), "image": fantas.Surface((37, 23))}
+    assets["image"].fill((200, 120, 40))
+    assets["image"].fill((40, 80, 200), (0, 0, 18, 11))
+    counter = iter(range(1 << 62))
+
+    def populate(parent: fantas.UI, area: tuple[int, int], level: int, n: int):
+        w, h = area
+        for _ in range(n):
+            ew, eh = rng.randrange(w // 4 + 1, w // 2 + 2), rng.randrange(h // 4 + 1, h // 2 + 2)
+            rect = fantas.Rect(rng.randrange(0, max(1, w - ew)), rng.randrange(0, max(1, h - eh)), ew, eh)
+            element = make_element(kinds[next(counter) % len(kinds)], rect, rng, assets)
+            parent.append(element)
+            # Text 不能包含子元素
+            if level < depth and element.children is not None:
+                populate(element, (ew, eh), level + 1, fanout)
+
+    root = fantas.UI()
+    populate(root, size, 1, count)
+    return root
+
+def main():
+    parser = argparse.ArgumentParser(description="渲染器基准测试")
+    parser.add_argument("--size", default="1920x1080", help="窗口尺寸，形如 1920x1080")
+    parser.add_argument("--kinds", default=",".join(KINDS), help=f"元素种类，逗号分隔，可选：{', '.join(KINDS)}")
+    parser.add_argument("--count", type=int, default=200, help="顶层元素数量")
+    parser.add_argument("--depth", type=int, default=1, help="树的层数")
+    parser.add_argument("--fanout", type=int, default=3, help="每个元素的子元素数量")
+    parser.add_argument("--frames", type=int, default=200, help="计时的帧数")
+    parser.add_argument("--warmup", type=int, default=10, help="预热的帧数（不计时）")
+    parser.add_argument("--hit-tests", type=int, default=100, help="每帧的命中测试次数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--json", default=None, help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    kinds = tuple(k for k in args.kinds.split(",") if k)
+    for kind in kinds:
+        if kind not in KINDS:
+            raise SystemExit(f"未知的元素种类：{kind}")
+    # Label 的绘制依赖 fantas.draw.aarect，旧版本的 pygame-ce 没有这个函数
+    if not hasattr(fantas.draw, "aarect") and {"label", "textlabel"} & set(kinds):
+        print("当前 pygame-ce 版本不支持 fantas.draw.aarect，已跳过 label 和 textlabel。")
+        kinds = tuple(k for k in kinds if k not in ("label", "textlabel"))
+
+    window = fantas.HeadlessWindow(fantas.WindowConfig(window_size=size))
+    tree = build_tree(size, kinds, args.count, args.depth, args.fanout, args.seed)
+    window.append(tree)
+    renderer, root_ui, screen = window.renderer, window.root_ui, window.screen
+    get_time_ns = fantas.get_time_ns
+    rng = random.Random(args.seed)
+    points = [(rng.randrange(size[0]), rng.randrange(size[1])) for _ in range(args.hit_tests)]
+
+    phases = {"PreRender": [], "Render": [], "HitTest": [], "Frame": []}
+    for frame in range(args.warmup + args.frames):
+        t0 = get_time_ns()
+        renderer.pre_render(root_ui)
+        t1 = get_time_ns()
+        renderer.render(screen)
+        t2 = get_time_ns()
+        for point in points:
+            renderer.coordinate_hit_test(point)
+        t3 = get_time_ns()
+        if frame >= args.warmup:
+            phases["PreRender"].append(t1 - t0)
+            phases["Render"].append(t2 - t1)
+            phases["HitTest"].append(t3 - t2)
+            phases["Frame"].append(t3 - t0)
+
+    results = {name: summarize(samples) for name, samples in phases.items()}
+    print(f"{len(renderer.queue)} 条渲染命令，{args.frames} 帧（毫秒）：")
+    print_table(results)
+    if args.json:
+        params = {**vars(args), "kinds": kinds, "commands": len(renderer.queue)}
+        del params["json"]
+        write_json(args.json, "renderer", params, results)
+
+if __name__ == "__main__":
+    main()
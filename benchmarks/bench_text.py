@@ -0,0 +1,163 @@
+"""
+文本排版与字体度量微基准测试。
+覆盖 Font.get_widthes、Font.auto_wrap 以及 TextRenderCommand.render_*（每一种 TextAlignMode），
+分别在冷缓存（每次计时前清空 fantas 的度量缓存）和热缓存下运行，语料包括拉丁文与中日韩文字、短标签与 100 KB 日志。
+报告每次调用耗时的百分位与吞吐量（字符/秒），并用 tracemalloc 统计度量缓存占用的内存。
+
+用法：
+    python benchmarks/bench_text.py --repeat 20 --json text.json
+    python benchmarks/bench_text.py --font /path/to/NotoSansCJK.ttc    # 默认字体不包含中日韩字形，只影响渲染，不影响度量
+"""
+import random
+import argparse
+import tracemalloc
+
+from common import fantas, summarize, print_table, write_json
+
+# fantas 中与文本排版相关的 LRU 缓存
+CACHES = {
+    "get_rect"                : fantas.Font.get_rect,
+    "_get_width_char_kerning" : fantas.Font._get_width_char_kerning,
+    "get_widthes"             : fantas.Font.get_widthes,
+    "auto_wrap"               : fantas.Font.auto_wrap,
+}
+
+LATIN_WORDS = ("snapshot", "volume", "hash", "verified", "chunk", "restore", "pending", "ok", "error", "retry", "the", "of", "and", "to", "in")
+CJK_CHARS = "快照卷哈希校验数据块恢复等待成功错误重试的了和是在中文字体排版测试日志服务器状态备份完成"
+
+def clear_caches():
+    """ 清空所有文本度量缓存。 """
+    for cache in CACHES.values():
+        cache.cache_clear()
+
+def make_corpus(kind: str, length: int, rng: random.Random) -> str:
+    """
+    生成测试语料。
+    Args:
+        kind   (str)          : 'latin' 或 'cjk'。
+        length (int)          : 目标字符数。
+        rng    (random.Random): 随机数生成器。
+    Returns:
+        str: 语料，长语料按行组织，模拟日志。
+    """
+    lines, total = [], 0
+    while total < length:
+        if kind == "latin":
+            line = f"[{total:08d}] " + " ".join(rng.choice(LATIN_WORDS) for _ in range(rng.randrange(4, 16)))
+        else:
+            line = f"[{total:08d}] " + "".join(rng.choice(CJK_CHARS) for _ in range(rng.randrange(8, 40)))
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:length]
+
+def make_cases(style: fantas.TextStyle, width: int, corpora: dict[str, str]) -> dict:
+    """
+    生成测试用例：名称 -> (被测函数, 每次调用处理的字符数)。
+    Args:
+        style   (fantas.TextStyle): 文本样式。
+        width   (int)             : 换行宽度与渲染区域宽度（像素）。
+        corpora (dict[str, str])  : 语料名称到语料的映射。
+    Returns:
+        dict: 测试用例。
+    """
+    font, flag, size = style.font, style.style_flag, style.size
+    target = fantas.Surface((width, 600))
+    cases = {}
+    for name, text in corpora.items():
+        lines = text.splitlines()
+        chars = sum(map(len, lines))
+        cases[f"get_widthes/{name}"] = (lambda lines=lines: [font.get_widthes(flag, size, line) for line in lines], chars)
+        cases[f"auto_wrap/{name}"] = (lambda text=text: font.auto_wrap(flag, size, text, width), len(text))
+        for align_mode in fantas.TextAlignMode:
+            command = fantas.TextRenderCommand(creator=None)
+            command.text = text
+            command.style = style
+            command.align_mode = align_mode
+            command.rect = fantas.IntRect(0, 0, width, 600)
+            command.offset = (0, 0)
+            cases[f"render_{align_mode.name}/{name}"] = (lambda command=command: command.render(target), len(text))
+    return cases
+
+def measure_time(func, repeat: int, cold: bool) -> list[int]:
+    """
+    重复调用并返回每次耗时（纳秒）。
+    Args:
+        func   (Callable): 被测函数。
+        repeat (int)     : 重复次数。
+        cold   (bool)    : 是否在每次调用前清空缓存。
+    Returns:
+        list[int]: 每次调用的耗时。
+    """
+    get_time_ns = fantas.get_time_ns
+    samples = []
+    if not cold:
+        func()
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        t = get_time_ns()
+        func()
+        samples.append(get_time_ns() - t)
+    return samples
+
+def measure_cache_memory(func) -> dict:
+    """
+    统计从空缓存开始调用一次后，缓存新增的条目数与内存占用。
+    Args:
+        func (Callable): 被测函数。
+    Returns:
+        dict: cache_kib（新增内存，KiB）以及各个缓存的条目数。
+    """
+    clear_caches()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"cache_kib": grown / 1024, **{f"{name}_entries": cache.cache_info().currsize for name, cache in CACHES.items()}}
+
+def main():
+    parser = argparse.ArgumentParser(description="文本排版与字体度量微基准测试")
+    parser.add_argument("--font", default=None, help="字体文件路径，默认使用 pygame 内置字体")
+    parser.add_argument("--size", type=float, default=16.0, help="字号")
+    parser.add_argument("--width", type=int, default=480, help="换行宽度（像素）")
+    parser.add_argument("--short", type=int, default=24, help="短标签的字符数")
+    parser.add_argument("--long", type=int, default=100 * 1024, help="长日志的字符数")
+    parser.add_argument("--repeat", type=int, default=10, help="每个用例的计时次数")
+    parser.add_argument("--filter", default="", help="只运行名称包含这个字符串的用例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--json", default=None, help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    fantas.HeadlessWindow(fantas.WindowConfig(window_size=(1, 1)))    # 确保视频模式已经设置
+    rng = random.Random(args.seed)
+    style = fantas.TextStyle(font=fantas.Font(args.font), size=args.size)
+    corpora = {
+        "latin-short": make_corpus("latin", args.short, rng),
+        "cjk-short"  : make_corpus("cjk", args.short, rng),
+        "latin-long" : make_corpus("latin", args.long, rng),
+        "cjk-long"   : make_corpus("cjk", args.long, rng),
+    }
+    cases = {name: case for name, case in make_cases(style, args.width, corpora).items() if args.filter in name}
+
+    results = {}
+    for name, (func, chars) in cases.items():
+        # 短语料单次调用太快，重复更多次以得到稳定的统计
+        repeat = args.repeat * (50 if name.endswith("-short") else 1)
+        for cache_state in ("cold", "warm"):
+            stats = summarize(measure_time(func, repeat, cache_state == "cold"))
+            stats["chars"] = chars
+            stats["mchars_per_s"] = chars / stats["p50"] / 1e3 if stats["p50"] else 0.0
+            if cache_state == "cold":
+                stats.update(measure_cache_memory(func))
+            results[f"{name}/{cache_state}"] = stats
+
+    print_table(results, ("p50", "p99", "mchars_per_s", "cache_kib"))
+    if args.json:
+        params = vars(args).copy()
+        del params["json"]
+        write_json(args.json, "text", params, results)
+
+if __name__ == "__main__":
+    main()
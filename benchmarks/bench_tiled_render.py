@@ -0,0 +1,114 @@
+"""
+分块并行渲染基准测试。
+在离屏 Surface 上构建一个大尺寸的合成 UI 树，比较串行渲染与不同线程数、块尺寸下分块渲染的耗时，
+并在计时前校验分块渲染的结果与串行渲染逐像素一致。
+
+用法：
+    python benchmarks/bench_tiled_render.py --size 3840x2160 --frames 30 --workers 1,2,4,8 --json result.json
+    python benchmarks/compare.py base.json result.json
+"""
+import random
+import argparse
+
+from common import fantas, summarize, print_table, write_json
+
+def build_scene(size: tuple[int, int], count: int, labels: bool, seed: int = 0) -> fantas.UI:
+    """
+    构建合成 UI 树。
+    Args:
+        size   (tuple[int, int]): 目标尺寸。
+        count  (int)            : 元素数量。
+        labels (bool)           : 是否包含 Label 元素（依赖 fantas.draw.aarect）。
+        seed   (int)            : 随机种子。
+    Returns:
+        fantas.UI: 根节点。
+    """
+    rng = random.Random(seed)
+    w, h = size
+    root = fantas.UI()
+    root.append(fantas.LinearGradientLabel(
+        rect        = fantas.IntRect(0, 0, w, h),
+        start_color = fantas.Color("#66e370"),
+        end_color   = fantas.Color("#0063bf"),
+        start_pos   = (0, 0),
+        end_pos     = (w, 0),
+    ))
+    tile = fantas.Surface((37, 23))
+    tile.fill((200, 120, 40))
+    tile.fill((40, 80, 200), (0, 0, 18, 11))
+    icon = fantas.Surface((48, 48), fantas.SRCALPHA)
+    icon.fill((255, 255, 255, 128))
+    for i in range(count):
+        x, y = rng.randrange(0, w - 200), rng.randrange(0, h - 200)
+        kind = i % (3 if labels else 2)
+        if kind == 0:
+            root.append(fantas.Image(surface=icon, rect=fantas.Rect(x, y, 48, 48)))
+        elif kind == 1:
+            root.append(fantas.Image(surface=tile, rect=fantas.Rect(x, y, rng.randrange(50, 200), rng.randrange(50, 200)), fill_mode=fantas.FillMode.REPEAT))
+        else:
+            label = fantas.Label(rect=fantas.Rect(x, y, rng.randrange(40, 200), rng.randrange(20, 120)))
+            label.label_style.bgcolor = fantas.Color(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            label.label_style.border_radius = 6
+            root.append(label)
+    return root
+
+def time_frames(renderer: fantas.Renderer, surface: fantas.Surface, frames: int) -> list[int]:
+    """
+    渲染若干帧并返回每帧耗时（纳秒）。
+    """
+    times = []
+    for _ in range(frames):
+        t = fantas.get_time_ns()
+        renderer.render(surface)
+        times.append(fantas.get_time_ns() - t)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="分块并行渲染基准测试")
+    parser.add_argument("--size", default="3840x2160", help="目标尺寸，形如 3840x2160")
+    parser.add_argument("--count", type=int, default=600, help="元素数量")
+    parser.add_argument("--frames", type=int, default=30, help="每个配置渲染的帧数")
+    parser.add_argument("--workers", default="1,2,4,8", help="线程数列表，逗号分隔")
+    parser.add_argument("--tile-sizes", default="256,512", help="块边长列表，逗号分隔")
+    parser.add_argument("--labels", action="store_true", help="包含 Label 元素")
+    parser.add_argument("--json", default=None, help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    # Label 的绘制依赖 fantas.draw.aarect，旧版本的 pygame-ce 没有这个函数
+    if args.labels and not hasattr(fantas.draw, "aarect"):
+        print("当前 pygame-ce 版本不支持 fantas.draw.aarect，已跳过 Label。")
+        args.labels = False
+    surface = fantas.Surface(size)
+    renderer = fantas.Renderer(window=None)
+    renderer.pre_render(build_scene(size, args.count, args.labels))
+
+    # 预热（生成渐变缓存），并得到串行渲染的参考结果
+    renderer.render(surface)
+    renderer.render(surface)
+    reference = fantas.image.tobytes(surface, "RGBA")
+    results = {"serial": summarize(time_frames(renderer, surface, args.frames))}
+
+    for tile_size in (int(v) for v in args.tile_sizes.split(",")):
+        for workers in (int(v) for v in args.workers.split(",")):
+            renderer.enable_tiled_rendering(tile_size, workers)
+            surface.fill((0, 0, 0))
+            renderer.render(surface)
+            if fantas.image.tobytes(surface, "RGBA") != reference:
+                raise SystemExit(f"分块渲染结果与串行渲染不一致：tile_size={tile_size}, workers={workers}")
+            results[f"tile{tile_size}-x{workers}"] = summarize(time_frames(renderer, surface, args.frames))
+            renderer.disable_tiled_rendering()
+
+    # 加速比（相对串行渲染的中位数）
+    serial_p50 = results["serial"]["p50"]
+    for stats in results.values():
+        stats["speedup"] = serial_p50 / stats["p50"] if stats["p50"] else 0.0
+    print(f"{len(renderer.queue)} 条渲染命令，{args.frames} 帧（毫秒，speedup 为相对串行渲染中位数的加速比）：")
+    print_table(results, ("mean", "p50", "p90", "max", "speedup"))
+    if args.json:
+        params = {**vars(args), "commands": len(renderer.queue)}
+        del params["json"]
+        write_json(args.json, "tiled_render", params, results)
+
+if __name__ == "__main__":
+    main()
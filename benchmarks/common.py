@@ -0,0 +1,108 @@
+"""
+基准测试公共工具：统计、运行环境信息与 JSON 结果读写。
+各个基准测试脚本都以相同的格式输出结果，便于用 compare.py 比较不同提交之间的差异。
+"""
+import os
+import sys
+import json
+import platform
+import subprocess
+from pathlib import Path
+
+# 基准测试在无头模式下运行，并且总是使用仓库中的 fantas 而不是已安装的版本
+os.environ.setdefault('FANTAS_HEADLESS', '1')
+os.environ.setdefault('FANTAS_DEBUG_OFF', '1')
+REPO_PATH = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_PATH))
+
+import fantas
+import pygame
+
+PERCENTILES = (50, 90, 95, 99)    # 默认报告的百分位
+
+def percentile(sorted_samples: list[int | float], p: float) -> float:
+    """
+    计算已排序样本的百分位数（线性插值）。
+    Args:
+        sorted_samples (list[int | float]): 已升序排序的样本。
+        p              (float)            : 百分位（0 ~ 100）。
+    Returns:
+        float: 百分位数。
+    """
+    if not sorted_samples:
+        return 0.0
+    k = (len(sorted_samples) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (k - lo)
+
+def summarize(samples_ns: list[int]) -> dict[str, float]:
+    """
+    统计一组耗时样本。
+    Args:
+        samples_ns (list[int]): 耗时样本（纳秒）。
+    Returns:
+        dict[str, float]: 统计结果（毫秒），包括 mean、min、max 以及各个百分位 p50、p90……
+    """
+    s = sorted(samples_ns)
+    if not s:
+        return {"count": 0}
+    result = {"count": len(s), "mean": sum(s) / len(s) / 1e6, "min": s[0] / 1e6, "max": s[-1] / 1e6}
+    for p in PERCENTILES:
+        result[f"p{p}"] = percentile(s, p) / 1e6
+    return result
+
+def git_revision() -> dict[str, str | bool | None]:
+    """
+    获取仓库当前的提交信息。
+    Returns:
+        dict: commit（提交哈希，不是 git 仓库时为 None）与 dirty（工作区是否有未提交的修改）。
+    """
+    try:
+        commit = subprocess.run(("git", "rev-parse", "HEAD"), cwd=REPO_PATH, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(("git", "status", "--porcelain", "--untracked-files=no"), cwd=REPO_PATH, capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+def environment() -> dict:
+    """
+    获取运行环境信息，写入结果文件便于排查不同机器间的差异。
+    Returns:
+        dict: 运行环境信息。
+    """
+    return {
+        "python"      : platform.python_version(),
+        "pygame"      : pygame.version.ver,
+        "sdl"         : ".".join(map(str, pygame.get_sdl_version())),
+        "fantas"      : fantas.__version__,
+        "platform"    : platform.platform(),
+        "cpu_count"   : os.cpu_count(),
+        "video_driver": fantas.display.get_driver() if fantas.display.get_init() else None,
+        **git_revision(),
+    }
+
+def print_table(rows: dict[str, dict[str, float]], columns: tuple[str, ...] = ("mean", "p50", "p90", "p99", "max")):
+    """
+    以表格形式打印统计结果（毫秒）。
+    Args:
+        rows    (dict[str, dict[str, float]]): 行名到统计结果的映射。
+        columns (tuple[str, ...])            : 要打印的列。
+    """
+    width = max((len(name) for name in rows), default=8) + 2
+    column_widths = [max(10, len(c) + 2) for c in columns]
+    print(f"{'':<{width}}" + "".join(f"{c:>{w}}" for c, w in zip(columns, column_widths)))
+    for name, stats in rows.items():
+        print(f"{name:<{width}}" + "".join(f"{stats.get(c, 0.0):>{w}.3f}" for c, w in zip(columns, column_widths)))
+
+def write_json(path: str | Path, benchmark: str, params: dict, results: dict):
+    """
+    将结果写入 JSON 文件。
+    Args:
+        path      (str | Path): 输出路径。
+        benchmark (str)       : 基准测试名称。
+        params    (dict)      : 运行参数。
+        results   (dict)      : 结果，约定为 名称 -> summarize() 的统计结果。
+    """
+    data = {"benchmark": benchmark, "environment": environment(), "params": params, "results": results}
+    Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,45 @@
+"""
+比较两次基准测试的 JSON 结果，列出各项统计值的变化，超过阈值的变慢会被标记出来。
+
+用法：
+    python benchmarks/compare.py base.json head.json --metric p50 --threshold 0.05
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+def main():
+    parser = argparse.ArgumentParser(description="比较两次基准测试结果")
+    parser.add_argument("base", help="基准结果 JSON 文件")
+    parser.add_argument("head", help="新结果 JSON 文件")
+    parser.add_argument("--metric", default="p50", help="比较的统计值，比如 mean、p50、p99")
+    parser.add_argument("--threshold", type=float, default=0.05, help="变慢超过这个比例视为退化")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    if base["benchmark"] != head["benchmark"]:
+        raise SystemExit(f"不是同一个基准测试：{base['benchmark']} / {head['benchmark']}")
+    if base["params"] != head["params"]:
+        print("警告：两次运行的参数不同。")
+    print(f"{base['environment'].get('commit')} -> {head['environment'].get('commit')}（{args.metric}）")
+
+    regressions = 0
+    width = max((len(name) for name in head["results"]), default=8) + 2
+    for name, stats in head["results"].items():
+        if name not in base["results"] or args.metric not in stats:
+            continue
+        old, new = base["results"][name][args.metric], stats[args.metric]
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  退化"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  提升"
+        print(f"{name:<{width}}{old:>12.4f}{new:>12.4f}{change:>+10.1%}{flag}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,10 @@ os.environ.update({
     'SDL_WINDOWS_ENABLE_MESSAGELOOP'      : '1',               # 启用 Windows 消息循环
     'SDL_QUIT_ON_LAST_WINDOW_CLOSE'       : '1',               # 在最后一个窗口关闭时退出应用程序
 })
+# 无头模式下使用 SDL 的离屏视频驱动和哑音频驱动（不覆盖显式指定的驱动）
+if os.environ.get('FANTAS_HEADLESS', '0') == '1':
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
 
 # 初始化 Pygame
 import pygame as pygame
@@ -43,6 +47,9 @@ import pygame.transform as transform
 # 导入 fantas 包的各个子模块
 from fantas.version       import *    # 版本信息
 from fantas.misc          import *    # 杂项工具
+from fantas.tracer        import *    # 性能追踪
+from fantas.sampler       import *    # 采样分析
+from fantas.histogram     import *    # 耗时直方图
 from fantas.fantas_typing import *    # 类型定义
 from fantas.constants     import *    # 常量定义
 from fantas.nodebase      import *    # 节点基类
@@ -51,16 +58,24 @@ from fantas.color         import *    # 颜色支持
 from fantas.font          import *    # 字体支持
 from fantas.style         import *    # 样式支持
 from fantas.resource      import *    # 资源管理
+from fantas.bundle        import *    # 资源包
 from fantas.window        import *    # 窗口管理
 from fantas.renderer      import *    # 渲染支持
+from fantas.profiler      import *    # 渲染开销分析
+from fantas.metrics       import *    # 常驻指标
+from fantas.memory        import *    # 内存统计
 from fantas.event_handler import *    # 事件处理
+from fantas.executor      import *    # 后台任务执行器
 from fantas.framefunc     import *    # 帧函数支持
 from fantas.ui            import *    # UI 基类
+from fantas.headless      import *    # 无头渲染
+from fantas.event_trace   import *    # 事件轨迹录制与回放
 
 # 如果在调试模式下，导入调试和 UDP 通信模块
 if os.environ.get('FANTAS_DEBUG_OFF', '0') != '1':
-    from fantas.udp   import *    # UDP 通信
-    from fantas.debug import *    # 调试功能
+    from fantas.udp            import *    # UDP 通信
+    from fantas.debug_protocol import *    # 调试通信协议
+    from fantas.debug          import *    # 调试功能
 
 # 先禁用所有事件，然后再根据需要启用特定事件
 event.set_blocked(None)
@@ -0,0 +1,394 @@
+from __future__ import annotations
+import io
+import os
+import json
+import mmap
+import struct
+import hashlib
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fantas
+
+__all__ = (
+    "BundleEntry",
+    "BundleReader",
+    "AssetBundle",
+    "AssetBundleBuilder",
+    "build_bundle",
+    "load_bundle",
+)
+
+# 文件头：魔数、版本、保留字段、索引偏移、索引长度
+BUNDLE_MAGIC   = b"FANTASPK"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER  = struct.Struct("<8sIIQQ")
+BUNDLE_ALIGN   = 64    # 数据块按 64 字节对齐（缓存行），预解码的像素数据可以直接作为 Surface 的像素缓冲区
+
+# 文件后缀 -> 资源类型
+BUNDLE_SUFFIXES = {
+    ".png" : "bitmap",
+    ".jpg" : "bitmap",
+    ".jpeg": "bitmap",
+    ".bmp" : "bitmap",
+    ".gif" : "bitmap",
+    ".webp": "bitmap",
+    ".tga" : "bitmap",
+    ".svg" : "svg",
+    ".ttf" : "font",
+    ".otf" : "font",
+    ".ttc" : "font",
+}
+
+# 预解码像素数据的格式，与 convert_alpha() 在常见平台（小端、32 位显示）上得到的格式相同
+PIXEL_FORMAT = "BGRA"
+
+class BundleReader(io.RawIOBase):
+    """
+    资源包中一个条目的只读文件对象，直接从内存映射中读取，不会复制整个条目。
+    可以传给 fantas.Font、fantas.image.load() 等接受文件对象的接口。
+    """
+    def __init__(self, buffer: memoryview):
+        """
+        初始化 BundleReader 实例。
+        Args:
+            buffer (memoryview): 条目的数据。
+        """
+        self.buffer = buffer
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        """
+        读取数据到缓冲区。
+        Args:
+            b: 可写的缓冲区。
+        Returns:
+            int: 读取的字节数。
+        """
+        n = min(len(b), len(self.buffer) - self.position)
+        if n <= 0:
+            return 0
+        b[:n] = self.buffer[self.position:self.position + n]
+        self.position += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        移动读取位置。
+        Args:
+            offset (int): 偏移量。
+            whence (int): 起点，io.SEEK_SET / io.SEEK_CUR / io.SEEK_END。
+        Returns:
+            int: 新的读取位置。
+        """
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = len(self.buffer) + offset
+        else:
+            raise ValueError(f"不支持的 whence：{whence}。")
+        if position < 0:
+            raise ValueError("读取位置不能小于 0。")
+        self.position = position
+        return position
+
+    def tell(self) -> int:
+        return self.position
+
+@dataclass(slots=True)
+class BundleEntry:
+    """
+    资源包中的一个条目。
+    Args:
+        bundle: 所属的资源包。
+        name  : 资源名称。
+        kind  : 资源类型，'bitmap'（编码的位图）、'pixels'（预解码的像素）、'svg'、'font' 或 'color'。
+        offset: 数据在资源包中的偏移。
+        length: 数据长度。
+        digest: 原始文件内容的 sha256（十六进制）。
+        suffix: 原始文件的后缀，用作解码时的格式提示。
+        size  : 预解码像素的尺寸 (宽, 高)。
+        format: 预解码像素的格式。
+        value : 颜色字符串。
+    """
+    bundle: AssetBundle = field(repr=False)
+    name  : str
+    kind  : str
+    offset: int                    = 0
+    length: int                    = 0
+    digest: str                    = field(default="", repr=False)
+    suffix: str                    = field(default="", repr=False)
+    size  : tuple[int, int] | None = None
+    format: str | None             = field(default=None, repr=False)
+    value : str | None             = None
+
+    @property
+    def buffer(self) -> memoryview:
+        """ 条目的数据（内存映射的切片，不复制）。 """
+        return self.bundle.view[self.offset:self.offset + self.length]
+
+    def open(self) -> BundleReader:
+        """
+        以只读文件对象的形式打开条目。
+        Returns:
+            BundleReader: 文件对象。
+        """
+        return BundleReader(self.buffer)
+
+    def load_surface(self) -> fantas.Surface:
+        """
+        解码图像条目。预解码的像素直接以内存映射作为像素缓冲区，不解码也不复制。
+        Returns:
+            fantas.Surface: 图像（未执行转换钩子）。
+        Raises:
+            ValueError: 条目不是位图。
+        """
+        if self.kind == "pixels":
+            return fantas.image.frombuffer(self.buffer, self.size, self.format)
+        if self.kind == "bitmap":
+            return fantas.image.load(self.open(), f"{self.name}{self.suffix}")
+        raise ValueError(f"资源 '{self.name}' 不是位图（{self.kind}）。")
+
+@dataclass(slots=True)
+class AssetBundle:
+    """
+    资源包，用内存映射打开由 AssetBundleBuilder 生成的单个文件，启动时只读取文件头和索引，
+    条目的数据在被使用时才由操作系统按页载入。
+    打开后可以通过 images.load_bundle()、fonts.load_bundle()、colors.load_bundle() 登记其中的资源，或直接使用 load_bundle()。
+    Args:
+        path: 资源包路径。
+    Raises:
+        ValueError: 文件不是资源包或版本不受支持。
+    """
+    path: Path | str
+
+    file   : io.BufferedReader | None  = field(default=None, init=False, repr=False)            # 文件对象
+    mapping: mmap.mmap | None          = field(default=None, init=False, repr=False)            # 内存映射
+    view   : memoryview | None         = field(default=None, init=False, repr=False)            # 内存映射的视图
+    entries: dict[str, BundleEntry]    = field(default_factory=dict, init=False, repr=False)    # 资源名称 -> 条目
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        self.file = open(self.path, "rb")
+        try:
+            # 写时复制的映射：预解码的像素需要可写的缓冲区，但从不写回文件
+            self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+            if len(self.mapping) < BUNDLE_HEADER.size:
+                raise ValueError(f"'{self.path}' 不是资源包。")
+            magic, version, _, index_offset, index_length = BUNDLE_HEADER.unpack_from(self.mapping)
+            if magic != BUNDLE_MAGIC:
+                raise ValueError(f"'{self.path}' 不是资源包。")
+            if version != BUNDLE_VERSION:
+                raise ValueError(f"不支持的资源包版本：{version}。")
+            self.view = memoryview(self.mapping)
+            index = json.loads(bytes(self.view[index_offset:index_offset + index_length]))
+        except BaseException:
+            self.close()
+            raise
+        for info in index:
+            if info.get("size") is not None:
+                info["size"] = tuple(info["size"])
+            entry = BundleEntry(self, **info)
+            self.entries[entry.name] = entry
+
+    def get(self, name: str) -> BundleEntry:
+        """
+        根据名称获取条目。
+        Args:
+            name (str): 资源名称。
+        Returns:
+            BundleEntry: 条目。
+        Raises:
+            KeyError: 条目不存在。
+        """
+        if name not in self.entries:
+            raise KeyError(f"资源包中没有资源 '{name}'。")
+        return self.entries[name]
+
+    def get_entries(self, *kinds: str) -> list[BundleEntry]:
+        """
+        获取某几种类型的所有条目。
+        Args:
+            kinds (str): 资源类型。
+        Returns:
+            list[BundleEntry]: 条目，按照写入的顺序。
+        """
+        return [entry for entry in self.entries.values() if entry.kind in kinds]
+
+    def close(self):
+        """
+        关闭资源包。仍有字体或预解码的 Surface 引用内存映射时无法关闭映射（BufferError），需要先卸载它们。
+        """
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+@dataclass(slots=True)
+class AssetBundleBuilder:
+    """
+    资源包生成器，把散落的图像、SVG、字体和颜色打包为一个文件（构建步骤中使用）。
+    Args:
+        predecode: 是否默认把位图预解码为像素数据。预解码的位图启动时不需要解码，但文件更大。
+    """
+    predecode: bool = False
+
+    entries: list[dict]   = field(default_factory=list, init=False, repr=False)    # 条目信息（不含偏移）
+    blobs  : list[bytes]  = field(default_factory=list, init=False, repr=False)    # 条目数据，与 entries 一一对应
+    names  : set[str]     = field(default_factory=set, init=False, repr=False)     # 已使用的资源名称
+
+    def add_data(self, name: str, kind: str, data: bytes, **info):
+        """
+        添加一个条目。
+        Args:
+            name (str): 资源名称。
+            kind (str): 资源类型。
+            data (bytes): 条目数据。
+            info: 其他条目信息（suffix、size、format、value）。
+        Raises:
+            ValueError: 资源名称已存在。
+        """
+        if name in self.names:
+            raise ValueError(f"资源名称 '{name}' 已存在。")
+        self.names.add(name)
+        self.entries.append({"name": name, "kind": kind, "digest": hashlib.sha256(data).hexdigest(), **info})
+        self.blobs.append(data)
+
+    def add_bitmap(self, path: Path, alias: str = None, predecode: bool | None = None):
+        """
+        添加位图。
+        Args:
+            path (Path): 图像文件路径。
+            alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
+            predecode (bool | None, optional): 是否预解码为像素数据，为 None 时使用 self.predecode。
+        """
+        path = Path(path)
+        name = alias if alias else path.stem
+        if predecode is None:
+            predecode = self.predecode
+        if predecode:
+            surface = fantas.image.load(path)
+            data = fantas.image.tobytes(surface, PIXEL_FORMAT)
+            self.add_data(name, "pixels", data, suffix=path.suffix, size=surface.get_size(), format=PIXEL_FORMAT)
+        else:
+            self.add_data(name, "bitmap", path.read_bytes(), suffix=path.suffix)
+
+    def add_svg(self, path: Path, alias: str = None):
+        """
+        添加 SVG 图像，加载时登记为多尺寸 SVG 资源（见 images.register_svg()）。
+        Args:
+            path (Path): SVG 文件路径。
+            alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
+        """
+        path = Path(path)
+        self.add_data(alias if alias else path.stem, "svg", path.read_bytes(), suffix=path.suffix)
+
+    def add_font(self, path: Path, alias: str = None):
+        """
+        添加字体。
+        Args:
+            path (Path): 字体文件路径。
+            alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
+        """
+        path = Path(path)
+        self.add_data(alias if alias else path.stem, "font", path.read_bytes(), suffix=path.suffix)
+
+    def add_color(self, color: str, name: str = None):
+        """
+        添加颜色。
+        Args:
+            color (str): 颜色字符串（如 "#RRGGBBAA" 或 "red"）。
+            name (str, optional): 资源名称，默认为 None，使用颜色字符串作为资源名称。
+        """
+        fantas.Color(color)    # 提前检查颜色字符串
+        self.add_data(name if name else color, "color", b"", value=color)
+
+    def add_directory(self, directory: Path, predecode: bool | None = None):
+        """
+        按照文件后缀递归添加目录中的所有图像、SVG 和字体，资源名称为文件名（不含后缀）。
+        Args:
+            directory (Path): 目录。
+            predecode (bool | None, optional): 是否预解码位图，为 None 时使用 self.predecode。
+        """
+        for path in sorted(Path(directory).rglob("*")):
+            kind = BUNDLE_SUFFIXES.get(path.suffix.lower())
+            if kind is None or not path.is_file():
+                continue
+            if kind == "bitmap":
+                self.add_bitmap(path, predecode=predecode)
+            elif kind == "svg":
+                self.add_svg(path)
+            else:
+                self.add_font(path)
+
+    def write(self, path: Path | str) -> int:
+        """
+        写入资源包。先写入临时文件再替换，正在使用旧资源包的进程不受影响。
+        Args:
+            path (Path | str): 资源包路径。
+        Returns:
+            int: 资源包的字节数。
+        """
+        index = []
+        offset = BUNDLE_ALIGN
+        for info, data in zip(self.entries, self.blobs):
+            index.append({**info, "offset": offset, "length": len(data)})
+            offset += -(-len(data) // BUNDLE_ALIGN) * BUNDLE_ALIGN
+        index_data = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        temp = f"{path}.tmp"
+        with open(temp, "wb") as file:
+            file.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, offset, len(index_data)).ljust(BUNDLE_ALIGN, b"\0"))
+            for data in self.blobs:
+                file.write(data)
+                file.write(bytes(-len(data) % BUNDLE_ALIGN))
+            file.write(index_data)
+        os.replace(temp, path)
+        return offset + len(index_data)
+
+def build_bundle(output: Path | str, directories: Iterable[Path | str], colors: dict[str, str] | None = None, predecode: bool = False) -> int:
+    """
+    把若干目录中的资源和颜色打包为一个资源包。
+    Args:
+        output (Path | str): 资源包路径。
+        directories (Iterable[Path | str]): 资源目录。
+        colors (dict[str, str] | None): 颜色名称 -> 颜色字符串。
+        predecode (bool): 是否把位图预解码为像素数据。
+    Returns:
+        int: 资源包的字节数。
+    """
+    builder = AssetBundleBuilder(predecode)
+    for directory in directories:
+        builder.add_directory(directory)
+    for name, color in (colors or {}).items():
+        builder.add_color(color, name)
+    return builder.write(output)
+
+def load_bundle(path: Path | str, hook: Callable[[fantas.Surface], fantas.Surface] = fantas.resource.image_convert_alpha_hook, lazy: bool = True) -> AssetBundle:
+    """
+    打开资源包，并把其中的资源登记到 images、fonts 和 colors 中。
+    Args:
+        path (Path | str): 资源包路径。
+        hook (Callable[[fantas.Surface], fantas.Surface], optional): 编码的位图与 SVG 的转换钩子，默认为 image_convert_alpha_hook。
+        lazy (bool, optional): 是否在第一次 get() 时才解码位图。
+    Returns:
+        AssetBundle: 资源包，使用期间需要保持打开。
+    """
+    bundle = AssetBundle(path)
+    fantas.images.load_bundle(bundle, hook, lazy)
+    fantas.fonts.load_bundle(bundle)
+    fantas.colors.load_bundle(bundle)
+    return bundle
@@ -56,6 +56,7 @@ __all__ = [
     "WINDOWFOCUSGAINED",
     "WINDOWDISPLAYCHANGED",
     "DEBUGRECEIVED",
+    "EXECUTORDONE",
 
     "BUTTON_X1",
     "BUTTON_X2",
@@ -208,3 +209,4 @@ MOUSEENTERED  = custom_event(EventCategory.MOUSE)    # 鼠标进入事件
 MOUSELEAVED   = custom_event(EventCategory.MOUSE)    # 鼠标离开事件
 MOUSECLICKED  = custom_event(EventCategory.MOUSE)    # 有效单击事件
 DEBUGRECEIVED = custom_event()                       # 接收到调试信息事件
+EXECUTORDONE  = custom_event()                       # 后台任务完成事件
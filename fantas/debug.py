@@ -1,6 +1,7 @@
 import os
 import atexit
-import pickle
+import socket
+import selectors
 import threading
 import subprocess
 from queue import Queue
@@ -15,11 +16,13 @@ __all__ = (
 
 class DebugFlag(Flag):
     """ 调试选项标志枚举。 """
-    EVENTLOG     = 1    # 事件日志
-    TIMERECORD   = 2    # 时间记录
-    MOUSEMAGNIFY = 4    # 鼠标放大镜
+    EVENTLOG      = 1    # 事件日志
+    TIMERECORD    = 2    # 时间记录
+    MOUSEMAGNIFY  = 4    # 鼠标放大镜
+    RENDERPROFILE = 8    # 渲染开销分析
+    MEMORY        = 16   # 内存占用统计
 
-    ALL  = EVENTLOG | TIMERECORD | MOUSEMAGNIFY
+    ALL  = EVENTLOG | TIMERECORD | MOUSEMAGNIFY | RENDERPROFILE | MEMORY
     NONE = 0
 
 debug_received_event = fantas.Event(fantas.DEBUGRECEIVED)
@@ -28,8 +31,33 @@ class Debug:
     process: subprocess.Popen | None = None    # 调试窗口子进程对象
     queue: Queue = Queue()                     # 调试子进程返回队列
     debug_flag: DebugFlag = DebugFlag.NONE     # 当前调试选项标志
-    udp_socket = fantas.create_UDP_socket(port=0, timeout=1.0)    # UDP 通信套接字
+    udp_socket = fantas.create_UDP_socket(port=0, timeout=0.0)    # UDP 通信套接字（非阻塞，由读取线程通过 selectors 等待）
     reading: bool = False                      # 是否正在读取子进程输出
+    read_thread: threading.Thread | None = None    # 读取线程
+    wakeup_socket: socket.socket | None = None     # 唤醒读取线程的套接字（写入任意字节即可让读取线程退出）
+    debug_port: int | None = None              # 对端的 UDP 端口号
+    batching: bool = False                     # 是否批量发送（由调试主循环开启，每帧结束时调用 flush()）
+    batch: list[bytes] = []                    # 待发送的消息列表
+    batch_size: int = 0                        # 待发送消息的总字节数
+    latest: dict[fantas.DebugMessage, bytes] = {}    # 只保留最新一条的待发送消息（时间记录、鼠标放大镜截图）
+    dropped: int = 0                           # 丢弃的非法数据报数量
+    rate_limits: dict[fantas.DebugMessage, int] = {fantas.DebugMessage.EVENTLOG: 240}    # 各类消息每秒最多发送的数量，没有列出的类型不限制
+    rate_counts: dict[fantas.DebugMessage, int] = {}    # 当前一秒内各类消息已发送的数量
+    rate_window_start: int = 0                 # 当前频率统计窗口的开始时间点（纳秒）
+    coalesced: dict[fantas.DebugMessage, int] = {}      # 各类消息被合并（被同类型的更新消息替换）的累计数量
+    rate_dropped: dict[fantas.DebugMessage, int] = {}   # 各类消息因为超过频率限制而被丢弃的累计数量
+    stats_dirty: bool = False                  # 通道统计是否有变化，尚未发送
+    stats_time: int = 0                        # 上一次发送通道统计的时间点（纳秒）
+    stats_interval_ns: int = 500_000_000       # 发送通道统计的最小间隔（纳秒）
+    profile_time: int = 0                      # 上一次发送渲染开销的时间点（纳秒）
+    profile_interval_ns: int = 500_000_000     # 发送渲染开销的最小间隔（纳秒）
+    profile_top: int = 10                      # 发送渲染开销最大的 UI 元素数量
+    frame_stats_time: int = 0                  # 上一次发送帧耗时统计的时间点（纳秒）
+    frame_stats_interval_ns: int = 500_000_000 # 发送帧耗时统计的最小间隔（纳秒）
+    magnify_ring: fantas.MagnifyRing | None = None    # 鼠标放大镜截图的共享内存环形缓冲区
+    magnify_seq: int = 0                       # 最近一张鼠标放大镜截图的序号
+    magnify_time: int = 0                      # 最近一张鼠标放大镜截图的时间点（纳秒）
+    magnify_interval_ns: int = 1_000_000_000 // 30    # 鼠标放大镜截图的最小间隔（纳秒），与调试窗口的帧率一致
 
     @staticmethod
     def start_debug(flag: DebugFlag = DebugFlag.ALL, windows_title: str = "fantas 调试窗口"):
@@ -43,6 +71,12 @@ class Debug:
         Debug.close_debug()
         # 启动后台线程读取子进程输出
         Debug.start_read_thread()
+        # 鼠标放大镜截图通过共享内存传递，UDP 只发送序号
+        if DebugFlag.MOUSEMAGNIFY in flag:
+            try:
+                Debug.magnify_ring = fantas.MagnifyRing()
+            except OSError:
+                Debug.magnify_ring = None    # 不支持共享内存时退回 UDP 传输
         # 设置子进程的环境变量，确保可以找到 fantas 包
         env = os.environ.copy()
         env['PYTHONPATH'] = os.pathsep.join([
@@ -51,7 +85,7 @@ class Debug:
         ])
         # 使用同一个 Python 解释器，构建命令行参数
         import sys
-        cmd = [sys.executable, str(fantas.package_path() / "debug_window.py"), str(flag.value), windows_title, str(fantas.get_socket_port(Debug.udp_socket))]
+        cmd = [sys.executable, str(fantas.package_path() / "debug_window.py"), str(flag.value), windows_title, str(fantas.get_socket_port(Debug.udp_socket)), "" if Debug.magnify_ring is None else Debug.magnify_ring.name]
 
         # 启动子进程
         try:
@@ -78,7 +112,10 @@ class Debug:
         if Debug.process is not None:
             Debug.process.kill()
             Debug.process.wait()
-            Debug.reading = False
+        Debug.stop_read_thread()
+        if Debug.magnify_ring is not None:
+            Debug.magnify_ring.close()
+            Debug.magnify_ring = None
 
     @staticmethod
     def set_sendto_port(port: int):
@@ -89,39 +126,305 @@ class Debug:
         """
         Debug.debug_port = port
 
+    @staticmethod
+    def set_rate_limit(message_type: fantas.DebugMessage, limit: int | None):
+        """
+        设置一类调试消息每秒最多发送的数量，超过的消息会被丢弃并计数。
+        Args:
+            message_type (fantas.DebugMessage): 消息类型。
+            limit        (int | None)         : 每秒最多发送的数量，为 None 时不限制。
+        """
+        if limit is None:
+            Debug.rate_limits.pop(message_type, None)
+        else:
+            Debug.rate_limits[message_type] = limit
+
+    @staticmethod
+    def post_message(message: bytes, latest_only: bool = False):
+        """
+        发送一条已编码的调试消息，批量发送时会先放入待发送列表。
+        超过频率限制的消息会被丢弃，只保留最新一条的消息被替换时计为合并。
+        Args:
+            message     (bytes): 由 fantas.encode_* 编码的消息。
+            latest_only (bool) : 是否只保留同类型的最新一条消息（每帧最多发送一条）。
+        """
+        message_type = fantas.DebugMessage(message[0])
+        limit = Debug.rate_limits.get(message_type)
+        if limit is not None:
+            now = fantas.get_time_ns()
+            if now - Debug.rate_window_start >= 1_000_000_000:
+                Debug.rate_window_start = now
+                Debug.rate_counts.clear()
+            count = Debug.rate_counts.get(message_type, 0)
+            if count >= limit:
+                Debug.rate_dropped[message_type] = Debug.rate_dropped.get(message_type, 0) + 1
+                Debug.stats_dirty = True
+                return
+            Debug.rate_counts[message_type] = count + 1
+        if not Debug.batching:
+            Debug.send_datagram([message])
+            return
+        if latest_only:
+            if message_type in Debug.latest:
+                Debug.count_coalesced(message_type)
+            Debug.latest[message_type] = message
+            return
+        # 超过单个数据报的容量则先发送已有的消息
+        if Debug.batch_size + len(message) > fantas.debug_protocol.MAX_DATAGRAM_SIZE:
+            Debug.flush()
+        Debug.batch.append(message)
+        Debug.batch_size += len(message)
+
+    @staticmethod
+    def count_coalesced(message_type: fantas.DebugMessage):
+        """
+        记录一条被合并的调试消息（被同类型的更新消息替换，或者多次请求合并为一次发送）。
+        Args:
+            message_type (fantas.DebugMessage): 消息类型。
+        """
+        Debug.coalesced[message_type] = Debug.coalesced.get(message_type, 0) + 1
+        Debug.stats_dirty = True
+
+    @staticmethod
+    def flush():
+        """
+        发送所有待发送的消息，调试主循环在每帧结束时调用。
+        通道统计有变化时会附带发送，间隔不小于 stats_interval_ns。
+        """
+        if Debug.stats_dirty:
+            now = fantas.get_time_ns()
+            if now - Debug.stats_time >= Debug.stats_interval_ns:
+                Debug.stats_time = now
+                Debug.stats_dirty = False
+                Debug.latest[fantas.DebugMessage.CHANNELSTATS] = fantas.encode_channel_stats(Debug.coalesced, Debug.rate_dropped)
+        if Debug.latest:
+            for message in Debug.latest.values():
+                if Debug.batch_size + len(message) > fantas.debug_protocol.MAX_DATAGRAM_SIZE:
+                    Debug.send_datagram(Debug.batch)
+                    Debug.batch = []
+                    Debug.batch_size = 0
+                Debug.batch.append(message)
+                Debug.batch_size += len(message)
+            Debug.latest.clear()
+        if Debug.batch:
+            Debug.send_datagram(Debug.batch)
+            Debug.batch = []
+            Debug.batch_size = 0
+
+    @staticmethod
+    def send_datagram(messages: list[bytes]):
+        """
+        将若干条消息打包为一个数据报并发送。
+        Args:
+            messages (list[bytes]): 已编码的消息列表。
+        """
+        if Debug.debug_port is None:
+            return
+        fantas.udp_send_data(Debug.udp_socket, fantas.pack_datagram(messages), ('127.0.0.1', Debug.debug_port))
+
     @staticmethod
     def send_debug_data(*data: object, prompt: str = "Debug"):
         """
-        发送调试数据到调试窗口子进程。
+        发送通用文本调试数据到对端，数据会被转换为字符串并以空格连接。
+        Args:
+            data   (object): 要发送的调试数据对象。
+            prompt (str)   : 提示词。
+        """
+        Debug.post_message(fantas.encode_text(prompt, ' '.join(map(str, data))))
+
+    @staticmethod
+    def send_event_log(event: fantas.Event):
+        """
+        发送事件日志到调试窗口。
+        Args:
+            event (fantas.Event): 事件对象。
+        """
+        Debug.post_message(fantas.encode_event_log(event))
+
+    @staticmethod
+    def send_time_records(time_records: dict[str, int]):
+        """
+        发送时间记录到调试窗口，每帧只发送最新的一条。
+        Args:
+            time_records (dict[str, int]): 时间记录字典（纳秒）。
+        """
+        Debug.post_message(fantas.encode_time_records(time_records), latest_only=True)
+
+    @staticmethod
+    def send_mouse_magnify(x: int, y: int, size: fantas.IntPoint, pixels: bytes):
+        """
+        发送鼠标放大镜截图到调试窗口，每帧只发送最新的一张。
         Args:
-            data (object): 要发送的调试数据对象。
+            x      (int)            : 鼠标在截图中的 x 坐标。
+            y      (int)            : 鼠标在截图中的 y 坐标。
+            size   (fantas.IntPoint): 截图尺寸（宽, 高）。
+            pixels (bytes)          : 截图像素数据（32 位 BGRA）。
         """
-        fantas.udp_send_data(Debug.udp_socket, pickle.dumps((prompt, *data)), ('127.0.0.1', Debug.debug_port))
+        Debug.post_message(fantas.encode_mouse_magnify(x, y, size, pixels), latest_only=True)
 
     @staticmethod
-    def read_debug_data():
+    def send_mouse_surface(surface: fantas.Surface, rect: fantas.IntRect, x: int, y: int) -> bool:
         """
-        从调试窗口子进程读取输出信息并放入队列。
+        发送鼠标放大镜截图到调试窗口，截图间隔不小于 magnify_interval_ns。
+        有共享内存环形缓冲区时截图直接绘制到共享内存中，只发送序号，否则通过 UDP 发送像素数据。
+        Args:
+            surface (fantas.Surface): 截图来源（一般是窗口 Surface）。
+            rect    (fantas.IntRect): 截图区域。
+            x       (int)           : 鼠标在截图中的 x 坐标。
+            y       (int)           : 鼠标在截图中的 y 坐标。
+        Returns:
+            bool: 是否发送了截图，没有发送时调用方应该稍后重试。
         """
-        while Debug.reading:
-            recv, _ = fantas.udp_receive_data(Debug.udp_socket)
-            if recv is not None:
-                if Debug.queue.empty():
-                    Debug.queue.put(pickle.loads(recv))
-                    fantas.event.post(debug_received_event)
-                else:
-                    Debug.queue.put(pickle.loads(recv))
-            else:
-                # 避免忙等待
-                fantas.time.delay(100)
+        now = fantas.get_time_ns()
+        if now - Debug.magnify_time < Debug.magnify_interval_ns:
+            return False
+        Debug.magnify_time = now
+        ring = Debug.magnify_ring
+        if ring is None:
+            Debug.send_mouse_magnify(x, y, rect.size, surface.subsurface(rect).convert_alpha().get_buffer().raw)
+            return True
+        Debug.magnify_seq = seq = Debug.magnify_seq + 1
+        pixels = ring.pixels(seq, rect.size)
+        shot = fantas.image.frombuffer(pixels, rect.size, "BGRA")
+        shot.blit(surface, (0, 0), rect)
+        # 释放对共享内存的引用，否则无法关闭共享内存
+        del shot
+        pixels.release()
+        ring.commit(seq, x, y, rect.size)
+        Debug.post_message(fantas.encode_mouse_magnify_frame(seq), latest_only=True)
+        return True
+
+    @staticmethod
+    def send_frame_stats(frame_stats: fantas.FrameStats):
+        """
+        发送帧耗时统计（各个阶段与整帧耗时的百分位数、超出帧预算的帧数）到调试窗口，间隔不小于 frame_stats_interval_ns。
+        Args:
+            frame_stats (fantas.FrameStats): 帧耗时统计。
+        """
+        now = fantas.get_time_ns()
+        if now - Debug.frame_stats_time < Debug.frame_stats_interval_ns:
+            return
+        Debug.frame_stats_time = now
+        Debug.post_message(fantas.encode_frame_stats(frame_stats), latest_only=True)
+
+    @staticmethod
+    def send_render_profile(profiler: fantas.RenderProfiler):
+        """
+        发送渲染开销最大的 profile_top 个 UI 元素到调试窗口，间隔不小于 profile_interval_ns。
+        Args:
+            profiler (fantas.RenderProfiler): 渲染开销分析器。
+        """
+        now = fantas.get_time_ns()
+        if now - Debug.profile_time < Debug.profile_interval_ns:
+            return
+        Debug.profile_time = now
+        Debug.post_message(fantas.encode_render_profile(profiler.top(Debug.profile_top)), latest_only=True)
+
+    @staticmethod
+    def send_memory_report(memory_tracker: fantas.MemoryTracker):
+        """
+        发送内存增长跟踪器最近一次的统计结果和增长速度到调试窗口，由跟踪器的采样间隔控制发送频率。
+        Args:
+            memory_tracker (fantas.MemoryTracker): 已经采样过的内存增长跟踪器。
+        """
+        if memory_tracker.last_report is not None:
+            Debug.post_message(fantas.encode_memory_report(memory_tracker), latest_only=True)
+
+    @staticmethod
+    def send_close_debug_window(flag: DebugFlag):
+        """
+        通知主程序调试窗口已关闭（由调试窗口子进程调用）。
+        Args:
+            flag (DebugFlag): 被关闭的调试窗口对应的调试选项标志。
+        """
+        Debug.post_message(fantas.encode_close_debug_window(flag))
+
+    @staticmethod
+    def send_mouse_magnify_ratio(ratio: int):
+        """
+        通知主程序鼠标放大倍数已改变（由调试窗口子进程调用）。
+        Args:
+            ratio (int): 放大倍数。
+        """
+        Debug.post_message(fantas.encode_mouse_magnify_ratio(ratio))
+
+    @staticmethod
+    def read_debug_data(wakeup: socket.socket):
+        """
+        读取线程主函数：阻塞等待数据报或唤醒信号，收到数据报时一次性读取所有待读的数据报。
+        Args:
+            wakeup (socket.socket): 唤醒套接字对的读取端，可读时线程退出。
+        """
+        selector = selectors.DefaultSelector()
+        selector.register(Debug.udp_socket, selectors.EVENT_READ)
+        selector.register(wakeup, selectors.EVENT_READ)
+        try:
+            while Debug.reading:
+                for key, _ in selector.select():
+                    if key.fileobj is wakeup:
+                        return
+                Debug.drain_debug_data()
+        finally:
+            selector.close()
+            wakeup.close()
+
+    @staticmethod
+    def drain_debug_data() -> int:
+        """
+        读取所有待读的数据报，把其中的调试消息放入队列，只接受来自对端端口的合法数据报。
+        每读取一批消息只发送一个 DEBUGRECEIVED 事件。
+        Returns:
+            int: 放入队列的消息数量。
+        """
+        count = 0
+        while True:
+            recv, addr = fantas.udp_receive_data(Debug.udp_socket)
+            if recv is None:
+                break
+            # 丢弃来自其他发送方的数据报
+            if Debug.debug_port is None or addr != ('127.0.0.1', Debug.debug_port):
+                Debug.dropped += 1
+                continue
+            try:
+                messages = fantas.decode_datagram(recv)
+            except ValueError:
+                Debug.dropped += 1
+                continue
+            for message in messages:
+                Debug.queue.put(message)
+            count += len(messages)
+        if count:
+            fantas.event.post(debug_received_event)
+        return count
 
     @staticmethod
     def start_read_thread():
         """
         启动读取调试窗口子进程输出的后台线程。
         """
+        Debug.stop_read_thread()
         Debug.reading = True
-        threading.Thread(target=Debug.read_debug_data, daemon=True).start()
+        Debug.wakeup_socket, wakeup = socket.socketpair()
+        Debug.read_thread = threading.Thread(target=Debug.read_debug_data, args=(wakeup,), daemon=True)
+        Debug.read_thread.start()
+
+    @staticmethod
+    def stop_read_thread():
+        """
+        唤醒并停止读取线程，等待其退出。
+        """
+        Debug.reading = False
+        if Debug.wakeup_socket is not None:
+            try:
+                Debug.wakeup_socket.send(b"\0")
+            except OSError:
+                pass
+            Debug.wakeup_socket.close()
+            Debug.wakeup_socket = None
+        if Debug.read_thread is not None:
+            if Debug.read_thread is not threading.current_thread():
+                Debug.read_thread.join(1.0)
+            Debug.read_thread = None
 
     @staticmethod
     def add_debug_flag(flag: DebugFlag):
@@ -0,0 +1,395 @@
+from __future__ import annotations
+import struct
+from enum import IntEnum
+from multiprocessing import shared_memory
+
+import fantas
+
+__all__ = (
+    "DebugMessage",
+    "MagnifyRing",
+    "TIME_LABELS",
+    "encode_text",
+    "encode_event_log",
+    "encode_time_records",
+    "encode_mouse_magnify",
+    "encode_mouse_magnify_frame",
+    "encode_close_debug_window",
+    "encode_mouse_magnify_ratio",
+    "encode_channel_stats",
+    "encode_render_profile",
+    "encode_frame_stats",
+    "encode_memory_report",
+    "pack_datagram",
+    "decode_datagram",
+)
+
+class DebugMessage(IntEnum):
+    """ 调试消息类型枚举。 """
+    TEXT                 = 0    # 通用文本消息（提示词 + 文本）
+    EVENTLOG             = 1    # 事件日志（事件类型 + 事件属性文本）
+    TIMERECORD           = 2    # 时间记录（固定布局）
+    MOUSEMAGNIFY         = 3    # 鼠标放大镜截图（坐标、尺寸 + 像素数据）
+    CLOSEDEBUGWINDOW     = 4    # 关闭调试窗口（调试选项标志）
+    SETMOUSEMAGNIFYRATIO = 5    # 设置鼠标放大倍数
+    MOUSEMAGNIFYFRAME    = 6    # 鼠标放大镜截图已写入共享内存（序号）
+    CHANNELSTATS         = 7    # 调试通道统计（各类消息被合并与丢弃的数量）
+    RENDERPROFILE        = 8    # 渲染开销最大的若干个 UI 元素
+    FRAMESTATS           = 9    # 各个阶段与整帧耗时的百分位数
+    MEMORY               = 10   # 内存占用统计与增长速度
+
+DATAGRAM_MAGIC    = b"FD"                      # 数据报魔数
+PROTOCOL_VERSION  = 1                          # 协议版本
+DATAGRAM_HEADER   = struct.Struct("<2sBH")     # 数据报头：魔数、协议版本、消息数量
+MESSAGE_HEADER    = struct.Struct("<BH")       # 消息头：消息类型、负载长度
+MAX_DATAGRAM_SIZE = 65000                      # 单个数据报的最大字节数（UDP 上限为 65507）
+MAX_PAYLOAD_SIZE  = 0xFFFF                     # 单条消息负载的最大字节数
+
+# 时间记录的固定标签表，顺序即负载中的字段顺序
+TIME_LABELS = ("Event", "FrameFunc", "PreRender", "Render", "Debug", "Idle")
+# 帧耗时统计的固定标签表（各个阶段 + 整帧）
+FRAMESTATS_LABELS = TIME_LABELS + ("Frame",)
+
+U32_LAYOUT          = struct.Struct("<I")                       # 单个无符号 32 位整数
+TIMERECORD_LAYOUT   = struct.Struct(f"<{len(TIME_LABELS)}Q")    # 各个标签的耗时（纳秒）
+MOUSEMAGNIFY_LAYOUT = struct.Struct("<4H")                      # 鼠标在截图中的坐标（x, y）与截图尺寸（宽, 高）
+CHANNELSTATS_LAYOUT = struct.Struct("<B2I")                     # 消息类型、被合并的数量、被丢弃的数量（重复若干次）
+FRAMESTATS_LAYOUT   = struct.Struct(f"<2Q{4 * len(FRAMESTATS_LABELS)}Q")    # 帧数、超出帧预算的帧数，之后每个标签依次为 p50、p95、p99、最大值（纳秒）
+RENDERPROFILE_LAYOUT = struct.Struct("<Q2dIB")                  # ui_id、每帧生成耗时、每帧执行耗时（纳秒）、每帧命令数 × 100、类名长度（之后是类名，重复若干次）
+MEMORY_LAYOUT       = struct.Struct(f"<Q{len(fantas.MEMORY_LABELS)}q{len(fantas.MEMORY_LABELS)}q{len(fantas.MEMORY_LABELS)}d")    # 节点数量，之后依次为每个分类的当前值、相对第一次采样的变化量、每小时增长速度
+
+def pack_message(message_type: DebugMessage, payload: bytes) -> bytes:
+    """
+    打包一条消息（消息头 + 负载）。
+    Args:
+        message_type (DebugMessage): 消息类型。
+        payload      (bytes)       : 负载。
+    Returns:
+        bytes: 打包后的消息。
+    Raises:
+        ValueError: 负载过长。
+    """
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError(f"调试消息负载过长：{len(payload)} 字节。")
+    return MESSAGE_HEADER.pack(message_type, len(payload)) + payload
+
+def encode_text(prompt: str, text: str) -> bytes:
+    """
+    编码通用文本消息，提示词以一个字节的长度作为前缀。
+    Args:
+        prompt (str): 提示词。
+        text   (str): 文本。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    prompt_bytes = prompt.encode("utf-8")[:255]
+    return pack_message(DebugMessage.TEXT, bytes((len(prompt_bytes),)) + prompt_bytes + text.encode("utf-8")[:MAX_PAYLOAD_SIZE - 256])
+
+def encode_event_log(event: fantas.Event) -> bytes:
+    """
+    编码事件日志消息，事件名称由接收方根据事件类型生成，只传输事件属性文本。
+    Args:
+        event (fantas.Event): 事件对象。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    return pack_message(DebugMessage.EVENTLOG, U32_LAYOUT.pack(event.type) + str(event.dict).encode("utf-8")[:MAX_PAYLOAD_SIZE - 4])
+
+def encode_time_records(time_records: dict[str, int]) -> bytes:
+    """
+    编码时间记录消息，按照 TIME_LABELS 的顺序写入各个标签的耗时，没有记录的标签为 0。
+    Args:
+        time_records (dict[str, int]): 时间记录字典（纳秒）。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    get = time_records.get
+    return pack_message(DebugMessage.TIMERECORD, TIMERECORD_LAYOUT.pack(*(get(label, 0) for label in TIME_LABELS)))
+
+def encode_mouse_magnify(x: int, y: int, size: fantas.IntPoint, pixels: bytes) -> bytes:
+    """
+    编码鼠标放大镜截图消息。
+    Args:
+        x      (int)            : 鼠标在截图中的 x 坐标。
+        y      (int)            : 鼠标在截图中的 y 坐标。
+        size   (fantas.IntPoint): 截图尺寸（宽, 高）。
+        pixels (bytes)          : 截图像素数据（32 位 BGRA，逐行紧密排列）。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    return pack_message(DebugMessage.MOUSEMAGNIFY, MOUSEMAGNIFY_LAYOUT.pack(x, y, *size) + pixels)
+
+def encode_mouse_magnify_frame(seq: int) -> bytes:
+    """
+    编码鼠标放大镜截图通知消息，截图本身在共享内存环形缓冲区中。
+    Args:
+        seq (int): 截图序号。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    return pack_message(DebugMessage.MOUSEMAGNIFYFRAME, U32_LAYOUT.pack(seq))
+
+def encode_close_debug_window(flag: fantas.DebugFlag) -> bytes:
+    """
+    编码关闭调试窗口消息。
+    Args:
+        flag (fantas.DebugFlag): 被关闭的调试窗口对应的调试选项标志。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    return pack_message(DebugMessage.CLOSEDEBUGWINDOW, U32_LAYOUT.pack(flag.value))
+
+def encode_mouse_magnify_ratio(ratio: int) -> bytes:
+    """
+    编码设置鼠标放大倍数消息。
+    Args:
+        ratio (int): 放大倍数。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    return pack_message(DebugMessage.SETMOUSEMAGNIFYRATIO, U32_LAYOUT.pack(ratio))
+
+def encode_channel_stats(coalesced: dict[DebugMessage, int], dropped: dict[DebugMessage, int]) -> bytes:
+    """
+    编码调试通道统计消息，只包含数量不为 0 的消息类型。
+    Args:
+        coalesced (dict[DebugMessage, int]): 各类消息被合并（被同类型的更新消息替换）的累计数量。
+        dropped   (dict[DebugMessage, int]): 各类消息因为超过频率限制而被丢弃的累计数量。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    pack = CHANNELSTATS_LAYOUT.pack
+    return pack_message(DebugMessage.CHANNELSTATS, b"".join(
+        pack(message_type, coalesced.get(message_type, 0) & 0xFFFFFFFF, dropped.get(message_type, 0) & 0xFFFFFFFF)
+        for message_type in DebugMessage if coalesced.get(message_type, 0) or dropped.get(message_type, 0)
+    ))
+
+def encode_render_profile(costs: list[fantas.RenderCost]) -> bytes:
+    """
+    编码渲染开销消息，耗时与命令数都换算为每帧平均值。
+    Args:
+        costs (list[fantas.RenderCost]): 按开销从大到小排列的渲染开销列表（一般是 RenderProfiler.top() 的结果）。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    pack = RENDERPROFILE_LAYOUT.pack
+    parts = []
+    for cost in costs:
+        passes = cost.passes or 1
+        name = cost.name.encode("utf-8")[:255]
+        parts.append(pack(cost.ui_id, cost.pre_render_ns / passes, cost.render_ns / passes, min(cost.commands * 100 // passes, 0xFFFFFFFF), len(name)) + name)
+    return pack_message(DebugMessage.RENDERPROFILE, b"".join(parts))
+
+def encode_frame_stats(frame_stats: fantas.FrameStats) -> bytes:
+    """
+    编码帧耗时统计消息，按照 FRAMESTATS_LABELS 的顺序写入各个标签的百分位数，没有记录的标签为 0。
+    Args:
+        frame_stats (fantas.FrameStats): 帧耗时统计。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    values = []
+    for label in FRAMESTATS_LABELS:
+        percentiles = frame_stats.percentiles(label)
+        values += (percentiles["p50"], percentiles["p95"], percentiles["p99"], percentiles["max"])
+    return pack_message(DebugMessage.FRAMESTATS, FRAMESTATS_LAYOUT.pack(frame_stats.frames, frame_stats.over_budget, *values))
+
+def encode_memory_report(memory_tracker: fantas.MemoryTracker) -> bytes:
+    """
+    编码内存占用消息，按照 MEMORY_LABELS 的顺序写入各个分类的当前值、变化量和增长速度。
+    Args:
+        memory_tracker (fantas.MemoryTracker): 已经采样过的内存增长跟踪器。
+    Returns:
+        bytes: 打包后的消息。
+    """
+    report = memory_tracker.last_report
+    return pack_message(DebugMessage.MEMORY, MEMORY_LAYOUT.pack(report.nodes, *report.values(), *memory_tracker.delta(), *memory_tracker.growth()))
+
+def pack_datagram(messages: list[bytes]) -> bytes:
+    """
+    将若干条消息打包为一个数据报。
+    Args:
+        messages (list[bytes]): 已打包的消息列表。
+    Returns:
+        bytes: 数据报。
+    """
+    return DATAGRAM_HEADER.pack(DATAGRAM_MAGIC, PROTOCOL_VERSION, len(messages)) + b"".join(messages)
+
+def decode_datagram(data: bytes) -> list[tuple]:
+    """
+    解码一个数据报。
+    Args:
+        data (bytes): 数据报。
+    Returns:
+        list[tuple]: 消息列表，每条消息是以 DebugMessage 开头的元组：
+            (TEXT, 提示词, 文本)
+            (EVENTLOG, 事件类型, 事件属性文本)
+            (TIMERECORD, 时间记录字典)
+            (MOUSEMAGNIFY, x, y, 宽, 高, 像素数据)
+            (CLOSEDEBUGWINDOW, 调试选项标志)
+            (SETMOUSEMAGNIFYRATIO, 放大倍数)
+            (MOUSEMAGNIFYFRAME, 截图序号)
+            (CHANNELSTATS, {消息类型: (被合并的数量, 被丢弃的数量)})
+            (RENDERPROFILE, [(ui_id, 类名, 每帧生成耗时, 每帧执行耗时, 每帧命令数), ...])
+            (FRAMESTATS, 帧数, 超出帧预算的帧数, {标签: (p50, p95, p99, 最大值)})
+            (MEMORY, 节点数量, {分类: (当前值, 变化量, 每小时增长速度)})
+    Raises:
+        ValueError: 数据报格式或协议版本不正确。
+    """
+    try:
+        magic, version, count = DATAGRAM_HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError("调试数据报过短。") from None
+    if magic != DATAGRAM_MAGIC:
+        raise ValueError("不是调试数据报。")
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"不支持的调试协议版本：{version}。")
+    view = memoryview(data)
+    offset = DATAGRAM_HEADER.size
+    messages = []
+    append = messages.append
+    for _ in range(count):
+        try:
+            message_type, length = MESSAGE_HEADER.unpack_from(data, offset)
+            message_type = DebugMessage(message_type)
+        except (struct.error, ValueError):
+            raise ValueError("调试数据报已损坏。") from None
+        offset += MESSAGE_HEADER.size
+        payload = view[offset:offset + length]
+        offset += length
+        if len(payload) != length:
+            raise ValueError("调试数据报已损坏。")
+        try:
+            if message_type is DebugMessage.EVENTLOG:
+                append((message_type, U32_LAYOUT.unpack_from(payload)[0], str(payload[U32_LAYOUT.size:], "utf-8", "replace")))
+            elif message_type is DebugMessage.TIMERECORD:
+                append((message_type, dict(zip(TIME_LABELS, TIMERECORD_LAYOUT.unpack(payload)))))
+            elif message_type is DebugMessage.MOUSEMAGNIFY:
+                x, y, w, h = MOUSEMAGNIFY_LAYOUT.unpack_from(payload)
+                pixels = payload[MOUSEMAGNIFY_LAYOUT.size:].tobytes()
+                if len(pixels) != w * h * 4:
+                    raise ValueError
+                append((message_type, x, y, w, h, pixels))
+            elif message_type is DebugMessage.CHANNELSTATS:
+                append((message_type, {DebugMessage(t): (c, d) for t, c, d in CHANNELSTATS_LAYOUT.iter_unpack(payload)}))
+            elif message_type is DebugMessage.FRAMESTATS:
+                values = FRAMESTATS_LAYOUT.unpack(payload)
+                append((message_type, values[0], values[1], {label: values[2 + i * 4:6 + i * 4] for i, label in enumerate(FRAMESTATS_LABELS)}))
+            elif message_type is DebugMessage.MEMORY:
+                values = MEMORY_LAYOUT.unpack(payload)
+                n = len(fantas.MEMORY_LABELS)
+                append((message_type, values[0], {label: (values[1 + i], values[1 + n + i], values[1 + 2 * n + i]) for i, label in enumerate(fantas.MEMORY_LABELS)}))
+            elif message_type is DebugMessage.RENDERPROFILE:
+                costs = []
+                position = 0
+                while position < len(payload):
+                    ui_id, pre_render_ns, render_ns, commands, name_length = RENDERPROFILE_LAYOUT.unpack_from(payload, position)
+                    position += RENDERPROFILE_LAYOUT.size
+                    name = payload[position:position + name_length]
+                    if len(name) != name_length:
+                        raise ValueError
+                    position += name_length
+                    costs.append((ui_id, str(name, "utf-8", "replace"), pre_render_ns, render_ns, commands / 100))
+                append((message_type, costs))
+            elif message_type is DebugMessage.TEXT:
+                prompt_length = payload[0]
+                append((message_type, str(payload[1:1 + prompt_length], "utf-8", "replace"), str(payload[1 + prompt_length:], "utf-8", "replace")))
+            else:
+                append((message_type, U32_LAYOUT.unpack(payload)[0]))
+        except (struct.error, IndexError, ValueError):
+            raise ValueError("调试数据报已损坏。") from None
+    return messages
+
+class MagnifyRing:
+    """
+    鼠标放大镜截图的共享内存环形缓冲区。
+    主进程把截图直接绘制到共享内存的槽位中，再通过 UDP 只发送一个序号，调试窗口子进程把槽位中的像素复制一份（最大 16 KiB）后使用，不需要序列化。
+    每个槽位由槽位头（序号、鼠标坐标、截图尺寸）和像素区域（32 位 BGRA）组成，序号为 0 表示槽位为空或正在写入。
+    写入方先把槽位头的序号清零再写像素，最后写槽位头；读取方在复制像素前后各核对一次序号，两次都与请求的序号一致才说明复制的像素是完整的。
+    """
+    SLOTS        = 4                              # 槽位数量
+    CAPACITY     = 64 * 64 * 4                    # 每个槽位的像素区域字节数（最小放大倍数 4 时为 64x64）
+    SLOT_HEADER  = struct.Struct("<I4H")          # 槽位头：序号、x、y、宽、高
+    HEADER_SIZE  = 16                             # 槽位头占用的字节数（对齐）
+    SLOT_SIZE    = HEADER_SIZE + CAPACITY         # 每个槽位的字节数
+
+    def __init__(self, name: str | None = None):
+        """
+        创建或连接共享内存环形缓冲区。
+        Args:
+            name (str | None): 共享内存名称，为 None 时创建新的共享内存（主进程），否则连接已有的共享内存（调试窗口子进程）。
+        """
+        self.owner: bool = name is None    # 是否是共享内存的创建者（负责释放）
+        self.shm  : shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=self.owner, size=MagnifyRing.SLOTS * MagnifyRing.SLOT_SIZE if self.owner else 0)
+        if not self.owner:
+            # 连接方不应该在退出时释放共享内存（Python 3.13 之前连接也会被资源跟踪器登记）
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except Exception:
+                pass
+        self.name: str = self.shm.name    # 共享内存名称
+
+    def pixels(self, seq: int, size: fantas.IntPoint) -> memoryview:
+        """
+        获取指定序号对应槽位的像素区域，用于写入截图。
+        返回前会把槽位头的序号清零，使正在读取该槽位旧截图的读取方在复制后的核对中失败，写入完成后必须调用 commit()。
+        Args:
+            seq  (int)            : 截图序号（从 1 开始）。
+            size (fantas.IntPoint): 截图尺寸（宽, 高）。
+        Returns:
+            memoryview: 像素区域。
+        Raises:
+            ValueError: 截图尺寸超出槽位容量。
+        """
+        length = size[0] * size[1] * 4
+        if length > MagnifyRing.CAPACITY:
+            raise ValueError(f"截图尺寸 {size} 超出共享内存槽位容量。")
+        offset = seq % MagnifyRing.SLOTS * MagnifyRing.SLOT_SIZE
+        MagnifyRing.SLOT_HEADER.pack_into(self.shm.buf, offset, 0, 0, 0, 0, 0)
+        offset += MagnifyRing.HEADER_SIZE
+        return self.shm.buf[offset:offset + length]
+
+    def commit(self, seq: int, x: int, y: int, size: fantas.IntPoint):
+        """
+        像素写入完成后写入槽位头，此后该截图才对读取方可见。
+        Args:
+            seq  (int)            : 截图序号。
+            x    (int)            : 鼠标在截图中的 x 坐标。
+            y    (int)            : 鼠标在截图中的 y 坐标。
+            size (fantas.IntPoint): 截图尺寸（宽, 高）。
+        """
+        MagnifyRing.SLOT_HEADER.pack_into(self.shm.buf, seq % MagnifyRing.SLOTS * MagnifyRing.SLOT_SIZE, seq, x, y, *size)
+
+    def read(self, seq: int) -> tuple[int, int, int, int, bytearray] | None:
+        """
+        读取指定序号的截图，像素数据会被复制，返回后不再引用共享内存。
+        Args:
+            seq (int): 截图序号。
+        Returns:
+            tuple[int, int, int, int, bytearray] | None: (x, y, 宽, 高, 像素数据)，如果槽位已经被更新的截图覆盖或正在被覆盖则返回 None。
+        """
+        offset = seq % MagnifyRing.SLOTS * MagnifyRing.SLOT_SIZE
+        slot_seq, x, y, w, h = MagnifyRing.SLOT_HEADER.unpack_from(self.shm.buf, offset)
+        if slot_seq != seq or w * h * 4 > MagnifyRing.CAPACITY:
+            return None
+        start = offset + MagnifyRing.HEADER_SIZE
+        pixels = bytearray(self.shm.buf[start:start + w * h * 4])
+        # 复制期间写入方可能已经开始覆盖该槽位
+        if MagnifyRing.SLOT_HEADER.unpack_from(self.shm.buf, offset)[0] != seq:
+            return None
+        return x, y, w, h, pixels
+
+    def close(self):
+        """
+        关闭共享内存，创建者还会释放共享内存。调用前必须先释放所有引用共享内存的 Surface 与 memoryview（read() 返回的像素数据不引用共享内存）。
+        """
+        try:
+            self.shm.close()
+        except BufferError:
+            return
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -60,10 +60,105 @@ class Lpf:
         if name in Lpf._lpf_map:
             del Lpf._lpf_map[name]
 
+class EventLogBuffer:
+    """
+    事件日志环形缓冲区，按序号索引，每条日志占一行。
+    序号从 0 开始递增，缓冲区满了之后最旧的日志被覆盖；每种事件类型维护一个序号索引，按类型过滤不需要遍历整个缓冲区。
+    """
+    def __init__(self, capacity: int = 8192):
+        """
+        初始化 EventLogBuffer 实例。
+        Args:
+            capacity (int): 最多保存的日志条数。
+        """
+        self.capacity: int = capacity                                 # 最多保存的日志条数
+        self.types   : list[int] = [0] * capacity                     # 事件类型环形缓冲区
+        self.texts   : list[str] = [''] * capacity                    # 日志文本环形缓冲区
+        self.total   : int = 0                                        # 记录过的日志总数（即下一条日志的序号）
+        self.type_index: dict[int, deque[int]] = {}                   # 事件类型 -> 该类型日志的序号（递增）
+
+    @property
+    def first(self) -> int:
+        """ 最旧的一条日志的序号。 """
+        return max(0, self.total - self.capacity)
+
+    def append(self, event_type: int, text: str) -> int:
+        """
+        添加一条日志。
+        Args:
+            event_type (int): 事件类型。
+            text       (str): 日志文本（换行会被替换为空格）。
+        Returns:
+            int: 日志的序号。
+        """
+        seq = self.total
+        index = seq % self.capacity
+        self.types[index] = event_type
+        self.texts[index] = text.replace('\n', ' ')
+        self.total += 1
+        seqs = self.type_index.get(event_type)
+        if seqs is None:
+            self.type_index[event_type] = seqs = deque()
+        seqs.append(seq)
+        # 顺便移除这种类型已被覆盖的序号
+        first = self.first
+        while seqs[0] < first:
+            seqs.popleft()
+        return seq
+
+    def get(self, seq: int) -> tuple[int, str]:
+        """
+        获取一条日志。
+        Args:
+            seq (int): 日志的序号，必须在 [first, total) 之间。
+        Returns:
+            tuple[int, str]: (事件类型, 日志文本)。
+        """
+        index = seq % self.capacity
+        return self.types[index], self.texts[index]
+
+    def match(self, seq: int, event_type: int | None, query: str) -> bool:
+        """
+        判断一条日志是否符合过滤条件。
+        Args:
+            seq        (int)       : 日志的序号。
+            event_type (int | None): 事件类型，为 None 表示不限类型。
+            query      (str)       : 日志文本需要包含的子串，为空表示不限文本。
+        Returns:
+            bool: 是否符合。
+        """
+        index = seq % self.capacity
+        return (event_type is None or self.types[index] == event_type) and (not query or query in self.texts[index])
+
+    def select(self, event_type: int | None = None, query: str = '') -> deque[int] | None:
+        """
+        获取符合过滤条件的日志序号。
+        Args:
+            event_type (int | None): 事件类型，为 None 表示不限类型。
+            query      (str)       : 日志文本需要包含的子串，为空表示不限文本。
+        Returns:
+            deque[int] | None: 符合条件的日志序号（递增），没有过滤条件时返回 None，表示 [first, total) 全部日志。
+        """
+        if event_type is None and not query:
+            return None
+        if event_type is not None:
+            first = self.first
+            seqs = self.type_index.get(event_type, ())
+            candidates = (seq for seq in seqs if seq >= first)
+        else:
+            candidates = range(self.first, self.total)
+        return deque(seq for seq in candidates if self.match(seq, None, query))
+
 class EventLogWindow(fantas.Window):
-    """ 事件日志窗口类。 """
+    """
+    事件日志窗口类。
+    日志保存在按行索引的环形缓冲区中，只有可见的行会被排版和绘制，滚动只是移动视图的起点。
+    鼠标滚轮滚动，输入文本过滤日志（以 # 开头时按事件类型编号或名称过滤），Backspace 删除，Esc 清空过滤条件。
+    """
 
     min_size = (512, 288)
+    capacity = 8192
+    top      = 30
 
     def __init__(self):
         super().__init__(
@@ -80,34 +175,188 @@ class EventLogWindow(fantas.Window):
         self.background = fantas.ColorBackground(fantas.colors.get("debug_bg"))
         self.append(self.background)
 
-        self.text = fantas.Text(fantas.Rect(10, 0, self.size[0] - 20, self.size[1]), '', align_mode=fantas.TextAlignMode.BOTTOMLEFT)
-        if fantas.platform.system() == "Linux":
-            self.text.offset[1] = -3
-        self.background.append(self.text)
+        # 过滤条件与滚动位置，有过滤条件或不在底部时才显示
+        self.status_text = fantas.Text(fantas.Rect(10, 0, self.size[0] - 270, EventLogWindow.top), '')
+        # 调试通道统计，有消息被合并或丢弃时才显示
+        self.stats_label = fantas.TextLabel(fantas.Rect(self.size[0] - 250, 0, 250, 30), '', align_mode=fantas.TextAlignMode.RIGHT)
+        self.stats_label.label_style.bgcolor = fantas.colors.get("debug_bg")
+        self.stats_label.label_style.border_width = 0
+        self.stats_label.offset[0] = -10
+        self.background.append(self.status_text)
+
+        self.buffer: EventLogBuffer = EventLogBuffer(EventLogWindow.capacity)    # 日志环形缓冲区
+        self.filter_type: int | None = None    # 过滤的事件类型
+        self.query: str = ''                   # 过滤的文本（用户输入的原文）
+        self.view: deque[int] | None = None    # 符合过滤条件的日志序号，为 None 表示全部日志
+        self.scroll: int = 0                   # 视图底部距离最新一条日志的行数，0 表示跟随最新日志
+
+        # 行池，每一行是一个单行文本
+        self.rows: list[fantas.Text] = []
+        self.line_height: float = fantas.Text(fantas.Rect(0, 0, 0, 0), '').line_height
+        self.layout_rows()
 
-        self.lines: deque[str] = deque(maxlen=32)
         self.add_event_listener(fantas.WINDOWRESIZED, self.root_ui, True, self.handle_WINDOWRESIZED_event)
         self.add_event_listener(fantas.WINDOWCLOSE, self.root_ui, True, self.handle_WINDOWCLOSE_event)
+        self.add_event_listener(fantas.MOUSEWHEEL, self.root_ui, True, self.handle_MOUSEWHEEL_event)
+        self.add_event_listener(fantas.TEXTINPUT, self.root_ui, True, self.handle_TEXTINPUT_event)
+        self.add_event_listener(fantas.KEYDOWN, self.root_ui, True, self.handle_KEYDOWN_event)
 
-        self.log_kf = fantas.AttrKeyFrame(self.text.rect, 'height', self.size[1], fantas.CURVE_SLOWER)
-        self.log_kf.start_value = self.size[1]
-        self.log_kf.set_duration_ms(300)
+    def layout_rows(self):
+        """
+        根据窗口尺寸创建或移除行，并重新填充可见行。
+        """
+        count = max(1, int((self.size[1] - EventLogWindow.top) // self.line_height))
+        while len(self.rows) < count:
+            row = fantas.Text(fantas.Rect(10, 0, 0, 0), '')
+            if fantas.platform.system() == "Linux":
+                row.offset[1] = -3
+            self.background.append(row)
+            self.rows.append(row)
+        while len(self.rows) > count:
+            self.background.remove(self.rows.pop())
+        # 最新的一行贴着窗口底部
+        bottom = self.size[1]
+        for i, row in enumerate(reversed(self.rows)):
+            row.rect.update(10, bottom - (i + 1) * self.line_height, self.size[0] - 20, self.line_height)
+        self.refresh()
+
+    @property
+    def length(self) -> int:
+        """ 视图中的日志条数。 """
+        return self.buffer.total - self.buffer.first if self.view is None else len(self.view)
+
+    def view_seq(self, position: int) -> int:
+        """
+        获取视图中第 position 条日志的序号。
+        Args:
+            position (int): 视图中的位置（从 0 开始）。
+        Returns:
+            int: 日志的序号。
+        """
+        return self.buffer.first + position if self.view is None else self.view[position]
 
-    def log_event(self, event_str: str):
+    def refresh(self):
+        """
+        重新填充可见行，只排版可见的日志。
+        """
+        buffer = self.buffer
+        rows = self.rows
+        length = self.length
+        self.scroll = max(0, min(self.scroll, length - len(rows)))
+        end = length - self.scroll
+        start = end - len(rows)
+        for i, row in enumerate(rows):
+            position = start + i
+            if position < 0:
+                text = ''
+            else:
+                event_type, text = buffer.get(self.view_seq(position))
+                # 只显示能放进一行的部分
+                s = row.text_style
+                wraps = s.font.auto_wrap(s.style_flag, s.size, text, row.rect.width)
+                text = wraps[0][0] if wraps else ''
+            row.text = text
+        # 状态栏
+        status = []
+        if self.query:
+            status.append(f"过滤：{self.query}（{length} 条）")
+        if self.scroll:
+            status.append(f"↑ {self.scroll} 行")
+        self.status_text.text = '  '.join(status)
+
+    def log_event(self, event_type: int, event_str: str):
         """
         记录事件日志。
         Args:
-            event_str (str): 事件信息字符串。
+            event_type (int): 事件类型。
+            event_str  (str): 事件信息字符串。
+        """
+        self.log_events(((event_type, event_str),))
+
+    def log_events(self, events: list[tuple[int, str]]):
+        """
+        批量记录事件日志，一批事件只刷新一次可见行。
+        Args:
+            events (list[tuple[int, str]]): [(事件类型, 事件信息字符串), ...]。
+        """
+        buffer = self.buffer
+        view = self.view
+        before = self.length
+        for event_type, event_str in events:
+            seq = buffer.append(event_type, event_str)
+            if view is not None and buffer.match(seq, self.filter_type, self.query_text):
+                view.append(seq)
+        # 移除视图中已被覆盖的日志
+        if view is not None:
+            first = buffer.first
+            while view and view[0] < first:
+                view.popleft()
+        # 不在底部时保持视图内容不动
+        if self.scroll:
+            self.scroll += self.length - before
+        self.refresh()
+
+    @property
+    def query_text(self) -> str:
+        """ 文本过滤条件（按事件类型过滤时为空）。 """
+        return '' if self.query.startswith('#') else self.query
+
+    def set_query(self, query: str):
+        """
+        设置过滤条件并重建视图：以 # 开头时按事件类型编号或名称过滤，否则按文本子串过滤。
+        Args:
+            query (str): 过滤条件。
+        """
+        self.query = query
+        self.filter_type = None
+        if query.startswith('#'):
+            name = query[1:].strip()
+            if name.isdigit():
+                self.filter_type = int(name)
+            elif name:
+                for event_type in self.buffer.type_index:
+                    if fantas.event.event_name(event_type).lower() == name.lower():
+                        self.filter_type = event_type
+                        break
+                else:
+                    self.filter_type = -1    # 没有这种事件
+        self.view = self.buffer.select(self.filter_type, self.query_text)
+        self.scroll = 0
+        self.refresh()
+
+    def handle_MOUSEWHEEL_event(self, event: fantas.Event):
+        """
+        处理鼠标滚轮事件，滚动视图。
+        Args:
+            event (fantas.Event): 鼠标滚轮事件对象。
+        """
+        self.scroll += event.y * 3
+        self.refresh()
+
+    def handle_TEXTINPUT_event(self, event: fantas.Event):
+        """
+        处理文本输入事件，追加过滤条件。
+        Args:
+            event (fantas.Event): 文本输入事件对象。
+        """
+        self.set_query(self.query + event.text)
+
+    def handle_KEYDOWN_event(self, event: fantas.Event):
+        """
+        处理按键事件：Backspace 删除一个字符，Esc 清空过滤条件，Home / End 跳到最旧 / 最新的日志。
+        Args:
+            event (fantas.Event): 按键事件对象。
         """
-        # 添加新事件到日志列表
-        self.lines.append(event_str)
-        self.text.text = '\n---\n'.join(self.lines)
-        # 调整文本区域高度（目的是保持新文本添加后原来的文本位置不变，然后通过关键帧动画平滑过渡）        
-        s = self.text.text_style
-        self.text.rect.height += len(s.font.auto_wrap(s.style_flag, s.size, event_str, self.text.rect.width)) * self.text.line_height + self.text.line_height
-        # 如果文本高度过大，则保持关键帧不重启
-        # 快速结束动画，防止记录被截断（最大深度只有32条）
-        self.log_kf.start(restart=self.text.rect.height <= self.size[1] + 400)
+        if event.key == fantas.pygame.K_BACKSPACE and self.query:
+            self.set_query(self.query[:-1])
+        elif event.key == fantas.pygame.K_ESCAPE and self.query:
+            self.set_query('')
+        elif event.key == fantas.pygame.K_HOME:
+            self.scroll = self.length
+            self.refresh()
+        elif event.key == fantas.pygame.K_END:
+            self.scroll = 0
+            self.refresh()
 
     def handle_WINDOWRESIZED_event(self, event: fantas.Event):
         """
@@ -121,9 +370,21 @@ class EventLogWindow(fantas.Window):
             event.y = EventLogWindow.min_size[1]
         if self.size != (event.x, event.y):
             self.size = (event.x, event.y)
-        self.text.rect.width = event.x - 20
-        self.text.rect.height = event.y
-        self.log_kf.end_value = self.log_kf.start_value = event.y
+        self.status_text.rect.width = event.x - 270
+        self.stats_label.rect.right = event.x
+        self.layout_rows()
+
+    def update_channel_stats(self, stats: dict[fantas.DebugMessage, tuple[int, int]]):
+        """
+        更新事件日志被合并与丢弃的数量显示（超出频率限制的事件日志会被丢弃）。
+        Args:
+            stats (dict[fantas.DebugMessage, tuple[int, int]]): 各类消息被合并与丢弃的累计数量。
+        """
+        coalesced, dropped = stats.get(fantas.DebugMessage.EVENTLOG, (0, 0))
+        if coalesced or dropped:
+            self.stats_label.text = f"已合并 {coalesced} 条，已丢弃 {dropped} 条"
+            if self.stats_label.father is None:
+                self.background.append(self.stats_label)
 
     def handle_WINDOWCLOSE_event(self, event: fantas.Event):
         """
@@ -131,7 +392,7 @@ class EventLogWindow(fantas.Window):
         Args:
             event (fantas.Event): 窗口关闭事件对象。
         """
-        fantas.Debug.send_debug_data(fantas.DebugFlag.EVENTLOG, prompt="CloseDebugWindow")
+        fantas.Debug.send_close_debug_window(fantas.DebugFlag.EVENTLOG)
 
 class TimeRecordWindow(fantas.Window):
     """ 时间记录窗口类。 """
@@ -155,8 +416,8 @@ class TimeRecordWindow(fantas.Window):
     fantas.colors.load("#7d7d7d", "Debug_legend_color")
     fantas.colors.load("#2ecc71", "Idle_legend_color")
 
-    min_width  = 400
-    fix_height = 230
+    min_width  = 520
+    fix_height = 264
 
     def __init__(self):
         super().__init__(
@@ -165,6 +426,7 @@ class TimeRecordWindow(fantas.Window):
                 window_size=(TimeRecordWindow.min_width, TimeRecordWindow.fix_height),
                 window_position=(0, 0),
                 resizable=True,
+                fps=30,
                 mouse_focus=False,
                 input_focus=False,
                 allow_high_dpi=True
@@ -179,6 +441,12 @@ class TimeRecordWindow(fantas.Window):
         if fantas.platform.system() == "Linux":
             self.fps_text.offset[1] = -3
 
+        # 调试通道统计（所有类型的消息）
+        self.stats_text = fantas.Text(fantas.Rect(120, 6, self.size[0] - 130, 30), "", align_mode=fantas.TextAlignMode.RIGHT)
+        self.background.append(self.stats_text)
+        if fantas.platform.system() == "Linux":
+            self.stats_text.offset[1] = -3
+
         self.legend_text = fantas.Text(fantas.Rect(50, 70 - fantas.DEFAULTTEXTSTYLE.font.get_sized_ascender(fantas.DEFAULTTEXTSTYLE.size), 100, 30 * len(TimeRecordWindow.time_category) + 1))
         self.legend_text.line_height = 30
         if fantas.platform.system() == "Linux":
@@ -201,13 +469,25 @@ class TimeRecordWindow(fantas.Window):
         if fantas.platform.system() == "Linux":
             self.time_text.offset[1] = -3
         self.background.append(self.time_text)
+        # 各个阶段的 p99 耗时（尾部延迟不经过低通滤波）
+        self.p99_text = fantas.Text(fantas.Rect(270, self.time_text.rect.top, 110, self.time_text.rect.height), '')
+        self.p99_text.text_style.line_spacing = 1
+        self.p99_text.line_height = 30
+        if fantas.platform.system() == "Linux":
+            self.p99_text.offset[1] = -3
+        self.background.append(self.p99_text)
+        # 整帧耗时的百分位数与超出帧预算的帧数
+        self.frame_text = fantas.Text(fantas.Rect(10, 232, self.size[0] - 20, 30), "帧耗时 p50 - / p95 - / p99 - / 最大 - ms")
+        if fantas.platform.system() == "Linux":
+            self.frame_text.offset[1] = -3
+        self.background.append(self.frame_text)
         self.ratios = {key: 0.0 for key in TimeRecordWindow.time_category.keys()}
         self.time_ratio_bars = {}
         for i, key in enumerate(TimeRecordWindow.time_category.keys()):
             bar1 = fantas.Label(rect=fantas.Rect(100, 10, 100, 20))
             bar1.label_style.bgcolor=fantas.colors.get(f"{key}_legend_color")
             self.background.append(bar1)
-            bar2 = fantas.Label(rect=fantas.Rect(260, 50 + i*30,  self.size[0] - 270, 20))
+            bar2 = fantas.Label(rect=fantas.Rect(380, 50 + i*30,  self.size[0] - 390, 20))
             bar2.label_style.bgcolor=fantas.colors.get(f"{key}_legend_color")
             bar2.label_style.border_radius_top_right = bar2.label_style.border_radius_bottom_right = 4
             self.background.append(bar2)
@@ -241,10 +521,32 @@ class TimeRecordWindow(fantas.Window):
         for key, bars in self.time_ratio_bars.items():
             bars[0].rect.left = x
             bars[0].rect.width = round(width * self.ratios[key])
-            bars[1].rect.width = self.ratios[key] * (self.size[0] - 270)
+            bars[1].rect.width = self.ratios[key] * (self.size[0] - 390)
             x += bars[0].rect.width
         self.time_ratio_bars["Idle"][0].rect.width += self.size[0] - 10 - x    # 修正舍入误差
 
+    def update_frame_stats(self, frames: int, over_budget: int, percentiles: dict[str, tuple[int, int, int, int]]):
+        """
+        更新帧耗时百分位数显示。
+        Args:
+            frames      (int)                                 : 记录的帧数。
+            over_budget (int)                                 : 超出帧预算的帧数。
+            percentiles (dict[str, tuple[int, int, int, int]]): 标签 -> (p50, p95, p99, 最大值)，单位ns。
+        """
+        self.p99_text.text = '\n'.join(f"p99 {percentiles[key][2] / 1e6:.2f}" for key in TimeRecordWindow.time_category.keys())
+        p50, p95, p99, maximum = (value / 1e6 for value in percentiles["Frame"])
+        self.frame_text.text = f"帧耗时 p50 {p50:.2f} / p95 {p95:.2f} / p99 {p99:.2f} / 最大 {maximum:.2f} ms，超出预算 {over_budget}/{frames} 帧"
+
+    def update_channel_stats(self, stats: dict[fantas.DebugMessage, tuple[int, int]]):
+        """
+        更新调试消息的合并与丢弃总数显示。
+        Args:
+            stats (dict[fantas.DebugMessage, tuple[int, int]]): 各类消息被合并与丢弃的累计数量。
+        """
+        coalesced = sum(c for c, _ in stats.values())
+        dropped = sum(d for _, d in stats.values())
+        self.stats_text.text = f"合并 {coalesced}  丢弃 {dropped}"
+
     def handle_WINDOWRESIZED_event(self, event: fantas.Event):
         """
         处理窗口大小改变事件。
@@ -255,6 +557,8 @@ class TimeRecordWindow(fantas.Window):
             event.x = TimeRecordWindow.min_width
         if self.size != (event.x, TimeRecordWindow.fix_height):
             self.size = (event.x, TimeRecordWindow.fix_height)
+        self.stats_text.rect.width = event.x - 130
+        self.frame_text.rect.width = event.x - 20
 
     def handle_WINDOWCLOSE_event(self, event: fantas.Event):
         """
@@ -262,7 +566,203 @@ class TimeRecordWindow(fantas.Window):
         Args:
             event (fantas.Event): 窗口关闭事件对象。
         """
-        fantas.Debug.send_debug_data(fantas.DebugFlag.TIMERECORD, prompt="CloseDebugWindow")
+        fantas.Debug.send_close_debug_window(fantas.DebugFlag.TIMERECORD)
+
+class RenderProfileWindow(fantas.Window):
+    """ 渲染开销窗口类，显示渲染开销最大的若干个 UI 元素（每帧平均）。 """
+
+    rows       = 10
+    min_width  = 480
+    row_height = 26
+    fix_height = 50 + rows * row_height
+
+    fantas.colors.load("#e67e22", "profile_bar_color")
+
+    def __init__(self):
+        super().__init__(
+            fantas.WindowConfig(
+                title=f"{windows_title} | 渲染开销",
+                window_size=(RenderProfileWindow.min_width, RenderProfileWindow.fix_height),
+                window_position=(0, 0),
+                resizable=True,
+                fps=30,
+                on_demand=True,
+                mouse_focus=False,
+                input_focus=False,
+                allow_high_dpi=True
+            )
+        )
+
+        self.background = fantas.ColorBackground(fantas.colors.get("debug_bg"))
+        self.root_ui.append(self.background)
+
+        self.header_text = fantas.Text(fantas.Rect(10, 6, self.size[0] - 20, 30), "UI 元素")
+        self.background.append(self.header_text)
+        self.header_time_text = fantas.Text(fantas.Rect(10, 6, self.size[0] - 20, 30), "生成 / 执行（ms）  命令", align_mode=fantas.TextAlignMode.TOPRIGHT)
+        self.background.append(self.header_time_text)
+
+        self.bars = []
+        for i in range(RenderProfileWindow.rows):
+            bar = fantas.Label(rect=fantas.Rect(10, 44 + i * RenderProfileWindow.row_height, 0, RenderProfileWindow.row_height - 4))
+            bar.label_style.bgcolor = fantas.colors.get("profile_bar_color")
+            bar.label_style.border_width = 0
+            self.background.append(bar)
+            self.bars.append(bar)
+
+        self.name_text = fantas.Text(fantas.Rect(14, 40, self.size[0] - 200, RenderProfileWindow.rows * RenderProfileWindow.row_height + 1), '')
+        self.time_text = fantas.Text(fantas.Rect(self.size[0] - 190, 40, 180, RenderProfileWindow.rows * RenderProfileWindow.row_height + 1), '', align_mode=fantas.TextAlignMode.TOPRIGHT)
+        for text in (self.header_text, self.header_time_text, self.name_text, self.time_text):
+            text.line_height = RenderProfileWindow.row_height
+            if fantas.platform.system() == "Linux":
+                text.offset[1] = -3
+        self.background.append(self.name_text)
+        self.background.append(self.time_text)
+
+        self.add_event_listener(fantas.WINDOWRESIZED, self.root_ui, True, self.handle_WINDOWRESIZED_event)
+        self.add_event_listener(fantas.WINDOWCLOSE, self.root_ui, True, self.handle_WINDOWCLOSE_event)
+
+    def update_render_profile(self, costs: list[tuple[int, str, float, float, float]]):
+        """
+        更新渲染开销显示。
+        Args:
+            costs (list[tuple[int, str, float, float, float]]): [(ui_id, 类名, 每帧生成耗时（纳秒）, 每帧执行耗时（纳秒）, 每帧命令数), ...]，按开销从大到小排列。
+        """
+        costs = costs[:RenderProfileWindow.rows]
+        self.name_text.text = '\n'.join(f"{name}#{ui_id}" for ui_id, name, _, _, _ in costs)
+        self.time_text.text = '\n'.join(f"{pre_render_ns / 1e6:.3f} / {render_ns / 1e6:.3f}  {commands:.1f}" for _, _, pre_render_ns, render_ns, commands in costs)
+        # 开销条以最大开销为满长
+        largest = max((pre_render_ns + render_ns for _, _, pre_render_ns, render_ns, _ in costs), default=0)
+        for i, bar in enumerate(self.bars):
+            if i < len(costs) and largest > 0:
+                bar.rect.width = round((self.size[0] - 20) * (costs[i][2] + costs[i][3]) / largest)
+            else:
+                bar.rect.width = 0
+        self.invalidate()
+
+    def handle_WINDOWRESIZED_event(self, event: fantas.Event):
+        """
+        处理窗口大小改变事件。
+        Args:
+            event (fantas.Event): 窗口大小改变事件对象。
+        """
+        if event.x < RenderProfileWindow.min_width:
+            event.x = RenderProfileWindow.min_width
+        if self.size != (event.x, RenderProfileWindow.fix_height):
+            self.size = (event.x, RenderProfileWindow.fix_height)
+        self.header_time_text.rect.width = event.x - 20
+        self.name_text.rect.width = event.x - 200
+        self.time_text.rect.left = event.x - 190
+
+    def handle_WINDOWCLOSE_event(self, event: fantas.Event):
+        """
+        处理窗口关闭事件。
+        Args:
+            event (fantas.Event): 窗口关闭事件对象。
+        """
+        fantas.Debug.send_close_debug_window(fantas.DebugFlag.RENDERPROFILE)
+
+def format_bytes(value: float) -> str:
+    """
+    把字节数格式化为带单位的字符串。
+    Args:
+        value (float): 字节数（可以为负）。
+    Returns:
+        str: 格式化后的字符串。
+    """
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB"
+
+class MemoryWindow(fantas.Window):
+    """ 内存统计窗口类，显示各个分类的内存占用、相对开始时的变化量与每小时增长速度。 """
+
+    rows       = len(fantas.MEMORY_LABELS) + 1
+    min_width  = 480
+    row_height = 26
+    fix_height = 50 + rows * row_height
+
+    names = {
+        "Surface"     : "节点 Surface",
+        "RenderCache" : "渲染缓存",
+        "PassPath"    : "传递路径缓存",
+        "Image"       : "图像资源",
+        "CacheEntries": "缓存条目",
+    }
+
+    def __init__(self):
+        super().__init__(
+            fantas.WindowConfig(
+                title=f"{windows_title} | 内存",
+                window_size=(MemoryWindow.min_width, MemoryWindow.fix_height),
+                window_position=(0, 0),
+                resizable=True,
+                fps=30,
+                on_demand=True,
+                mouse_focus=False,
+                input_focus=False,
+                allow_high_dpi=True
+            )
+        )
+
+        self.background = fantas.ColorBackground(fantas.colors.get("debug_bg"))
+        self.root_ui.append(self.background)
+
+        self.header_text = fantas.Text(fantas.Rect(10, 6, self.size[0] - 20, 30), "分类")
+        self.background.append(self.header_text)
+        self.header_value_text = fantas.Text(fantas.Rect(10, 6, self.size[0] - 20, 30), "当前  变化  每小时", align_mode=fantas.TextAlignMode.TOPRIGHT)
+        self.background.append(self.header_value_text)
+
+        self.name_text = fantas.Text(fantas.Rect(10, 40, self.size[0] - 20, MemoryWindow.rows * MemoryWindow.row_height + 1), '\n'.join(("节点数量", *MemoryWindow.names.values())))
+        self.value_text = fantas.Text(fantas.Rect(10, 40, self.size[0] - 20, MemoryWindow.rows * MemoryWindow.row_height + 1), '', align_mode=fantas.TextAlignMode.TOPRIGHT)
+        for text in (self.header_text, self.header_value_text, self.name_text, self.value_text):
+            text.line_height = MemoryWindow.row_height
+            if fantas.platform.system() == "Linux":
+                text.offset[1] = -3
+        self.background.append(self.name_text)
+        self.background.append(self.value_text)
+
+        self.add_event_listener(fantas.WINDOWRESIZED, self.root_ui, True, self.handle_WINDOWRESIZED_event)
+        self.add_event_listener(fantas.WINDOWCLOSE, self.root_ui, True, self.handle_WINDOWCLOSE_event)
+
+    def update_memory_report(self, nodes: int, values: dict[str, tuple[int, int, float]]):
+        """
+        更新内存统计显示。
+        Args:
+            nodes  (int)                                : 节点数量。
+            values (dict[str, tuple[int, int, float]]): {分类: (当前值, 变化量, 每小时增长速度)}。
+        """
+        lines = [str(nodes)]
+        for label in fantas.MEMORY_LABELS:
+            current, delta, growth = values[label]
+            if label == "CacheEntries":
+                lines.append(f"{current}  {delta:+d}  {growth:+.0f}")
+            else:
+                lines.append(f"{format_bytes(current)}  {'+' if delta >= 0 else ''}{format_bytes(delta)}  {'+' if growth >= 0 else ''}{format_bytes(growth)}")
+        self.value_text.text = '\n'.join(lines)
+        self.invalidate()
+
+    def handle_WINDOWRESIZED_event(self, event: fantas.Event):
+        """
+        处理窗口大小改变事件。
+        Args:
+            event (fantas.Event): 窗口大小改变事件对象。
+        """
+        if event.x < MemoryWindow.min_width:
+            event.x = MemoryWindow.min_width
+        if self.size != (event.x, MemoryWindow.fix_height):
+            self.size = (event.x, MemoryWindow.fix_height)
+        self.header_value_text.rect.width = event.x - 20
+        self.value_text.rect.width = event.x - 20
+
+    def handle_WINDOWCLOSE_event(self, event: fantas.Event):
+        """
+        处理窗口关闭事件。
+        Args:
+            event (fantas.Event): 窗口关闭事件对象。
+        """
+        fantas.Debug.send_close_debug_window(fantas.DebugFlag.MEMORY)
 
 class MouseMagnifyWindow(fantas.Window):
     """ 鼠标放大镜窗口类。 """
@@ -272,6 +772,8 @@ class MouseMagnifyWindow(fantas.Window):
                 title=f"{windows_title} | 鼠标放大镜",
                 window_size=(256, 320),
                 window_position=(0, 0),
+                fps=30,
+                on_demand=True,
                 mouse_focus=False,
                 input_focus=False,
                 allow_high_dpi=True
@@ -311,27 +813,70 @@ class MouseMagnifyWindow(fantas.Window):
         self.add_event_listener(fantas.WINDOWCLOSE, self.root_ui, True, self.handle_WINDOWCLOSE_event)
         self.add_event_listener(fantas.MOUSEWHEEL, self.mouse_shot_img, True, self.handle_MOUSEWHEEL_event)
 
+        # 连接主程序创建的共享内存环形缓冲区
+        self.ring = fantas.MagnifyRing(sys.argv[4]) if len(sys.argv) > 4 and sys.argv[4] else None
+
     def update_text(self):
         """
         更新文本显示内容。
         """
         self.text.text = f"放大倍数: {self.ratio}x\n鼠标颜色：{self.cursor_color.hex[:-2].upper()}"
 
-    def update_mouse_shot(self, x: int, y: int, surface_bytes: bytes):
+    def update_mouse_shot(self, x: int, y: int, width: int, height: int, surface_bytes: bytes):
         """
         更新鼠标截图 Surface。
         Args:
             x (int): 鼠标截图的 X 坐标。
             y (int): 鼠标截图的 Y 坐标.
-            surface_bytes (bytes): 鼠标截图的 Surface 字节数据。
+            width (int): 鼠标截图的宽度。
+            height (int): 鼠标截图的高度。
+            surface_bytes (bytes): 鼠标截图的 Surface 字节数据（32 位 BGRA）。
         """
-        self.mouse_shot_img.surface.get_buffer().write(surface_bytes)
+        surface = self.mouse_shot_img.surface
+        if surface.get_size() == (width, height):
+            surface.get_buffer().write(surface_bytes)
+        else:
+            # 截图在主窗口边缘被裁剪，尺寸小于放大镜
+            surface.fill(fantas.colors.get("debug_bg"))
+            surface.blit(fantas.image.frombuffer(surface_bytes, (width, height), "BGRA"), (0, 0))
         self.cursor.rect.left = x * self.ratio
         self.cursor.rect.top  = y * self.ratio
         self.cursor_color = self.mouse_shot_img.surface.get_at((x, y))
         self.cursor.label_style.fgcolor = fantas.get_distinct_blackorwhite(self.cursor_color)
         self.cursor_color_label.label_style.bgcolor = self.cursor_color
         self.update_text()
+        self.invalidate()
+
+    def update_mouse_frame(self, seq: int):
+        """
+        从共享内存环形缓冲区读取鼠标截图。
+        截图尺寸与放大镜一致时直接以复制出的像素数据为缓冲区创建 Surface（该 Surface 不引用共享内存，不会被之后的截图改写）；
+        被更新的截图覆盖或正在被覆盖的旧序号会被忽略（更新的截图的通知随后就会到达）。
+        Args:
+            seq (int): 截图序号。
+        """
+        if self.ring is None:
+            return
+        shot = self.ring.read(seq)
+        if shot is None:
+            return
+        x, y, width, height, pixels = shot
+        size = 256 // self.ratio
+        if (width, height) == (size, size):
+            self.mouse_shot_img.surface = fantas.image.frombuffer(pixels, (width, height), "BGRA")
+        else:
+            # 截图在主窗口边缘被裁剪，或者放大倍数刚刚改变
+            surface = fantas.Surface((size, size))
+            surface.fill(fantas.colors.get("debug_bg"))
+            surface.blit(fantas.image.frombuffer(pixels, (width, height), "BGRA"), (0, 0))
+            self.mouse_shot_img.surface = surface
+        self.cursor.rect.left = x * self.ratio
+        self.cursor.rect.top  = y * self.ratio
+        self.cursor_color = self.mouse_shot_img.surface.get_at((min(x, size - 1), min(y, size - 1)))
+        self.cursor.label_style.fgcolor = fantas.get_distinct_blackorwhite(self.cursor_color)
+        self.cursor_color_label.label_style.bgcolor = self.cursor_color
+        self.update_text()
+        self.invalidate()
 
     def handle_WINDOWCLOSE_event(self, event: fantas.Event):
         """
@@ -339,7 +884,7 @@ class MouseMagnifyWindow(fantas.Window):
         Args:
             event (fantas.Event): 窗口关闭事件对象。
         """
-        fantas.Debug.send_debug_data(fantas.DebugFlag.MOUSEMAGNIFY, prompt="CloseDebugWindow")
+        fantas.Debug.send_close_debug_window(fantas.DebugFlag.MOUSEMAGNIFY)
     
     def handle_MOUSEWHEEL_event(self, event: fantas.Event):
         """
@@ -354,7 +899,7 @@ class MouseMagnifyWindow(fantas.Window):
             self.ratio = max(self.ratio // 2, 4)
         if self.ratio == last_ratio:
             return
-        fantas.Debug.send_debug_data(self.ratio, prompt="SetMouseMagnifyRatio")
+        fantas.Debug.send_mouse_magnify_ratio(self.ratio)
         new_surface = fantas.Surface((256 // self.ratio, 256 // self.ratio))
         new_surface.blit(self.mouse_shot_img.surface, (0, 0))
         self.mouse_shot_img.surface = new_surface
@@ -367,15 +912,32 @@ def handle_debug_received_event(event: fantas.Event):
     Args:
         event (fantas.Event): 接收到的调试命令事件对象。
     """
+    DebugMessage = fantas.DebugMessage
+    event_strs = []
     while not fantas.Debug.queue.empty():
         data = fantas.Debug.queue.get()
-        prompt = data[0]
-        if prompt == "EventLog":
-            event_log_window.log_event(data[1])
-        elif prompt == "TimeRecord":
+        message_type = data[0]
+        if message_type is DebugMessage.EVENTLOG:
+            event_strs.append((data[1], f"<Event({data[1]}-{fantas.event.event_name(data[1])} {data[2]})>"))
+        elif message_type is DebugMessage.FRAMESTATS:
+            time_record_window.update_frame_stats(*data[1:])
+        elif message_type is DebugMessage.RENDERPROFILE:
+            render_profile_window.update_render_profile(data[1])
+        elif message_type is DebugMessage.MEMORY:
+            memory_window.update_memory_report(data[1], data[2])
+        elif message_type is DebugMessage.CHANNELSTATS:
+            for window in windows:
+                if hasattr(window, "update_channel_stats"):
+                    window.update_channel_stats(data[1])
+        elif message_type is DebugMessage.TIMERECORD:
             time_record_window.update_time_records(data[1])
-        elif prompt == "MouseMagnify":
-            mouse_magnify_window.update_mouse_shot(data[1], data[2], data[3])
+        elif message_type is DebugMessage.MOUSEMAGNIFY:
+            mouse_magnify_window.update_mouse_shot(*data[1:])
+        elif message_type is DebugMessage.MOUSEMAGNIFYFRAME:
+            mouse_magnify_window.update_mouse_frame(data[1])
+    # 一批事件日志只排版一次
+    if event_strs:
+        event_log_window.log_events(event_strs)
     return True
 
 # 存储所有调试窗口的列表
@@ -391,6 +953,14 @@ if fantas.DebugFlag.EVENTLOG in debug_flags:
 if fantas.DebugFlag.TIMERECORD in debug_flags:
     time_record_window = TimeRecordWindow()
     windows.append(time_record_window)
+# 如果启用了渲染开销调试标志，则创建渲染开销窗口
+if fantas.DebugFlag.RENDERPROFILE in debug_flags:
+    render_profile_window = RenderProfileWindow()
+    windows.append(render_profile_window)
+# 如果启用了内存统计调试标志，则创建内存统计窗口
+if fantas.DebugFlag.MEMORY in debug_flags:
+    memory_window = MemoryWindow()
+    windows.append(memory_window)
 # 如果启用了鼠标放大调试标志，则创建鼠标放大窗口
 if fantas.DebugFlag.MOUSEMAGNIFY in debug_flags:
     mouse_magnify_window = MouseMagnifyWindow()
@@ -399,7 +969,7 @@ if fantas.DebugFlag.MOUSEMAGNIFY in debug_flags:
 for window in windows:
     window.add_event_listener(fantas.DEBUGRECEIVED, window.root_ui, True, handle_debug_received_event)
 # 创建调试窗口
-debug_windows = fantas.MultiWindow(*windows)
+debug_windows = fantas.MultiWindow(*windows, paced=True)
 debug_windows.auto_place_windows(10)
 
 # 设置主程序端口号
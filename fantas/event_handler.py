@@ -32,6 +32,7 @@ class EventHandler:
             (fantas.MOUSEMOTION,     self.handle_mousemotion_event),
             (fantas.MOUSEBUTTONDOWN, self.handle_mousebuttondown_event),
             (fantas.MOUSEBUTTONUP,   self.handle_mousebuttonup_event),
+            (fantas.EXECUTORDONE,    self.handle_executordone_event),
         )
 
         # 注册事件的预处理器
@@ -51,6 +52,9 @@ class EventHandler:
             focused_ui = self.hover_ui if fantas.get_event_category(event.type) == fantas.EventCategory.MOUSE else self.active_ui
         # 构建传递路径
         event_pass_path = focused_ui.get_pass_path()
+        if fantas.Tracer.recorder is not None:
+            self.dispatch_traced(event, event_pass_path)
+            return
         # 事件传递 [根节点 -> ... -> 焦点节点（捕获阶段）, 焦点节点 -> ... -> 根节点（冒泡阶段）]
         for ui in reversed(event_pass_path):
             # 捕获阶段
@@ -67,6 +71,26 @@ class EventHandler:
                 if callback(event):
                     return
 
+    def dispatch_traced(self, event: fantas.Event, event_pass_path: list[fantas.UI]):
+        """
+        沿传递路径分发事件，并把每个监听器的调用记录为追踪片段。
+        Args:
+            event           (fantas.Event)   : 要处理的事件对象。
+            event_pass_path (list[fantas.UI]): 事件传递路径（焦点节点 -> ... -> 根节点）。
+        """
+        # 简化引用
+        get_time_ns = fantas.get_time_ns
+        add = fantas.Tracer.recorder.add
+        args = {"event": fantas.event.event_name(event.type)}
+        for ui, use_capture in [(ui, True) for ui in reversed(event_pass_path)] + [(ui, False) for ui in event_pass_path]:
+            for callback in self.listener_dict.get((event.type, ui.ui_id, use_capture), []):
+                start = get_time_ns()
+                stop = callback(event)
+                add(getattr(callback, "__qualname__", type(callback).__name__), "event", start, get_time_ns(), args)
+                # 如果回调函数返回 True，停止事件传递
+                if stop:
+                    return
+
     def add_event_listener(self, event_type: fantas.EventType, ui: fantas.UI, use_capture: bool, listener: fantas.ListenerFunc):
         """
         为指定事件类型和 UI 元素添加事件监听器。
@@ -194,3 +218,11 @@ class EventHandler:
             self.handle_event(fantas.Event(fantas.MOUSECLICKED, ui=self.hover_ui), focused_ui=self.hover_ui)
         # 清除上一次按下的 UI 元素
         self.last_pressed_ui = None
+
+    def handle_executordone_event(self, event: fantas.Event):
+        """
+        处理后台任务完成事件，在 UI 线程中交付已完成任务的回调。
+        Args:
+            event (fantas.Event): 后台任务完成事件对象。
+        """
+        event.executor.deliver(event.seq)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+import zlib
+import struct
+import marshal
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fantas
+
+__all__ = (
+    "EventRecorder",
+    "EventReplayer",
+    "load_event_trace",
+)
+
+TRACE_MAGIC   = b"FEVT"                          # 事件轨迹文件魔数
+TRACE_VERSION = 1                                # 事件轨迹文件格式版本
+TRACE_HEADER  = struct.Struct("<4sHI")           # 文件头：魔数、版本、帧数
+WINDOW_MARKER = "__fantas_window__"              # 事件属性中窗口对象的占位符，回放时替换为目标窗口
+PLAIN_TYPES   = (bool, int, float, str, bytes, type(None))    # 可以直接序列化的属性值类型
+
+def to_plain(value):
+    """
+    将事件属性值转换为可以被 marshal 序列化的值。
+    Args:
+        value: 事件属性值。
+    Returns:
+        转换后的值，窗口对象转换为占位符，无法序列化的值返回 NotImplemented。
+    """
+    if isinstance(value, PLAIN_TYPES):
+        return value
+    if isinstance(value, (tuple, list)):
+        items = tuple(to_plain(v) for v in value)
+        return NotImplemented if NotImplemented in items else items
+    if isinstance(value, (fantas.Window, fantas.HeadlessWindow)):
+        return WINDOW_MARKER
+    if isinstance(value, fantas.math.Vector2):
+        return tuple(value)
+    return NotImplemented
+
+@dataclass(slots=True)
+class EventRecorder:
+    """
+    事件轨迹录制器，录制主循环每一帧从 fantas.event.get() 取出的事件，保存为紧凑的二进制文件。
+    事件属性中的窗口对象会被替换为占位符，无法序列化的属性（比如后台任务执行器对象）会被丢弃。
+    Args:
+        path: 保存路径，为 None 时只在内存中录制，需要手动调用 save()。
+    """
+    path: Path | str | None = None
+
+    frames    : list[tuple[int, tuple]] = field(default_factory=list, init=False, repr=False)    # 录制的帧列表 [(相对时间（纳秒）, ((事件类型, 事件属性字典), ...)), ...]
+    start_time: int | None              = field(default=None, init=False, repr=False)            # 录制开始的时间点（纳秒）
+    exclude   : set[int]                = field(default_factory=lambda: {fantas.EXECUTORDONE}, init=False, repr=False)    # 不录制的事件类型
+
+    def wrap(self, get: Callable[[], list[fantas.Event]]) -> Callable[[], list[fantas.Event]]:
+        """
+        包装事件获取函数，每次调用都会录制取出的事件。
+        Args:
+            get (Callable[[], list[fantas.Event]]): 事件获取函数，一般是 fantas.event.get。
+        Returns:
+            Callable[[], list[fantas.Event]]: 包装后的事件获取函数。
+        """
+        record = self.record
+        def recording_get() -> list[fantas.Event]:
+            events = get()
+            record(events)
+            return events
+        return recording_get
+
+    def record(self, events: list[fantas.Event]):
+        """
+        录制一帧的事件，没有事件的帧不会被录制。
+        Args:
+            events (list[fantas.Event]): 这一帧的事件列表。
+        """
+        now = fantas.get_time_ns()
+        if self.start_time is None:
+            self.start_time = now
+        exclude = self.exclude
+        recorded = []
+        for event in events:
+            if event.type in exclude:
+                continue
+            attrs = {}
+            for key, value in event.dict.items():
+                value = to_plain(value)
+                if value is not NotImplemented:
+                    attrs[key] = value
+            recorded.append((event.type, attrs))
+        if recorded:
+            self.frames.append((now - self.start_time, tuple(recorded)))
+
+    def save(self, path: Path | str | None = None):
+        """
+        保存录制的事件轨迹。
+        Args:
+            path (Path | str | None): 保存路径，为 None 时使用初始化时的路径。
+        """
+        path = self.path if path is None else path
+        if path is None:
+            raise ValueError("没有指定事件轨迹的保存路径。")
+        data = TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(self.frames)) + zlib.compress(marshal.dumps(self.frames), 6)
+        Path(path).write_bytes(data)
+
+    def close(self):
+        """
+        结束录制，如果指定了保存路径则保存，由窗口在退出主循环时调用。
+        """
+        if self.path is not None:
+            self.save()
+
+def load_event_trace(path: Path | str) -> list[tuple[int, tuple]]:
+    """
+    读取事件轨迹文件。
+    Args:
+        path (Path | str): 文件路径。
+    Returns:
+        list[tuple[int, tuple]]: 帧列表 [(相对时间（纳秒）, ((事件类型, 事件属性字典), ...)), ...]。
+    Raises:
+        ValueError: 文件格式或版本不正确。
+    """
+    data = Path(path).read_bytes()
+    try:
+        magic, version, frame_count = TRACE_HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError("事件轨迹文件已损坏。") from None
+    if magic != TRACE_MAGIC:
+        raise ValueError("不是事件轨迹文件。")
+    if version != TRACE_VERSION:
+        raise ValueError(f"不支持的事件轨迹文件版本：{version}。")
+    frames = marshal.loads(zlib.decompress(data[TRACE_HEADER.size:]))
+    if len(frames) != frame_count:
+        raise ValueError("事件轨迹文件已损坏。")
+    return frames
+
+@dataclass(slots=True)
+class EventReplayer:
+    """
+    事件轨迹回放器，将录制的事件以最快速度送入窗口的事件处理器，并测量每个事件的分发耗时。
+    回放不依赖真实时间，同样的轨迹和同样的 UI 树总是产生同样的事件分发过程。
+    Args:
+        frames: 帧列表，由 load_event_trace() 读取。
+    """
+    frames: list[tuple[int, tuple]]
+
+    events   : list[list[fantas.Event]] = field(init=False, repr=False)                      # 预先构建好的事件对象（按帧分组）
+    latencies: dict[int, list[int]]     = field(default_factory=dict, init=False, repr=False)  # 事件类型 -> 分发耗时列表（纳秒）
+    total_ns : int                      = field(default=0, init=False)                         # 上一次回放的总耗时（纳秒，包括帧函数与渲染）
+
+    @classmethod
+    def load(cls, path: Path | str) -> EventReplayer:
+        """
+        从文件创建回放器。
+        Args:
+            path (Path | str): 事件轨迹文件路径。
+        Returns:
+            EventReplayer: 回放器。
+        """
+        return cls(load_event_trace(path))
+
+    def bind(self, window: fantas.Window | fantas.HeadlessWindow):
+        """
+        为目标窗口构建事件对象，事件属性中的窗口占位符会被替换为目标窗口。
+        Args:
+            window (fantas.Window | fantas.HeadlessWindow): 目标窗口。
+        """
+        Event = fantas.Event
+        self.events = [
+            [Event(event_type, {k: window if v == WINDOW_MARKER else v for k, v in attrs.items()}) for event_type, attrs in events]
+            for _, events in self.frames
+        ]
+
+    def replay(self, window: fantas.Window | fantas.HeadlessWindow, render: bool = False) -> int:
+        """
+        回放一遍事件轨迹。每一帧的事件处理完之后都会运行帧函数并重新生成渲染命令，保证命中测试看到的 UI 状态与实际运行一致。
+        命中测试依赖渲染时计算的影响区域，所以回放开始前总会渲染一次。
+        Args:
+            window (fantas.Window | fantas.HeadlessWindow): 目标窗口。
+            render (bool)                                 : 是否每帧都执行渲染，UI 在回放过程中会发生变化时应该开启。
+        Returns:
+            int: 回放的事件数量。
+        """
+        self.bind(window)
+        # 简化引用
+        get_time_ns = fantas.get_time_ns
+        handle_event = window.event_handler.handle_event
+        run_framefuncs = fantas.run_framefuncs
+        pre_render = window.renderer.pre_render
+        renderer_render = window.renderer.render
+        root_ui = window.root_ui
+        screen = window.screen
+        latencies = self.latencies
+        latencies.clear()
+        count = 0
+
+        root_ui.build_pass_path_cache()
+        pre_render(root_ui)
+        renderer_render(screen)
+        start = get_time_ns()
+        for events in self.events:
+            for event in events:
+                t = get_time_ns()
+                handle_event(event)
+                latencies.setdefault(event.type, []).append(get_time_ns() - t)
+            count += len(events)
+            run_framefuncs()
+            pre_render(root_ui)
+            if render:
+                renderer_render(screen)
+        self.total_ns = get_time_ns() - start
+        return count
@@ -0,0 +1,177 @@
+from __future__ import annotations
+import atexit
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, CancelledError, Executor as PoolExecutor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+import fantas
+
+__all__ = (
+    "Executor",
+    "ThreadExecutor",
+    "ProcessExecutor",
+    "thread_executor",
+    "process_executor",
+)
+
+@dataclass(slots=True)
+class Executor(ABC):
+    """
+    后台任务执行器基类，任务在工作池中执行，完成回调在下一帧由 UI 线程调用。
+    Args:
+        max_workers  : 工作池最大工作者数量，None 表示由工作池自行决定。
+        max_pending  : 最多同时在途（执行中或已完成但未交付）的任务数量，超出的任务在本地积压，UI 交付跟不上时不再向工作池提交新任务。
+        deliver_limit: 每帧最多交付的完成回调数量，剩余的会顺延到下一帧。
+    """
+    max_workers  : int | None = None
+    max_pending  : int        = 256
+    deliver_limit: int        = 64
+
+    pool         : PoolExecutor | None = field(default=None, init=False, repr=False)              # 工作池，首次提交任务时创建
+    backlog      : deque               = field(default_factory=deque, init=False, repr=False)    # 积压队列，存放尚未提交到工作池的任务
+    done         : deque               = field(default_factory=deque, init=False, repr=False)    # 已完成但未交付的任务队列
+    in_flight    : int                 = field(default=0, init=False)                            # 在途任务数量（仅由 UI 线程修改）
+    lock         : threading.Lock      = field(default_factory=threading.Lock, init=False, repr=False)    # 保护 done 队列与唤醒标志
+    wakeup_posted: bool                = field(default=False, init=False, repr=False)                     # 是否已投递唤醒事件
+    wakeup_seq   : int                 = field(default=0, init=False, repr=False)                         # 当前有效的唤醒事件序号，交付后失效
+
+    @abstractmethod
+    def create_pool(self) -> PoolExecutor:
+        """
+        创建工作池，由子类实现。
+        Returns:
+            PoolExecutor: concurrent.futures 的执行器对象。
+        """
+        pass
+
+    def submit(self, callback: Callable[[Future], None] | None, func: Callable, /, *args, **kwargs) -> Future:
+        """
+        提交一个任务。
+        Args:
+            callback (Callable[[Future], None] | None): 完成回调，在 UI 线程中以该任务的 Future 为参数调用。
+            func     (Callable)                      : 任务函数，在工作池中执行。
+            args     (tuple)                         : 任务函数的位置参数。
+            kwargs   (dict)                          : 任务函数的关键字参数。
+        Returns:
+            Future: 任务的 Future 对象，它会在 UI 线程交付时才被设置结果。
+        """
+        future = Future()
+        self.backlog.append((future, callback, func, args, kwargs))
+        self.dispatch()
+        return future
+
+    def dispatch(self):
+        """
+        将积压队列中的任务提交到工作池，直到在途任务数量达到上限。
+        """
+        if self.pool is None:
+            self.pool = self.create_pool()
+        backlog = self.backlog
+        while backlog and self.in_flight < self.max_pending:
+            future, callback, func, args, kwargs = backlog.popleft()
+            # 已被取消的任务直接丢弃
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.in_flight += 1
+            self.pool.submit(func, *args, **kwargs).add_done_callback(partial(self.on_pool_done, future, callback))
+
+    def on_pool_done(self, future: Future, callback: Callable[[Future], None] | None, pool_future: Future):
+        """
+        工作池任务完成时调用（在工作线程中），将结果放入交付队列，并在队列由空变为非空时投递一次唤醒事件。
+        Args:
+            future      (Future)                        : 对外的 Future 对象。
+            callback    (Callable[[Future], None] | None): 完成回调。
+            pool_future (Future)                        : 工作池内部的 Future 对象。
+        """
+        # 被 shutdown(cancel_futures=True) 取消的任务没有结果，exception() 会抛出 CancelledError
+        if pool_future.cancelled():
+            exception = CancelledError()
+        else:
+            exception = pool_future.exception()
+        result = None if exception is not None else pool_future.result()
+        with self.lock:
+            self.done.append((future, callback, result, exception))
+            if self.wakeup_posted:
+                return
+            self.wakeup_posted = True
+            seq = self.wakeup_seq
+        fantas.event.post(fantas.Event(fantas.EXECUTORDONE, executor=self, seq=seq))
+
+    def deliver(self, seq: int | None = None):
+        """
+        在 UI 线程中交付已完成的任务，设置 Future 结果并调用完成回调。
+        多窗口时同一个唤醒事件会被每个窗口的事件处理器处理，只有第一次处理有效，保证每帧最多交付 deliver_limit 个。
+        Args:
+            seq (int | None): 唤醒事件的序号，与当前有效的序号不同时什么也不做；为 None 表示手动交付，总是执行。
+        """
+        done = self.done
+        with self.lock:
+            if seq is not None and seq != self.wakeup_seq:
+                return
+            # 交付后之前投递的唤醒事件全部失效
+            self.wakeup_seq += 1
+            seq = self.wakeup_seq
+            batch = [done.popleft() for _ in range(min(len(done), self.deliver_limit))]
+            # 还有剩余则保持唤醒标志，并在下一帧继续交付
+            remain = bool(done)
+            if not remain:
+                self.wakeup_posted = False
+        if remain:
+            fantas.event.post(fantas.Event(fantas.EXECUTORDONE, executor=self, seq=seq))
+        for future, callback, result, exception in batch:
+            self.in_flight -= 1
+            if exception is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exception)
+            if callback is not None:
+                callback(future)
+        # 交付释放了在途名额，继续提交积压的任务
+        if self.backlog:
+            self.dispatch()
+
+    def get_pending_count(self) -> int:
+        """
+        获取尚未交付的任务总数（积压 + 在途）。
+        Returns:
+            int: 尚未交付的任务数量。
+        """
+        return len(self.backlog) + self.in_flight
+
+    def shutdown(self, wait: bool = True):
+        """
+        关闭工作池，取消所有积压的任务。
+        Args:
+            wait (bool): 是否等待正在执行的任务完成。
+        """
+        while self.backlog:
+            self.backlog.popleft()[0].cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait, cancel_futures=True)
+            self.pool = None
+
+@dataclass(slots=True)
+class ThreadExecutor(Executor):
+    """ 线程池执行器，适合会释放 GIL 的任务，比如图像解码、文件读写。 """
+
+    def create_pool(self) -> PoolExecutor:
+        """ 创建线程池。 """
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fantas-worker")
+
+@dataclass(slots=True)
+class ProcessExecutor(Executor):
+    """ 进程池执行器，适合纯 Python 的计算密集型任务，任务函数、参数和返回值都必须可以被 pickle。 """
+
+    def create_pool(self) -> PoolExecutor:
+        """ 创建进程池。 """
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+thread_executor  = ThreadExecutor()     # 内置线程池执行器
+process_executor = ProcessExecutor()    # 内置进程池执行器
+
+atexit.register(thread_executor.shutdown, False)
+atexit.register(process_executor.shutdown, False)
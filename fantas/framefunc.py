@@ -25,10 +25,27 @@ def run_framefuncs():
     """
     运行所有已启动的帧函数。
     """
+    if fantas.Tracer.recorder is not None:
+        run_framefuncs_traced()
+        return
     for ID, framefunc in tuple(framefunc_dict.items()):
         if framefunc.call():
             framefunc_dict.pop(ID)
 
+def run_framefuncs_traced():
+    """
+    运行所有已启动的帧函数，并把每个帧函数的调用记录为追踪片段。
+    """
+    # 简化引用
+    get_time_ns = fantas.get_time_ns
+    add = fantas.Tracer.recorder.add
+    for ID, framefunc in tuple(framefunc_dict.items()):
+        start = get_time_ns()
+        done = framefunc.call()
+        add(type(framefunc).__name__, "framefunc", start, get_time_ns())
+        if done:
+            framefunc_dict.pop(ID)
+
 @dataclass(slots=True)
 class FrameFuncBase(ABC):
     """
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+import fantas
+from pygame.locals import HIDDEN
+
+__all__ = (
+    "HeadlessWindow",
+)
+
+class HeadlessWindow:
+    """
+    无头窗口类，不需要真实的显示设备，将 UI 树渲染到离屏 Surface 上，并由调用者逐帧驱动。
+    它提供了和 fantas.Window 相同的 UI 树、渲染器和事件处理器接口，可以用于 CI、服务器端生成状态报告以及自动化渲染基准测试。
+    """
+    def __init__(self, window_config: fantas.WindowConfig):
+        """
+        初始化 HeadlessWindow 实例。
+        Args:
+            window_config (fantas.WindowConfig): 窗口配置数据类实例，只使用其中的 title、window_size 和 fps。
+        """
+        # 离屏 Surface 的 convert() / convert_alpha() 需要一个视频模式，没有的话就创建一个隐藏的 1x1 显示
+        if fantas.display.get_surface() is None:
+            fantas.display.set_mode((1, 1), HIDDEN)
+
+        self.title        : str                 = window_config.title
+        self.size         : fantas.IntPoint     = tuple(window_config.window_size)    # 窗口尺寸（宽, 高）（像素）
+        self.running      : bool                = True                                # 窗口运行状态标志
+        self.fps          : int                 = window_config.fps                   # 窗口帧率设置（仅在 mainloop 中使用）
+        self.frame_count  : int                 = 0                                   # 已经渲染的帧数
+        self.clock        : fantas.time.Clock   = fantas.time.Clock()                 # 用于控制帧率的时钟对象
+        self.screen       : fantas.Surface      = fantas.Surface(self.size)           # 离屏渲染目标
+        self.renderer     : fantas.Renderer     = fantas.Renderer(self)               # 窗口的渲染器对象
+        self.root_ui      : fantas.WindowRoot   = fantas.WindowRoot(window=self)      # 窗口的根 UI 元素
+        self.event_handler: fantas.EventHandler = fantas.EventHandler(window=self)    # 窗口的事件处理器对象
+
+        # 方便访问根 UI 元素的方法
+        self.append: Callable = self.root_ui.append
+        self.insert: Callable = self.root_ui.insert
+        self.remove: Callable = self.root_ui.remove
+        self.pop   : Callable = self.root_ui.pop
+        self.clear : Callable = self.root_ui.clear
+        # 方便访问事件处理器的管理监听器方法
+        self.add_event_listener   : Callable = self.event_handler.add_event_listener
+        self.remove_event_listener: Callable = self.event_handler.remove_event_listener
+
+    def get_surface(self) -> fantas.Surface:
+        """
+        获取离屏渲染目标，与 fantas.Window.get_surface() 对应。
+        Returns:
+            fantas.Surface: 离屏渲染目标。
+        """
+        return self.screen
+
+    def flip(self):
+        """
+        与 fantas.Window.flip() 对应，离屏渲染不需要刷新显示，什么也不做。
+        """
+        pass
+
+    def resize(self, size: fantas.IntPoint):
+        """
+        调整窗口尺寸，重新创建离屏渲染目标并更新根 UI 元素的尺寸。
+        Args:
+            size (fantas.IntPoint): 新的窗口尺寸（宽, 高）（像素）。
+        """
+        self.size = tuple(size)
+        self.screen = fantas.Surface(self.size)
+        self.root_ui.update_rect()
+
+    def step(self, events: Iterable[fantas.Event] = (), poll: bool = True) -> fantas.Surface:
+        """
+        运行一帧：处理事件、运行帧函数、生成渲染命令并渲染到离屏 Surface。
+        Args:
+            events (Iterable[fantas.Event]): 这一帧要注入的脚本事件，会在事件队列中的事件之后依次处理。
+            poll   (bool)                  : 是否处理事件队列中的事件（比如后台任务执行器的唤醒事件）。
+        Returns:
+            fantas.Surface: 渲染完成的离屏 Surface。
+        """
+        # 处理事件
+        if poll:
+            for event in fantas.event.get():
+                self.event_handler.handle_event(event)
+        for event in events:
+            self.event_handler.handle_event(event)
+        # 运行帧函数
+        fantas.run_framefuncs()
+        # 生成渲染命令
+        self.renderer.pre_render(self.root_ui)
+        # 渲染窗口
+        self.renderer.render(self.screen)
+        self.frame_count += 1
+        return self.screen
+
+    def run_frames(self, frames: int, script: Callable[[int], Iterable[fantas.Event]] | None = None, fps: int | None = None) -> fantas.Surface:
+        """
+        连续运行若干帧。
+        Args:
+            frames (int)                                           : 要运行的帧数。
+            script (Callable[[int], Iterable[fantas.Event]] | None): 帧脚本，以当前帧序号（从 0 开始）为参数调用，返回这一帧要注入的事件。
+            fps    (int | None)                                    : 限制帧率，为 None 时不限制（尽快运行）。基于时间的动画需要限制帧率才能得到和实际运行一致的画面。
+        Returns:
+            fantas.Surface: 最后一帧渲染完成的离屏 Surface。
+        """
+        # 预生成传递路径缓存
+        self.root_ui.build_pass_path_cache()
+        for i in range(frames):
+            if fps is not None:
+                self.clock.tick(fps)
+            self.step(() if script is None else script(i))
+        return self.screen
+
+    def mainloop(self):
+        """
+        以窗口帧率运行，直到 running 被设置为 False，与 fantas.Window.mainloop() 对应。
+        """
+        # 清空事件队列
+        fantas.event.clear()
+        # 预生成传递路径缓存
+        self.root_ui.build_pass_path_cache()
+        while self.running:
+            self.clock.tick(self.fps)
+            self.step()
+
+    def snapshot(self) -> fantas.Surface:
+        """
+        获取当前画面的副本。
+        Returns:
+            fantas.Surface: 当前画面的副本。
+        """
+        return self.screen.copy()
+
+    def save(self, path: Path | str):
+        """
+        将当前画面保存为图像文件，格式由扩展名决定（比如 .png）。
+        Args:
+            path (Path | str): 保存路径。
+        """
+        fantas.image.save(self.screen, path)
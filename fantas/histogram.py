@@ -0,0 +1,240 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+
+import fantas
+
+__all__ = (
+    "LatencyHistogram",
+    "FrameStats",
+)
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """
+    对数-线性分桶（HDR 风格）的耗时直方图，内存固定，记录与查询都是 O(1)/O(桶数)。
+    每个 2 的幂区间被均分为 2^(precision_bits-1) 个桶，相对误差不超过 2^-(precision_bits-1)（默认 1/64，约 1.6%）。
+    Args:
+        precision_bits: 精度位数，决定每个 2 的幂区间的桶数。
+        max_bits      : 可记录的最大值的位数（默认 2^36 纳秒，约 68 秒），更大的值记在最后一个桶中。
+    """
+    precision_bits: int = 7
+    max_bits      : int = 36
+
+    counts: array = field(init=False, repr=False)       # 各个桶的计数
+    count : int   = field(default=0, init=False)        # 记录的总数
+    total : int   = field(default=0, init=False)        # 记录的值之和
+    min   : int   = field(default=0, init=False)        # 记录的最小值
+    max   : int   = field(default=0, init=False)        # 记录的最大值
+    last  : int   = field(default=0, init=False)        # 最近一次记录的值
+
+    def __post_init__(self):
+        half = 1 << (self.precision_bits - 1)
+        self.counts = array("Q", bytes(8 * ((self.max_bits - self.precision_bits + 2) * half)))
+
+    def index(self, value: int) -> int:
+        """
+        计算值所在的桶。
+        Args:
+            value (int): 值（非负整数）。
+        Returns:
+            int: 桶索引。
+        """
+        exponent = value.bit_length() - self.precision_bits
+        if exponent <= 0:
+            return value
+        return min(exponent * (1 << (self.precision_bits - 1)) + (value >> exponent), len(self.counts) - 1)
+
+    def value_at(self, index: int) -> int:
+        """
+        计算桶的代表值（桶区间的中点）。
+        Args:
+            index (int): 桶索引。
+        Returns:
+            int: 代表值。
+        """
+        half = 1 << (self.precision_bits - 1)
+        if index < 2 * half:
+            return index
+        exponent = index // half - 1
+        mantissa = index - exponent * half
+        return (mantissa << exponent) + (1 << (exponent - 1))
+
+    def record(self, value: int):
+        """
+        记录一个值。
+        Args:
+            value (int): 值（纳秒），负值按 0 记录。
+        """
+        value = int(value)
+        if value < 0:
+            value = 0
+        self.counts[self.index(value)] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, percent: float) -> int:
+        """
+        计算百分位数。
+        Args:
+            percent (float): 百分位（0 ~ 100）。
+        Returns:
+            int: 百分位数（纳秒），没有记录时返回 0，结果不会超过记录的最大值。
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(max(self.value_at(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percents: tuple[float, ...] = (50, 95, 99)) -> dict[str, int]:
+        """
+        一次计算多个百分位数和最大值。
+        Args:
+            percents (tuple[float, ...]): 百分位列表。
+        Returns:
+            dict[str, int]: {'p50': ..., 'p95': ..., 'p99': ..., 'max': ...}（纳秒）。
+        """
+        result = {}
+        if self.count == 0:
+            result.update((f"p{percent:g}", 0) for percent in percents)
+        else:
+            targets = sorted((max(1, -(-self.count * percent // 100)), percent) for percent in percents)
+            seen = 0
+            position = 0
+            for index, count in enumerate(self.counts):
+                if not count:
+                    continue
+                seen += count
+                while position < len(targets) and seen >= targets[position][0]:
+                    result[f"p{targets[position][1]:g}"] = min(max(self.value_at(index), self.min), self.max)
+                    position += 1
+                if position == len(targets):
+                    break
+        result["max"] = self.max
+        return result
+
+    @property
+    def mean(self) -> float:
+        """ 平均值（纳秒）。 """
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: LatencyHistogram):
+        """
+        把另一个相同配置的直方图合并到这个直方图中。
+        Args:
+            other (LatencyHistogram): 另一个直方图。
+        """
+        if (other.precision_bits, other.max_bits) != (self.precision_bits, self.max_bits):
+            raise ValueError("只能合并相同配置的直方图。")
+        if other.count == 0:
+            return
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def reset(self):
+        """
+        清空所有记录。
+        """
+        self.counts = array("Q", bytes(8 * len(self.counts)))
+        self.count = self.total = self.min = self.max = self.last = 0
+
+@dataclass(slots=True)
+class FrameStats:
+    """
+    帧耗时统计，为每个主循环阶段和整帧各维护一个耗时直方图，并统计超出帧预算的帧数。
+    整帧耗时是一帧中实际工作的耗时（不包括限制帧率的空闲等待和调试开销），帧预算是 1 秒 / 目标帧率。
+    """
+    histograms : dict[str, LatencyHistogram] = field(default_factory=dict, init=False, repr=False)    # 阶段名称 -> 耗时直方图（整帧为 'Frame'）
+    over_budget: int                         = field(default=0, init=False)                          # 超出帧预算的帧数
+    excluded   : tuple[str, ...]             = field(default=("Idle", "Debug"), init=False, repr=False)    # 不计入整帧耗时的阶段
+
+    @property
+    def frames(self) -> int:
+        """ 记录的帧数。 """
+        histogram = self.histograms.get("Frame")
+        return 0 if histogram is None else histogram.count
+
+    def get_histogram(self, label: str) -> LatencyHistogram:
+        """
+        获取一个阶段的直方图，没有则创建。
+        Args:
+            label (str): 阶段名称。
+        Returns:
+            LatencyHistogram: 直方图。
+        """
+        histogram = self.histograms.get(label)
+        if histogram is None:
+            self.histograms[label] = histogram = LatencyHistogram()
+        return histogram
+
+    def record(self, time_records: dict[str, int], fps: int):
+        """
+        记录一帧中各个阶段的耗时（一般是 DebugTimer.time_records），并据此记录整帧耗时。
+        Args:
+            time_records (dict[str, int]): 阶段名称 -> 耗时（纳秒）。
+            fps          (int)           : 这一帧的目标帧率。
+        """
+        frame_ns = 0
+        for label, ns in time_records.items():
+            self.get_histogram(label).record(ns)
+            if label not in self.excluded:
+                frame_ns += ns
+        self.record_frame(frame_ns, fps)
+
+    def record_frame(self, frame_ns: int, fps: int):
+        """
+        记录一帧的整帧耗时。
+        Args:
+            frame_ns (int): 整帧耗时（纳秒）。
+            fps      (int): 这一帧的目标帧率，不大于 0 时表示不限帧率，没有帧预算。
+        """
+        self.get_histogram("Frame").record(frame_ns)
+        if fps > 0 and frame_ns > 1_000_000_000 // fps:
+            self.over_budget += 1
+
+    def percentiles(self, label: str = "Frame", percents: tuple[float, ...] = (50, 95, 99)) -> dict[str, int]:
+        """
+        获取一个阶段的耗时百分位数和最大值。
+        Args:
+            label    (str)               : 阶段名称，默认为整帧。
+            percents (tuple[float, ...]): 百分位列表。
+        Returns:
+            dict[str, int]: {'p50': ..., 'p95': ..., 'p99': ..., 'max': ...}（纳秒）。
+        """
+        histogram = self.histograms.get(label)
+        if histogram is None:
+            histogram = LatencyHistogram()
+        return histogram.percentiles(percents)
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """
+        获取所有阶段的耗时百分位数。
+        Returns:
+            dict[str, dict[str, int]]: 阶段名称 -> {'p50', 'p95', 'p99', 'max', 'count'}（纳秒）。
+        """
+        return {label: {**histogram.percentiles(), "count": histogram.count} for label, histogram in self.histograms.items()}
+
+    def reset(self):
+        """
+        清空所有统计。
+        """
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.over_budget = 0
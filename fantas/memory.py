@@ -0,0 +1,273 @@
+from __future__ import annotations
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+
+import fantas
+
+__all__ = (
+    "MEMORY_LABELS",
+    "MemoryReport",
+    "MemoryTracker",
+    "surface_bytes",
+    "measure_subtree",
+    "measure_memory",
+)
+
+# 内存统计的分类，顺序即 MemoryReport.values() 的顺序
+MEMORY_LABELS = ("Surface", "RenderCache", "PassPath", "Image", "CacheEntries")
+
+# 类型 -> 所有槽位名称的缓存
+slot_names_cache: dict[type, tuple[str, ...]] = {}
+
+def slot_names(cls: type) -> tuple[str, ...]:
+    """
+    获取一个类（包括父类）的所有槽位名称。
+    Args:
+        cls (type): 类。
+    Returns:
+        tuple[str, ...]: 槽位名称。
+    """
+    names = slot_names_cache.get(cls)
+    if names is None:
+        names = []
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            names.extend((slots,) if isinstance(slots, str) else slots)
+        slot_names_cache[cls] = names = tuple(dict.fromkeys(name for name in names if name not in ("__weakref__", "__dict__")))
+    return names
+
+def surface_bytes(surface: fantas.Surface) -> int:
+    """
+    计算一个 Surface 的像素数据占用的字节数（宽 × 高 × 每像素字节数）。
+    子 Surface 与父 Surface 共享像素数据，计为 0。
+    Args:
+        surface (fantas.Surface): Surface 对象。
+    Returns:
+        int: 字节数。
+    """
+    if surface.get_parent() is not None:
+        return 0
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+def iter_surfaces(obj: object):
+    """
+    遍历一个对象的槽位中直接引用的 Surface。
+    Args:
+        obj (object): 对象（一般是 UI 元素或渲染命令）。
+    Yields:
+        tuple[str, fantas.Surface | fantas.renderer.RenderCommand]: (槽位名称, Surface 或渲染命令)。
+    """
+    for name in slot_names(type(obj)):
+        value = getattr(obj, name, None)
+        if isinstance(value, fantas.ImageHandle):
+            value = value.surface
+        if isinstance(value, fantas.AtlasRegion):
+            value = value.page_surface
+        if isinstance(value, (fantas.Surface, fantas.RenderCommand)):
+            yield name, value
+
+@dataclass(slots=True)
+class MemoryReport:
+    """
+    一棵（或几棵）UI 树及全局缓存的内存统计，单位为字节。
+    Args:
+        name: 统计对象的名称（子树为根节点的类名与 ui_id）。
+    """
+    name: str = ""
+
+    nodes             : int                 = field(default=0, init=False)                          # 节点数量
+    surface_bytes     : int                 = field(default=0, init=False)                          # 节点直接引用的 Surface
+    render_cache_bytes: int                 = field(default=0, init=False)                          # 渲染命令缓存的 Surface（如渐变缓存）
+    pass_path_bytes   : int                 = field(default=0, init=False)                          # 传递路径缓存（列表本身）
+    image_bytes       : int                 = field(default=0, init=False)                          # 已加载的图像资源
+    images            : dict[str, int]      = field(default_factory=dict, init=False, repr=False)   # 图像资源名称 -> 字节数
+    caches            : dict[str, int]      = field(default_factory=dict, init=False, repr=False)   # 缓存名称 -> 条目数
+    children          : list[MemoryReport]  = field(default_factory=list, init=False, repr=False)   # 子树的统计
+
+    @property
+    def tree_bytes(self) -> int:
+        """ UI 树占用的字节数（Surface、渲染缓存与传递路径缓存）。 """
+        return self.surface_bytes + self.render_cache_bytes + self.pass_path_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        """ 所有可统计的字节数（UI 树与图像资源）。 """
+        return self.tree_bytes + self.image_bytes
+
+    @property
+    def cache_entries(self) -> int:
+        """ 所有缓存的条目总数。 """
+        return sum(self.caches.values())
+
+    def values(self) -> tuple[int, ...]:
+        """
+        按照 MEMORY_LABELS 的顺序获取各个分类的数值。
+        Returns:
+            tuple[int, ...]: 各个分类的字节数（CacheEntries 为条目数）。
+        """
+        return (self.surface_bytes, self.render_cache_bytes, self.pass_path_bytes, self.image_bytes, self.cache_entries)
+
+def measure_subtree(root: fantas.UI, depth: int = 0, seen: set[int] | None = None) -> MemoryReport:
+    """
+    统计一棵子树的内存占用，被多个节点共享的 Surface 只计一次。
+    Args:
+        root  (fantas.UI)       : 子树的根节点。
+        depth (int)             : 保留子树明细的深度，0 表示不保留。
+        seen  (set[int] | None) : 已经统计过的 Surface 的 id 集合，用于跨子树去重。
+    Returns:
+        MemoryReport: 统计结果，children 中是各个子节点的子树统计（到 depth 层为止）。
+    """
+    if seen is None:
+        seen = set()
+    report = MemoryReport(f"{type(root).__name__}#{getattr(root, 'ui_id', 0)}")
+    # 栈：(节点, 累计到的统计)
+    stack = [(root, report)]
+    while stack:
+        node, target = stack.pop()
+        target.nodes += 1
+        if node.pass_path_cache is not None:
+            target.pass_path_bytes += sys.getsizeof(node.pass_path_cache)
+        for _, value in iter_surfaces(node):
+            if isinstance(value, fantas.Surface):
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    target.surface_bytes += surface_bytes(value)
+            else:
+                for _, cached in iter_surfaces(value):
+                    if isinstance(cached, fantas.Surface) and id(cached) not in seen:
+                        seen.add(id(cached))
+                        target.render_cache_bytes += surface_bytes(cached)
+        # 子节点
+        if node is root and depth > 0:
+            for child in node.children:
+                child_report = measure_subtree(child, depth - 1, seen)
+                report.children.append(child_report)
+                report.nodes += child_report.nodes
+                report.surface_bytes += child_report.surface_bytes
+                report.render_cache_bytes += child_report.render_cache_bytes
+                report.pass_path_bytes += child_report.pass_path_bytes
+        else:
+            stack.extend((child, target) for child in node.children)
+    return report
+
+def measure_memory(*roots: fantas.UI, depth: int = 0) -> MemoryReport:
+    """
+    统计若干棵 UI 树、已加载的图像资源和已注册缓存的内存占用。
+    Args:
+        roots (fantas.UI): UI 树的根节点（一般是窗口的 root_ui）。
+        depth (int)      : 保留子树明细的深度，0 表示不保留。
+    Returns:
+        MemoryReport: 统计结果。
+    """
+    report = MemoryReport("Memory")
+    seen = set()
+    for root in roots:
+        child_report = measure_subtree(root, depth, seen)
+        report.children.append(child_report)
+        report.nodes += child_report.nodes
+        report.surface_bytes += child_report.surface_bytes
+        report.render_cache_bytes += child_report.render_cache_bytes
+        report.pass_path_bytes += child_report.pass_path_bytes
+    # 图像资源（不与 UI 树去重，引用了图像资源的节点也会计入 Surface）
+    for name, surface in fantas.images._resources.items():
+        report.images[name] = size = surface_bytes(surface)
+        report.image_bytes += size
+    # 缓存条目数
+    for name, stats in fantas.get_cache_stats().items():
+        report.caches[name] = stats["size"]
+    return report
+
+@dataclass(slots=True)
+class MemoryTracker:
+    """
+    内存增长跟踪器，定期统计内存占用并保存历史，用来发现长时间运行中的内存泄漏。
+    历史记录满了之后会丢弃一半的采样并把采样间隔加倍，所以可以在固定内存中覆盖任意长的运行时间。
+    Args:
+        interval_ns: 初始采样间隔（纳秒）。
+        capacity   : 历史记录最多保存的采样数量。
+    """
+    interval_ns: int = 10_000_000_000
+    capacity   : int = 1024
+
+    history    : deque               = field(default_factory=deque, init=False, repr=False)    # 历史采样 [(时间点（纳秒）, MemoryReport.values()), ...]
+    last_report: MemoryReport | None = field(default=None, init=False, repr=False)             # 最近一次统计结果
+    last_time  : int                 = field(default=0, init=False, repr=False)                # 最近一次采样的时间点（纳秒）
+
+    def poll(self, *roots: fantas.UI) -> bool:
+        """
+        距离上次采样超过采样间隔时采样一次，由主循环每帧调用。
+        Args:
+            roots (fantas.UI): UI 树的根节点。
+        Returns:
+            bool: 是否进行了采样。
+        """
+        now = fantas.get_time_ns()
+        if self.last_time and now - self.last_time < self.interval_ns:
+            return False
+        self.sample(*roots)
+        return True
+
+    def sample(self, *roots: fantas.UI) -> MemoryReport:
+        """
+        立即采样一次。
+        Args:
+            roots (fantas.UI): UI 树的根节点。
+        Returns:
+            MemoryReport: 统计结果。
+        """
+        self.last_report = report = measure_memory(*roots)
+        self.last_time = now = fantas.get_time_ns()
+        self.history.append((now, report.values()))
+        # 降低历史分辨率
+        if len(self.history) > self.capacity:
+            self.history = deque(sample for i, sample in enumerate(self.history) if i % 2 == 0)
+            self.interval_ns *= 2
+        return report
+
+    def growth(self, window_ns: int | None = None) -> tuple[float, ...]:
+        """
+        按照最小二乘法计算各个分类的增长速度。
+        Args:
+            window_ns (int | None): 只使用最近这么长时间内的采样，为 None 表示使用全部历史。
+        Returns:
+            tuple[float, ...]: 按照 MEMORY_LABELS 顺序的增长速度（每小时字节数，CacheEntries 为每小时条目数），采样不足两个时为 0。
+        """
+        samples = list(self.history)
+        if window_ns is not None and samples:
+            start = samples[-1][0] - window_ns
+            samples = [sample for sample in samples if sample[0] >= start]
+        if len(samples) < 2:
+            return (0.0,) * len(MEMORY_LABELS)
+        n = len(samples)
+        mean_t = sum(t for t, _ in samples) / n
+        var_t = sum((t - mean_t) ** 2 for t, _ in samples)
+        if var_t == 0:
+            return (0.0,) * len(MEMORY_LABELS)
+        result = []
+        for i in range(len(MEMORY_LABELS)):
+            mean_v = sum(values[i] for _, values in samples) / n
+            slope = sum((t - mean_t) * (values[i] - mean_v) for t, values in samples) / var_t
+            result.append(slope * 3_600_000_000_000)
+        return tuple(result)
+
+    def delta(self) -> tuple[int, ...]:
+        """
+        计算各个分类相对第一次采样的变化量。
+        Returns:
+            tuple[int, ...]: 按照 MEMORY_LABELS 顺序的变化量，没有采样时为 0。
+        """
+        if not self.history:
+            return (0,) * len(MEMORY_LABELS)
+        first = self.history[0][1]
+        last = self.history[-1][1]
+        return tuple(b - a for a, b in zip(first, last))
+
+    def clear(self):
+        """
+        清空历史。
+        """
+        self.history.clear()
+        self.last_report = None
+        self.last_time = 0
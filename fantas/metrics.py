@@ -0,0 +1,248 @@
+from __future__ import annotations
+import os
+import json
+import socket
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fantas
+
+__all__ = (
+    "FrameMetrics",
+    "MetricsExporter",
+    "register_metric_cache",
+    "get_cache_stats",
+)
+
+# 被统计命中率的缓存，名称 -> 带有 cache_info() 的缓存函数
+metric_caches: dict[str, Callable] = {}
+
+def register_metric_cache(name: str, cache: Callable):
+    """
+    注册一个需要统计命中率的缓存，快照中会包含它的命中次数、未命中次数与命中率。
+    Args:
+        name  (str)     : 缓存名称。
+        cache (Callable): 带有 cache_info() 方法的缓存函数（functools.lru_cache / fantas.lru_cache_typed 装饰的函数）。
+    Raises:
+        ValueError: 缓存没有 cache_info() 方法。
+    """
+    if not callable(getattr(cache, "cache_info", None)):
+        raise ValueError(f"缓存 {name} 没有 cache_info() 方法。")
+    metric_caches[name] = cache
+
+def get_cache_stats() -> dict[str, dict[str, int | float]]:
+    """
+    获取所有已注册缓存的统计信息。
+    Returns:
+        dict[str, dict[str, int | float]]: 缓存名称 -> {'hits', 'misses', 'hit_rate', 'size', 'maxsize'}。
+    """
+    stats = {}
+    for name, cache in metric_caches.items():
+        info = cache.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits"    : info.hits,
+            "misses"  : info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size"    : info.currsize,
+            "maxsize" : info.maxsize or 0,
+        }
+    return stats
+
+# 注册 fantas 内置的缓存
+for name, cache in (
+    ("Font.get_rect"               , fantas.Font.get_rect),
+    ("Font._get_width_char_kerning", fantas.Font._get_width_char_kerning),
+    ("Font.get_widthes"            , fantas.Font.get_widthes),
+    ("Font.auto_wrap"              , fantas.Font.auto_wrap),
+    ("FormulaCurve.__call__"       , fantas.FormulaCurve.__call__),
+):
+    register_metric_cache(name, cache)
+del name, cache
+
+@dataclass(slots=True)
+class FrameMetrics:
+    """
+    常驻的主循环指标，开销足够低（每帧几次取时间和整数累加），可以在正式运行时一直开启。
+    统计帧数、掉帧数、各阶段累计耗时、事件数和渲染命令数，缓存命中率只在获取快照时计算。
+    掉帧数按照相邻两帧开始时间的间隔计算：间隔约为 n 个帧周期时，记为掉了 n - 1 帧。
+    """
+    PHASES = ("Event", "FrameFunc", "PreRender", "Render")    # 记录的阶段
+
+    frames        : int                       = field(default=0, init=False)                                        # 记录的帧数
+    dropped_frames: int                       = field(default=0, init=False)                                        # 掉帧数
+    events        : int                       = field(default=0, init=False)                                        # 处理的事件总数
+    commands      : int                       = field(default=0, init=False)                                        # 最近一帧的渲染命令数
+    total_commands: int                       = field(default=0, init=False)                                        # 渲染命令总数
+    phase_ns      : list[int]                 = field(default_factory=lambda: [0, 0, 0, 0], init=False, repr=False)    # 各阶段的累计耗时（纳秒），顺序同 PHASES
+    frame_time    : fantas.LatencyHistogram   = field(default_factory=fantas.LatencyHistogram, init=False, repr=False) # 整帧耗时直方图
+    fps           : int                       = field(default=0, init=False)                                        # 最近一帧的目标帧率
+    start_time    : int                       = field(default_factory=fantas.get_time_ns, init=False)               # 开始统计的时间点（纳秒）
+    last_start    : int                       = field(default=0, init=False, repr=False)                            # 上一帧的开始时间点（纳秒）
+
+    def record_frame(self, start: int, event_end: int, framefunc_end: int, pre_render_end: int, end: int, events: int, commands: int, fps: int):
+        """
+        记录一帧，参数中的时间点都是 fantas.get_time_ns() 的返回值。
+        Args:
+            start          (int): 帧开始（限制帧率的等待结束）的时间点。
+            event_end      (int): 处理完事件的时间点。
+            framefunc_end  (int): 运行完帧函数的时间点。
+            pre_render_end (int): 生成完渲染命令的时间点。
+            end            (int): 更新完窗口显示的时间点。
+            events         (int): 这一帧处理的事件数。
+            commands       (int): 这一帧的渲染命令数。
+            fps            (int): 这一帧的目标帧率，不大于 0 时表示不限帧率，不统计掉帧。
+        """
+        # 掉帧
+        if fps > 0 and self.last_start:
+            period = 1_000_000_000 // fps
+            missed = (start - self.last_start + period // 2) // period - 1
+            if missed > 0:
+                self.dropped_frames += missed
+        self.last_start = start
+        # 各阶段耗时
+        phase_ns = self.phase_ns
+        phase_ns[0] += event_end - start
+        phase_ns[1] += framefunc_end - event_end
+        phase_ns[2] += pre_render_end - framefunc_end
+        phase_ns[3] += end - pre_render_end
+        self.frame_time.record(end - start)
+        # 计数
+        self.frames += 1
+        self.events += events
+        self.commands = commands
+        self.total_commands += commands
+        self.fps = fps
+
+    def snapshot(self) -> dict:
+        """
+        获取当前所有指标的快照。
+        Returns:
+            dict: 可以直接序列化为 JSON 的指标数据，时间单位为纳秒。
+        """
+        frames = self.frames
+        return {
+            "uptime_ns"     : fantas.get_time_ns() - self.start_time,
+            "frames"        : frames,
+            "dropped_frames": self.dropped_frames,
+            "fps"           : self.fps,
+            "events"        : self.events,
+            "commands"      : {"last": self.commands, "total": self.total_commands, "mean": self.total_commands / frames if frames else 0.0},
+            "phases"        : {phase: {"total_ns": ns, "mean_ns": ns / frames if frames else 0.0} for phase, ns in zip(self.PHASES, self.phase_ns)},
+            "frame_time"    : {**self.frame_time.percentiles(), "mean": self.frame_time.mean},
+            "caches"        : get_cache_stats(),
+        }
+
+    def reset(self):
+        """
+        清空所有指标。
+        """
+        self.frames = self.dropped_frames = self.events = self.commands = self.total_commands = self.last_start = 0
+        self.phase_ns = [0, 0, 0, 0]
+        self.frame_time.reset()
+        self.start_time = fantas.get_time_ns()
+
+def to_prometheus(snapshot: dict, prefix: str = "fantas") -> str:
+    """
+    把指标快照转换为 Prometheus 文本格式。
+    Args:
+        snapshot (dict): FrameMetrics.snapshot() 的返回值。
+        prefix   (str) : 指标名称前缀。
+    Returns:
+        str: Prometheus 文本格式的指标。
+    """
+    lines = [
+        f"{prefix}_uptime_seconds {snapshot['uptime_ns'] / 1e9}",
+        f"{prefix}_frames_total {snapshot['frames']}",
+        f"{prefix}_dropped_frames_total {snapshot['dropped_frames']}",
+        f"{prefix}_target_fps {snapshot['fps']}",
+        f"{prefix}_events_total {snapshot['events']}",
+        f"{prefix}_render_commands {snapshot['commands']['last']}",
+        f"{prefix}_render_commands_total {snapshot['commands']['total']}",
+    ]
+    for phase, stats in snapshot["phases"].items():
+        lines.append(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {stats["total_ns"] / 1e9}')
+    for key, ns in snapshot["frame_time"].items():
+        quantile = {"p50": "0.5", "p95": "0.95", "p99": "0.99", "max": "1"}.get(key)
+        if quantile is not None:
+            lines.append(f'{prefix}_frame_seconds{{quantile="{quantile}"}} {ns / 1e9}')
+    for name, stats in snapshot["caches"].items():
+        lines.append(f'{prefix}_cache_hits_total{{cache="{name}"}} {stats["hits"]}')
+        lines.append(f'{prefix}_cache_misses_total{{cache="{name}"}} {stats["misses"]}')
+        lines.append(f'{prefix}_cache_size{{cache="{name}"}} {stats["size"]}')
+    lines.append("")
+    return "\n".join(lines)
+
+@dataclass(slots=True)
+class MetricsExporter:
+    """
+    指标导出器，由主循环每帧调用 poll()，每隔一段时间把指标快照写入本地文件或发送到本地 UDP 端口，供监控程序采集。
+    写文件时先写入临时文件再替换，采集方不会读到写了一半的文件。
+    Args:
+        path       : 导出文件路径，为 None 表示不写文件。
+        address    : 导出的 UDP 地址 (host, port)，为 None 表示不发送。
+        interval_ns: 导出间隔（纳秒）。
+        format     : 导出格式，'json' 或 'prometheus'。
+    """
+    path       : Path | str | None       = None
+    address    : tuple[str, int] | None  = None
+    interval_ns: int                     = 1_000_000_000
+    format     : str                     = "json"
+
+    sock       : socket.socket | None = field(default=None, init=False, repr=False)    # UDP 套接字
+    last_export: int                  = field(default=0, init=False, repr=False)       # 上次导出的时间点（纳秒）
+    exports    : int                  = field(default=0, init=False)                   # 导出次数
+    errors     : int                  = field(default=0, init=False)                   # 导出失败次数
+
+    def __post_init__(self):
+        if self.format not in ("json", "prometheus"):
+            raise ValueError(f"不支持的导出格式：{self.format}。")
+        if self.path is None and self.address is None:
+            raise ValueError("导出文件路径和 UDP 地址至少需要指定一个。")
+        if self.address is not None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setblocking(False)
+
+    def poll(self, metrics: FrameMetrics):
+        """
+        距离上次导出超过导出间隔时导出一次，由主循环每帧调用。
+        Args:
+            metrics (FrameMetrics): 指标。
+        """
+        now = fantas.get_time_ns()
+        if now - self.last_export >= self.interval_ns:
+            self.last_export = now
+            self.export(metrics)
+
+    def export(self, metrics: FrameMetrics):
+        """
+        立即导出一次，导出失败（如磁盘已满、端口不可达）只计数，不会影响主循环。
+        Args:
+            metrics (FrameMetrics): 指标。
+        """
+        snapshot = metrics.snapshot()
+        if self.format == "json":
+            data = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        else:
+            data = to_prometheus(snapshot).encode("utf-8")
+        try:
+            if self.path is not None:
+                temp = f"{self.path}.tmp"
+                with open(temp, "wb") as file:
+                    file.write(data)
+                os.replace(temp, self.path)
+            if self.sock is not None:
+                self.sock.sendto(data, self.address)
+        except OSError:
+            self.errors += 1
+        else:
+            self.exports += 1
+
+    def close(self):
+        """
+        关闭 UDP 套接字。
+        """
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
@@ -1,3 +1,4 @@
+import time
 import platform
 from pathlib   import Path
 from itertools import count
@@ -8,11 +9,26 @@ from time import perf_counter_ns as get_time_ns
 __all__ = (
     "platform",
     "get_time_ns",
+    "sleep_until_ns",
     "package_path",
     "generate_unique_id",
     "lru_cache_typed",
 )
 
+def sleep_until_ns(deadline_ns: int, spin_ns: int = 500_000):
+    """
+    精确休眠到指定时间点。
+    先用系统休眠等待到截止时间前 spin_ns 纳秒，剩余的时间让出 CPU 自旋等待，以弥补系统休眠的精度不足。
+    Args:
+        deadline_ns (int): 截止时间点（纳秒，与 get_time_ns 同一时基）。
+        spin_ns     (int): 自旋等待的时长（纳秒），默认为 0.5 毫秒。
+    """
+    remain = deadline_ns - get_time_ns()
+    if remain > spin_ns:
+        time.sleep((remain - spin_ns) / 1e9)
+    while get_time_ns() < deadline_ns:
+        time.sleep(0)
+
 # 提供 fantas 包的路径获取函数
 def package_path():
     """
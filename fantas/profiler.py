@@ -0,0 +1,169 @@
+from __future__ import annotations
+import heapq
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+import fantas
+
+__all__ = (
+    "RenderCost",
+    "RenderProfiler",
+)
+
+@dataclass(slots=True)
+class RenderCost:
+    """
+    一个 UI 元素在统计窗口内的渲染开销。
+    Args:
+        ui_id        : UI 元素的唯一标识 ID（没有创建者的渲染命令为 0）。
+        name         : UI 元素的类名。
+        pre_render_ns: 生成渲染命令的总耗时（纳秒）。
+        render_ns    : 执行渲染命令的总耗时（纳秒）。
+        commands     : 执行的渲染命令数量。
+        passes       : 统计窗口内的渲染轮数（pre_render 调用次数），用于计算每帧平均值。
+    """
+    ui_id        : int
+    name         : str
+    pre_render_ns: int
+    render_ns    : int
+    commands     : int
+    passes       : int
+
+    @property
+    def total_ns(self) -> int:
+        """ 生成与执行渲染命令的总耗时（纳秒）。 """
+        return self.pre_render_ns + self.render_ns
+
+    @property
+    def per_pass_ns(self) -> float:
+        """ 平均每轮渲染的耗时（纳秒），单窗口时即每帧耗时。 """
+        return self.total_ns / self.passes if self.passes else 0.0
+
+@dataclass(slots=True)
+class RenderProfiler:
+    """
+    渲染开销分析器，把 Renderer.pre_render() 和 Renderer.render() 的耗时按照渲染命令的创建者（UI 元素）归类，
+    在滑动时间窗口内累计，并给出开销最大的若干个 UI 元素。
+    生成渲染命令的耗时按照生成器两次产出之间的时间归给后一条渲染命令的创建者。
+    一个分析器可以同时挂在多个渲染器上（比如多窗口），ui_id 全局唯一，不会混淆；
+    多窗口并行渲染时 render_instrumented() 在工作线程中调用 add()，所以所有读写都由锁保护。
+    Args:
+        window_ns: 滑动窗口长度（纳秒）。
+        bucket_ns: 滑动窗口的分桶粒度（纳秒），过期数据以桶为单位移出。
+    """
+    window_ns: int = 2_000_000_000
+    bucket_ns: int = 100_000_000
+
+    buckets: deque                 = field(default_factory=deque, init=False, repr=False)    # 分桶 [[开始时间点, 渲染轮数, {ui_id: [生成耗时, 执行耗时, 命令数]}], ...]
+    current: dict[int, list[int]]  = field(default_factory=dict, init=False, repr=False)     # 当前桶的统计数据
+    totals : dict[int, list[int]]  = field(default_factory=dict, init=False, repr=False)     # 窗口内的累计数据（不含当前桶）
+    names  : dict[int, str]        = field(default_factory=dict, init=False, repr=False)     # ui_id -> 类名
+    passes : int                   = field(default=0, init=False)                            # 窗口内的渲染轮数（不含当前桶）
+    lock   : threading.Lock        = field(default_factory=threading.Lock, init=False, repr=False)    # 保护以上所有数据
+
+    def __post_init__(self):
+        self.buckets.append([fantas.get_time_ns(), 0, self.current])
+
+    def begin_pass(self):
+        """
+        开始新一轮渲染，由 Renderer.pre_render() 调用，必要时开启新桶并移出过期的桶。
+        """
+        now = fantas.get_time_ns()
+        with self.lock:
+            bucket = self.buckets[-1]
+            if now - bucket[0] >= self.bucket_ns:
+                # 当前桶计入累计数据
+                self.merge(bucket, 1)
+                self.current = {}
+                bucket = [now, 0, self.current]
+                self.buckets.append(bucket)
+                # 移出过期的桶
+                while now - self.buckets[0][0] > self.window_ns:
+                    self.merge(self.buckets.popleft(), -1)
+            bucket[1] += 1
+
+    def merge(self, bucket: list, sign: int):
+        """
+        把一个桶的数据加入（sign=1）或移出（sign=-1）累计数据，调用时需要持有锁。
+        Args:
+            bucket (list): 桶。
+            sign   (int) : 1 或 -1。
+        """
+        totals = self.totals
+        self.passes += sign * bucket[1]
+        for ui_id, (pre_render_ns, render_ns, commands) in bucket[2].items():
+            total = totals.get(ui_id)
+            if total is None:
+                totals[ui_id] = total = [0, 0, 0]
+            total[0] += sign * pre_render_ns
+            total[1] += sign * render_ns
+            total[2] += sign * commands
+            if sign < 0 and total == [0, 0, 0]:
+                del totals[ui_id]
+                if ui_id not in self.current:
+                    self.names.pop(ui_id, None)
+
+    def add(self, creator: fantas.UI | None, index: int, ns: int):
+        """
+        累计一个 UI 元素的耗时。
+        Args:
+            creator (fantas.UI | None): 渲染命令的创建者。
+            index   (int)             : 0 表示生成渲染命令，1 表示执行渲染命令。
+            ns      (int)             : 耗时（纳秒）。
+        """
+        ui_id = 0 if creator is None else creator.ui_id
+        with self.lock:
+            stats = self.current.get(ui_id)
+            if stats is None:
+                self.current[ui_id] = stats = [0, 0, 0]
+                if ui_id not in self.names:
+                    self.names[ui_id] = type(creator).__name__
+            stats[index] += ns
+            if index:
+                stats[2] += 1
+
+    def costs(self) -> list[RenderCost]:
+        """
+        获取滑动窗口内所有 UI 元素的渲染开销。
+        Returns:
+            list[RenderCost]: 渲染开销列表（无序）。
+        """
+        with self.lock:
+            merged = {ui_id: list(stats) for ui_id, stats in self.totals.items()}
+            for ui_id, (pre_render_ns, render_ns, commands) in self.current.items():
+                stats = merged.get(ui_id)
+                if stats is None:
+                    merged[ui_id] = [pre_render_ns, render_ns, commands]
+                else:
+                    stats[0] += pre_render_ns
+                    stats[1] += render_ns
+                    stats[2] += commands
+            passes = self.passes + self.buckets[-1][1]
+            names = dict(self.names)
+        return [RenderCost(ui_id, names.get(ui_id, "?"), *stats, passes) for ui_id, stats in merged.items()]
+
+    def top(self, n: int = 10, key: str = "total_ns") -> list[RenderCost]:
+        """
+        获取滑动窗口内开销最大的 n 个 UI 元素。
+        Args:
+            n   (int): 数量。
+            key (str): 排序依据，'total_ns'、'pre_render_ns' 或 'render_ns'。
+        Returns:
+            list[RenderCost]: 按开销从大到小排列的渲染开销列表。
+        """
+        if key not in ("total_ns", "pre_render_ns", "render_ns"):
+            raise ValueError(f"不支持的排序依据：{key}。")
+        return heapq.nlargest(n, self.costs(), key=lambda cost: getattr(cost, key))
+
+    def clear(self):
+        """
+        清空所有统计数据。
+        """
+        with self.lock:
+            self.buckets.clear()
+            self.current = {}
+            self.totals.clear()
+            self.names.clear()
+            self.passes = 0
+            self.buckets.append([fantas.get_time_ns(), 0, self.current])
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import os
 from abc import ABC, abstractmethod
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
 import fantas
@@ -28,6 +30,12 @@ class Renderer:
 
     queue: deque = field(default_factory=deque, init=False, repr=False)    # 渲染命令队列，左端入右端出
 
+    tile_size : int                       = field(default=0, init=False)                # 分块渲染的块边长（像素），0 表示不分块
+    tile_pool : ThreadPoolExecutor | None = field(default=None, init=False, repr=False)  # 分块渲染线程池
+    tile_cache: tuple                     = field(default=(), init=False, repr=False)   # 分块缓存 (目标尺寸, 块边长, 块列数, 块行数, 块列表)
+
+    profiler: fantas.RenderProfiler | None = field(default=None, init=False, repr=False)    # 渲染开销分析器，为 None 表示不分析
+
     def pre_render(self, root_ui: fantas.UI):
         """
         预处理渲染命令，即更新渲染命令队列。
@@ -35,17 +43,192 @@ class Renderer:
             root_ui (fantas.UI): 根 UI 元素。
         """
         self.queue.clear()
+        if self.profiler is not None:
+            self.pre_render_profiled(root_ui)
+            return
         for command in root_ui.create_render_commands():
             self.queue.append(command)
 
+    def pre_render_profiled(self, root_ui: fantas.UI):
+        """
+        更新渲染命令队列，并把生成每条渲染命令的耗时归给其创建者。
+        Args:
+            root_ui (fantas.UI): 根 UI 元素。
+        """
+        # 简化引用
+        get_time_ns = fantas.get_time_ns
+        add = self.profiler.add
+        append = self.queue.append
+        self.profiler.begin_pass()
+        start = get_time_ns()
+        for command in root_ui.create_render_commands():
+            add(command.creator, 0, get_time_ns() - start)
+            append(command)
+            start = get_time_ns()
+
     def render(self, target_surface: fantas.Surface):
         """
         执行渲染队列中的所有渲染命令。
         Args:
             target_surface (fantas.Surface): 目标 Surface 对象。
         """
+        if fantas.Tracer.recorder is not None or self.profiler is not None:
+            self.render_instrumented(target_surface)
+            return
+        if self.tile_pool is not None:
+            self.render_tiled(target_surface)
+            return
+        # 连续的 IGNORE 模式 Surface 渲染命令（如图集中的图标）合并为一次 blits
+        IGNORE = fantas.FillMode.IGNORE
+        batch = []
         for command in self.queue:
+            if command.__class__ is SurfaceRenderCommand and command.fill_mode is IGNORE:
+                batch.append(command)
+                continue
+            if batch:
+                render_surface_batch(target_surface, batch)
+                batch = []
             command.render(target_surface)
+        if batch:
+            render_surface_batch(target_surface, batch)
+
+    def render_instrumented(self, target_surface: fantas.Surface):
+        """
+        执行渲染队列中的所有渲染命令，并测量每条渲染命令的耗时：
+        追踪时记录为追踪片段，分析时归给渲染命令的创建者。
+        分析时总是串行渲染，以便区分每条渲染命令；只追踪时分块渲染整体记录为一个片段。
+        Args:
+            target_surface (fantas.Surface): 目标 Surface 对象。
+        """
+        # 简化引用
+        get_time_ns = fantas.get_time_ns
+        recorder = fantas.Tracer.recorder
+        profiler = self.profiler
+        if profiler is None and self.tile_pool is not None:
+            start = get_time_ns()
+            self.render_tiled(target_surface)
+            recorder.add("render_tiled", "render", start, get_time_ns(), {"commands": len(self.queue)})
+            return
+        for command in self.queue:
+            start = get_time_ns()
+            command.render(target_surface)
+            end = get_time_ns()
+            if profiler is not None:
+                profiler.add(command.creator, 1, end - start)
+            if recorder is not None:
+                recorder.add(type(command).__name__, "render", start, end, {"creator": type(command.creator).__name__})
+
+    def enable_tiled_rendering(self, tile_size: int = 256, workers: int | None = None):
+        """
+        启用分块并行渲染。
+        Args:
+            tile_size (int)       : 块边长（像素），默认为 256。
+            workers   (int | None): 工作线程数量，None 表示使用 CPU 核心数。
+        """
+        self.disable_tiled_rendering()
+        self.tile_size = tile_size
+        self.tile_pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1, thread_name_prefix="fantas-tile")
+
+    def disable_tiled_rendering(self):
+        """
+        关闭分块并行渲染，恢复串行渲染。
+        """
+        if self.tile_pool is not None:
+            self.tile_pool.shutdown(wait=True)
+            self.tile_pool = None
+        self.tile_size = 0
+        self.tile_cache = ()
+
+    def get_tiles(self, target_rect: fantas.IntRect) -> tuple[int, int, list[fantas.IntRect]]:
+        """
+        获取目标区域的分块结果（按尺寸缓存）。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            tuple[int, int, list[fantas.IntRect]]: 块列数、块行数、按行优先排列的块矩形列表。
+        """
+        size = target_rect.size
+        tile_size = self.tile_size
+        if not self.tile_cache or self.tile_cache[0] != size or self.tile_cache[1] != tile_size:
+            cols = -(-size[0] // tile_size)
+            rows = -(-size[1] // tile_size)
+            tiles = [fantas.IntRect(col * tile_size, row * tile_size, tile_size, tile_size).clip(target_rect) for row in range(rows) for col in range(cols)]
+            self.tile_cache = (size, tile_size, cols, rows, tiles)
+        return self.tile_cache[2:]
+
+    def render_tiled(self, target_surface: fantas.Surface):
+        """
+        分块并行执行渲染队列中的渲染命令。
+        可以分块的渲染命令会按照与之相交的块分组，各块在线程池中并行渲染，并通过裁剪区域保证互不干扰；
+        不能分块的渲染命令作为屏障，等待之前的块全部完成后在整个目标上串行执行。
+        渲染结果与串行渲染逐像素一致。
+        Args:
+            target_surface (fantas.Surface): 目标 Surface 对象。
+        """
+        target_rect = target_surface.get_rect()
+        segment = []
+        append = segment.append
+        for command in self.queue:
+            bounds = command.get_tile_bounds(target_rect)
+            if bounds is None:
+                # 屏障：先完成已分组的命令，再串行执行当前命令
+                if segment:
+                    self.render_segment(target_surface, target_rect, segment)
+                    segment.clear()
+                command.render(target_surface)
+            else:
+                append((command, bounds))
+        if segment:
+            self.render_segment(target_surface, target_rect, segment)
+
+    def render_segment(self, target_surface: fantas.Surface, target_rect: fantas.IntRect, segment: list[tuple[RenderCommand, fantas.IntRect]]):
+        """
+        将一段可分块的渲染命令按块分组并并行渲染。
+        Args:
+            target_surface (fantas.Surface)                            : 目标 Surface 对象。
+            target_rect    (fantas.IntRect)                            : 目标 Surface 的矩形区域。
+            segment        (list[tuple[RenderCommand, fantas.IntRect]]): 渲染命令及其影响区域列表，保持原有顺序。
+        """
+        cols, rows, tiles = self.get_tiles(target_rect)
+        tile_size = self.tile_size
+        bins = [[] for _ in tiles]
+        # 按影响区域覆盖的块范围分组，保持命令顺序
+        for command, bounds in segment:
+            bounds = bounds.clip(target_rect)
+            if not bounds:
+                continue
+            col0 = bounds.left // tile_size
+            col1 = (bounds.right - 1) // tile_size
+            for row in range(bounds.top // tile_size, (bounds.bottom - 1) // tile_size + 1):
+                base = row * cols
+                for col in range(col0, col1 + 1):
+                    bins[base + col].append(command)
+        jobs = [(tiles[i], commands) for i, commands in enumerate(bins) if commands]
+        if not jobs:
+            return
+        # 其余块交给线程池，最后一块由当前线程渲染
+        submit = self.tile_pool.submit
+        render_tile = self.render_tile
+        futures = [submit(render_tile, target_surface, tile, commands) for tile, commands in jobs[:-1]]
+        render_tile(target_surface, *jobs[-1])
+        # 屏障：等待所有块完成，工作线程中的异常会在这里重新抛出
+        for future in futures:
+            future.result()
+
+    @staticmethod
+    def render_tile(target_surface: fantas.Surface, tile: fantas.IntRect, commands: list[RenderCommand]):
+        """
+        在单个块内执行渲染命令。
+        使用与目标原点相同的子表面并设置裁剪区域，这样渲染命令无需平移坐标，且各个块的裁剪区域互不影响。
+        Args:
+            target_surface (fantas.Surface)    : 目标 Surface 对象。
+            tile           (fantas.IntRect)    : 块矩形区域。
+            commands       (list[RenderCommand]): 与该块相交的渲染命令列表。
+        """
+        view = target_surface.subsurface((0, 0, tile.right, tile.bottom))
+        view.set_clip(tile)
+        for command in commands:
+            command.render_tile(view)
 
     def add_command(self, command: fantas.RenderCommand):
         """
@@ -98,6 +281,25 @@ class RenderCommand(ABC):
         """
         pass
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时此渲染命令可能影响的区域，在主线程中调用。
+        返回的区域必须完全覆盖实际绘制的像素，并且渲染时只能使用遵守裁剪区域的绘制操作。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域，返回 None 表示不能分块渲染（作为屏障串行执行），默认为 None。
+        """
+        return None
+
+    def render_tile(self, target_surface: fantas.Surface):
+        """
+        分块渲染时在单个块内执行渲染操作，可能在多个线程中同时调用，不能修改自身状态。
+        Args:
+            target_surface (fantas.Surface): 设置了裁剪区域的目标 Surface 对象。
+        """
+        self.render(target_surface)
+
 @dataclass(slots=True)
 class SurfaceRenderCommand(RenderCommand):
     """
@@ -110,6 +312,7 @@ class SurfaceRenderCommand(RenderCommand):
     surface  : fantas.Surface  = field(init=False)
     dest_rect: fantas.RectLike = field(init=False)
     fill_mode: fantas.FillMode = field(init=False)
+    area     : fantas.IntRect | None = field(default=None, init=False)    # 只绘制 surface 中的这一区域（IGNORE 模式，用于纹理图集），为 None 表示整个 surface
 
     affected_area: fantas.RectLike = field(init=False, repr=False)                 # 受影响的矩形区域
 
@@ -131,13 +334,44 @@ class SurfaceRenderCommand(RenderCommand):
         """
         return self.affected_area.collidepoint(point)
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时的影响区域，只有 IGNORE 和 REPEAT 填充模式可以分块渲染（缩放类模式在每个块里都要重复缩放）。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域。
+        """
+        if self.fill_mode is fantas.FillMode.IGNORE:
+            # 预先计算受影响区域，分块渲染时不再修改
+            size = self.surface.get_size() if self.area is None else self.area.size
+            bounds = self.affected_area = target_rect.clip(fantas.IntRect(fantas.IntRect(self.dest_rect).topleft, size))
+            return bounds
+        elif self.fill_mode is fantas.FillMode.REPEAT:
+            self.affected_area = self.dest_rect
+            return fantas.IntRect(self.dest_rect).inflate(2, 2)
+        return None
+
+    def render_tile(self, target_surface: fantas.Surface):
+        """
+        分块渲染时在单个块内执行渲染操作。
+        Args:
+            target_surface (fantas.Surface): 设置了裁剪区域的目标 Surface 对象。
+        """
+        if self.fill_mode is fantas.FillMode.IGNORE:
+            # 不写回 blit 返回的区域（只是块内的部分），受影响区域已在 get_tile_bounds 中计算
+            target_surface.blit(self.surface, self.dest_rect, self.area)
+        else:
+            # REPEAT 模式只会写入与 get_tile_bounds 相同的受影响区域
+            self.render_REPEAT(target_surface)
+
     def render_IGNORE(self, target_surface: fantas.Surface):
         """
         执行 IGNORE 填充模式的渲染操作。
         Args:
             target_surface (fantas.Surface): 目标 Surface 对象。
         """
-        self.affected_area = target_surface.blit(self.surface, self.dest_rect)
+        self.affected_area = target_surface.blit(self.surface, self.dest_rect, self.area)
 
     def render_SCALE(self, target_surface: fantas.Surface):
         """
@@ -219,6 +453,20 @@ class SurfaceRenderCommand(RenderCommand):
         scaled_surface = fantas.transform.smoothscale(self.surface, (w, h))
         target_surface.blit(scaled_surface, (left, top), ((w - width) // 2, (h - height) // 2, width, height))
 
+def render_surface_batch(target_surface: fantas.Surface, batch: list[SurfaceRenderCommand]):
+    """
+    用一次 Surface.blits() 执行一批 IGNORE 填充模式的 Surface 渲染命令。
+    Args:
+        target_surface (fantas.Surface): 目标 Surface 对象。
+        batch (list[SurfaceRenderCommand]): 按绘制顺序排列的渲染命令。
+    """
+    if len(batch) == 1:
+        batch[0].render_IGNORE(target_surface)
+        return
+    rects = target_surface.blits([(command.surface, command.dest_rect, command.area) for command in batch])
+    for command, rect in zip(batch, rects):
+        command.affected_area = rect
+
 # SurfaceRenderCommand 渲染映射表
 SurfaceRenderCommand_render_map = {
     fantas.FillMode.IGNORE     : SurfaceRenderCommand.render_IGNORE,
@@ -259,6 +507,18 @@ class ColorFillCommand(RenderCommand):
         """
         return self.dest_rect.collidepoint(point)
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时的影响区域。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域。
+        """
+        if self.dest_rect is None:
+            return target_rect
+        return fantas.IntRect(self.dest_rect).inflate(2, 2)
+
 class ColorBackgroundFillCommand(RenderCommand):
     """
     颜色背景填充命令类。
@@ -285,6 +545,16 @@ class ColorBackgroundFillCommand(RenderCommand):
         """
         return True
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时的影响区域，即整个目标。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域。
+        """
+        return target_rect
+
 @dataclass(slots=True)
 class LabelRenderCommand(RenderCommand):
     """
@@ -324,6 +594,16 @@ class LabelRenderCommand(RenderCommand):
         """
         return self.rect.collidepoint(point)
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时的影响区域（向外扩展以覆盖抗锯齿边缘）。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域。
+        """
+        return fantas.IntRect(self.rect).inflate(4, 4)
+
 @dataclass(slots=True)
 class TextRenderCommand(RenderCommand):
     """
@@ -445,7 +725,7 @@ class TextRenderCommand(RenderCommand):
                 ar_append(target_surface.blit(sf, r.topleft, (0, r.top - rt.top, r.width, r.height)))
             origin_y += line_height
 
-    def render_RIGHT(self, target_surface: fantas.Surface, wraps: tuple[tuple[str, int]]):
+    def render_RIGHT(self, target_surface: fantas.Surface):
         """
         右对齐渲染。
         Args:
@@ -776,6 +1056,17 @@ class QuarterCircleRenderCommand(RenderCommand):
         # 距离测试
         return self.radius * self.radius >= dx * dx + dy * dy >= self.width * self.width
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时的影响区域（整个圆的外接矩形，向外扩展以覆盖抗锯齿边缘）。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域。
+        """
+        r = int(self.radius) + 2
+        return fantas.IntRect(int(self.center[0]) - r, int(self.center[1]) - r, 2 * r + 1, 2 * r + 1)
+
 @dataclass(slots=True)
 class LinearGradientRenderCommand(RenderCommand):
     """
@@ -831,6 +1122,18 @@ class LinearGradientRenderCommand(RenderCommand):
         """
         return self.rect.collidepoint(point)
 
+    def get_tile_bounds(self, target_rect: fantas.IntRect) -> fantas.IntRect | None:
+        """
+        获取分块渲染时的影响区域，缓存需要重新生成时不能分块渲染。
+        Args:
+            target_rect (fantas.IntRect): 目标 Surface 的矩形区域。
+        Returns:
+            fantas.IntRect | None: 影响区域。
+        """
+        if self.cache_dirty:
+            return None
+        return fantas.IntRect(self.rect)
+
     def render_horizontal(self):
         """
         执行水平线性渐变渲染操作。
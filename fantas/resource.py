@@ -1,12 +1,22 @@
 from __future__ import annotations
+import os
+import weakref
+import threading
+import hashlib
+from collections import OrderedDict
 from pathlib import Path
 from typing import Generic, TypeVar
 from collections.abc import Callable
+from concurrent.futures import Future, CancelledError
 from dataclasses import dataclass, field
 
 import fantas
 
 __all__ = (
+    "ImageHandle",
+    "ResourceStats",
+    "AtlasRegion",
+    "TextureAtlas",
     "images",
     "fonts",
     "colors",
@@ -50,23 +60,279 @@ def image_convert_alpha_hook(surface: fantas.Surface) -> fantas.Surface:
     """ 图像转换钩子函数，将图像转换为与显示器兼容的格式。 """
     return surface.convert_alpha()
 
+def image_keep_hook(surface: fantas.Surface) -> fantas.Surface:
+    """ 图像转换钩子函数，不转换（用于已经是显示格式的预解码图像）。 """
+    return surface
+
+@dataclass(slots=True)
+class ImageHandle:
+    """
+    异步加载的图像句柄，可以直接作为 fantas.Image 的 surface 使用。
+    加载完成前 surface 是占位图，加载完成后在 UI 线程中被替换为真正的图像。
+    Args:
+        name   : 资源名称。
+        surface: 当前的 Surface（占位图或加载完成的图像）。
+    """
+    name   : str
+    surface: fantas.Surface
+
+    ready    : bool                                       = field(default=False, init=False)                     # 是否已加载完成
+    error    : BaseException | None                       = field(default=None, init=False)                      # 加载失败时的异常
+    future   : Future | None                              = field(default=None, init=False, repr=False)          # 后台任务的 Future 对象
+    loader   : ImageLoader | None                         = field(default=None, init=False, repr=False)          # 发起加载的图像资源加载器
+    callbacks: list[Callable[[ImageHandle], None]]        = field(default_factory=list, init=False, repr=False)  # 完成回调列表
+
+    @property
+    def done(self) -> bool:
+        """ 是否已结束（加载完成或失败）。 """
+        return self.ready or self.error is not None
+
+    def add_done_callback(self, callback: Callable[[ImageHandle], None]):
+        """
+        添加完成回调，加载完成或失败后在 UI 线程中以句柄为参数调用，已经结束时立即调用。
+        比如按需重绘的窗口可以在回调中调用 window.invalidate()。
+        Args:
+            callback (Callable[[ImageHandle], None]): 完成回调。
+        """
+        if self.done:
+            callback(self)
+        else:
+            self.callbacks.append(callback)
+
+    def cancel(self) -> bool:
+        """
+        取消尚未开始解码的加载任务，取消成功后 error 为 CancelledError，并调用完成回调。
+        Returns:
+            bool: 是否取消成功。
+        """
+        if self.done or self.future is None or not self.future.cancel():
+            return False
+        if self.loader is not None and self.loader._pending.get(self.name) is self:
+            del self.loader._pending[self.name]
+        self.error = CancelledError()
+        callbacks = self.callbacks
+        self.callbacks = []
+        for callback in callbacks:
+            callback(self)
+        return True
+
+@dataclass(slots=True)
+class ResourceStats:
+    """
+    单个图像资源的统计信息。
+    Args:
+        name: 资源名称。
+    """
+    name: str
+
+    bytes     : int  = field(default=0, init=False)        # 像素数据占用的字节数（最近一次加载时）
+    reloadable: bool = field(default=False, init=False)    # 是否可以被淘汰并重新加载
+    resident  : bool = field(default=False, init=False)    # 是否在内存中
+    loads     : int  = field(default=0, init=False)        # 加载次数（包括重新加载）
+    hits      : int  = field(default=0, init=False)        # get() 命中次数
+    misses    : int  = field(default=0, init=False)        # get() 未命中（需要重新加载）次数
+    evictions : int  = field(default=0, init=False)        # 被淘汰的次数
+    reuses    : int  = field(default=0, init=False)        # 被淘汰后仍被引用、get() 时直接复用（没有重新解码）的次数
+
+# 默认的占位图（1x1 全透明），首次使用时创建
+default_placeholder: fantas.Surface | None = None
+
+def get_default_placeholder() -> fantas.Surface:
+    """ 获取默认的占位图（1x1 全透明）。 """
+    global default_placeholder
+    if default_placeholder is None:
+        default_placeholder = fantas.Surface((1, 1), fantas.SRCALPHA)
+    return default_placeholder
+
 @dataclass(slots=True)
 class ImageLoader(ResourceLoader[fantas.Surface]):
-    """ 图像资源加载器。 """
+    """
+    图像资源加载器。
+    可以设置字节预算：超出预算时，按照最近最少使用的顺序淘汰标记为可重新加载的资源，
+    被淘汰的资源在下一次 get() 时从来源路径重新解码，对调用方透明；不可重新加载的资源计入预算但不会被淘汰。
+    """
+    _pending: dict[str, ImageHandle] = field(default_factory=dict, init=False)    # 资源名称 -> 正在异步加载的图像句柄
+
+    budget_bytes: int | None                     = field(default=None, init=False)                           # 字节预算，为 None 表示不限制
+    total_bytes : int                            = field(default=0, init=False)                              # 在内存中的资源占用的字节数
+    _sources    : dict[str, tuple]               = field(default_factory=dict, init=False, repr=False)       # 资源名称 -> (加载函数, 参数, 转换钩子)，仅可重新加载的资源
+    _lru        : OrderedDict[str, None]         = field(default_factory=OrderedDict, init=False, repr=False)    # 在内存中的可重新加载资源，最久未使用的在前
+    _stats      : dict[str, ResourceStats]       = field(default_factory=dict, init=False, repr=False)       # 资源名称 -> 统计信息
+    _evicted    : dict[str, weakref.ref]         = field(default_factory=dict, init=False, repr=False)       # 资源名称 -> 被淘汰的 Surface 的弱引用（可能仍被图像句柄或 UI 元素引用）
+
+    svg_cache_dir: Path | None                   = field(default=None, init=False)                           # SVG 光栅化结果的磁盘缓存目录，为 None 表示不使用磁盘缓存
+    _svg_sources : dict[str, tuple]              = field(default_factory=dict, init=False, repr=False)       # SVG 资源名称 -> (SVG 文件路径, 转换钩子)
+    _svg_sizes   : dict[str, set[int]]           = field(default_factory=dict, init=False, repr=False)       # SVG 资源名称 -> 光栅化过的尺寸
+    _file_hashes : dict[Path, tuple]             = field(default_factory=dict, init=False, repr=False)       # 文件路径 -> (修改时间, 大小, sha256)
+
+    def get(self, name: str) -> fantas.Surface:
+        """
+        根据名称获取已加载的图像资源，已被淘汰的可重新加载资源会被同步重新解码。
+        Args:
+            name (str): 资源名称。
+        Returns:
+            fantas.Surface: 图像资源。
+        Raises:
+            KeyError: 如果资源未加载则引发此异常。
+        """
+        surface = self._resources.get(name)
+        if surface is not None:
+            stats = self._stats.get(name)
+            if stats is not None:
+                stats.hits += 1
+            if name in self._lru:
+                self._lru.move_to_end(name)
+            return surface
+        source = self._sources.get(name)
+        if source is None:
+            return ResourceLoader.get(self, name)
+        # 被淘汰的 Surface 仍被引用（图像句柄、UI 元素）时直接复用，避免内存中同时存在两份
+        ref = self._evicted.pop(name, None)
+        surface = None if ref is None else ref()
+        if surface is not None:
+            self.store(name, surface, source, reused=True)
+            return surface
+        func, args, hook = source
+        self._stats[name].misses += 1
+        surface = hook(func(*args))
+        self.store(name, surface, source)
+        return surface
+
+    def set(self, name: str, resource: fantas.Surface):
+        """
+        手动设置图像资源（不可重新加载）。
+        Args:
+            name (str): 资源名称。
+            resource (fantas.Surface): 图像资源。
+        """
+        self.store(name, resource)
+
+    def store(self, name: str, surface: fantas.Surface, source: tuple | None = None, reused: bool = False):
+        """
+        登记一个图像资源并更新统计，必要时淘汰其他资源。
+        Args:
+            name (str): 资源名称。
+            surface (fantas.Surface): 图像资源。
+            source (tuple | None): (加载函数, 参数, 转换钩子)，为 None 表示不可重新加载。
+            reused (bool): 是否是复用被淘汰但仍被引用的 Surface（不计入加载次数）。
+        """
+        self.discard(name)
+        self._evicted.pop(name, None)
+        stats = self._stats.get(name)
+        if stats is None:
+            self._stats[name] = stats = ResourceStats(name)
+        stats.bytes = fantas.surface_bytes(surface)
+        stats.reloadable = source is not None
+        stats.resident = True
+        if reused:
+            stats.reuses += 1
+        else:
+            stats.loads += 1
+        self._resources[name] = surface
+        self.total_bytes += stats.bytes
+        if source is not None:
+            self._sources[name] = source
+            self._lru[name] = None
+        else:
+            self._sources.pop(name, None)
+        self.evict(keep=name)
+
+    def discard(self, name: str):
+        """
+        从内存中移除一个资源（保留来源，可重新加载的资源之后仍然可以 get()）。
+        Args:
+            name (str): 资源名称。
+        """
+        if self._resources.pop(name, None) is None:
+            return
+        stats = self._stats[name]
+        stats.resident = False
+        self.total_bytes -= stats.bytes
+        self._lru.pop(name, None)
+
+    def unload(self, name: str):
+        """
+        彻底卸载一个资源（包括来源与统计）。
+        Args:
+            name (str): 资源名称。
+        """
+        self.discard(name)
+        self._sources.pop(name, None)
+        self._stats.pop(name, None)
+        self._evicted.pop(name, None)
+
+    def evict(self, keep: str | None = None):
+        """
+        按照最近最少使用的顺序淘汰可重新加载的资源，直到不超过字节预算。
+        被淘汰资源的内存在没有图像句柄或 UI 元素引用它的 Surface 之后才会真正释放，在此之前 get() 会直接复用它，
+        它占用的字节数可以通过 get_retained_bytes() 获取。
+        Args:
+            keep (str | None): 不淘汰的资源名称（一般是刚加载的资源）。
+        """
+        if self.budget_bytes is None:
+            return
+        lru = self._lru
+        while self.total_bytes > self.budget_bytes and lru:
+            name = next(iter(lru))
+            if name == keep:
+                if len(lru) == 1:
+                    break
+                lru.move_to_end(name)
+                continue
+            self._evicted[name] = weakref.ref(self._resources[name])
+            self.discard(name)
+            self._stats[name].evictions += 1
 
-    def load_bitmap(self, path: Path, alias: str = None, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_hook):
+    def set_budget(self, budget_bytes: int | None):
+        """
+        设置字节预算，并立即淘汰超出预算的资源。
+        Args:
+            budget_bytes (int | None): 字节预算，为 None 表示不限制。
+        Raises:
+            ValueError: 字节预算小于 0。
+        """
+        if budget_bytes is not None and budget_bytes < 0:
+            raise ValueError("字节预算不能小于 0。")
+        self.budget_bytes = budget_bytes
+        self.evict()
+
+    def get_retained_bytes(self) -> int:
+        """
+        获取已被淘汰、但仍被图像句柄或 UI 元素引用而没有释放的 Surface 占用的字节数（不计入 total_bytes）。
+        Returns:
+            int: 字节数。
+        """
+        retained = 0
+        for name, ref in list(self._evicted.items()):
+            if ref() is None:
+                del self._evicted[name]
+            else:
+                retained += self._stats[name].bytes
+        return retained
+
+    def get_stats(self) -> dict[str, ResourceStats]:
+        """
+        获取所有图像资源的统计信息。
+        Returns:
+            dict[str, ResourceStats]: 资源名称 -> 统计信息。
+        """
+        return dict(self._stats)
+
+    def load_bitmap(self, path: Path, alias: str = None, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_hook, reloadable: bool = False):
         """
         加载位图图像资源。
         Args:
             path (Path): 图像文件路径。
             alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
             hook (Callable[[fantas.Surface], fantas.Surface], optional): 图像转换钩子函数，默认为 image_convert_hook。
+            reloadable (bool, optional): 是否可以在超出字节预算时被淘汰，并在下一次 get() 时从 path 重新加载。
         """
         if not isinstance(path, Path):
             path = Path(path)
-        self._resources[alias if alias else path.stem] = hook(fantas.image.load(path))
+        source = (fantas.image.load, (path,), hook)
+        self.store(alias if alias else path.stem, hook(fantas.image.load(path)), source if reloadable else None)
 
-    def load_svg(self, path: Path, alias: str = None, size: int = 64, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_alpha_hook):
+    def load_svg(self, path: Path, alias: str = None, size: int = 64, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_alpha_hook, reloadable: bool = False):
         """
         加载 SVG 图像资源。
         Args:
@@ -74,12 +340,535 @@ class ImageLoader(ResourceLoader[fantas.Surface]):
             alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
             size (int, optional): 图像最长边大小，默认为 64 像素。
             hook (Callable[[fantas.Surface], fantas.Surface], optional): 图像转换钩子函数，默认为 image_convert_alpha_hook。
+            reloadable (bool, optional): 是否可以在超出字节预算时被淘汰，并在下一次 get() 时从 path 重新加载。
+        """
+        if not isinstance(path, Path):
+            path = Path(path)
+        source = (fantas.image.load_sized_svg, (path, (size, size)), hook)
+        self.store(alias if alias else path.stem, hook(fantas.image.load_sized_svg(path, (size, size))), source if reloadable else None)
+
+    def register_svg(self, path: Path | fantas.BundleEntry, alias: str = None, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_alpha_hook):
+        """
+        登记 SVG 图像资源但不光栅化，之后通过 get_svg() 按需光栅化为任意尺寸。
+        重复登记同名资源会丢弃之前光栅化的所有尺寸。
+        Args:
+            path (Path | fantas.BundleEntry): SVG 文件路径或资源包中的 SVG 条目。
+            alias (str, optional): 资源别名，默认为 None，使用文件名（条目名称）作为资源名称。
+            hook (Callable[[fantas.Surface], fantas.Surface], optional): 图像转换钩子函数，默认为 image_convert_alpha_hook。
+        """
+        if isinstance(path, fantas.BundleEntry):
+            name = alias if alias else path.name
+        else:
+            if not isinstance(path, Path):
+                path = Path(path)
+            name = alias if alias else path.stem
+        self.unregister_svg(name)
+        self._svg_sources[name] = (path, hook)
+        self._svg_sizes[name] = set()
+
+    def unregister_svg(self, name: str):
+        """
+        取消登记 SVG 图像资源，并卸载它光栅化的所有尺寸（不会删除磁盘缓存）。
+        Args:
+            name (str): 资源名称。
+        """
+        self._svg_sources.pop(name, None)
+        for size in self._svg_sizes.pop(name, ()):
+            self.unload(f"{name}@{size}")
+
+    def get_svg(self, name: str, size: int) -> fantas.Surface:
+        """
+        获取 SVG 图像资源在某个尺寸下的光栅化结果，没有时依次尝试磁盘缓存和光栅化。
+        结果以 '名称@尺寸' 登记为可重新加载的资源，受字节预算约束。
+        Args:
+            name (str): register_svg() 登记的资源名称。
+            size (int): 图像最长边大小（像素），高 DPI 或缩放时传入实际的像素尺寸。
+        Returns:
+            fantas.Surface: 光栅化后的图像。
+        Raises:
+            KeyError: SVG 资源未登记。
+        """
+        key = f"{name}@{size}"
+        handle = self._pending.get(key)
+        if handle is None and (key in self._resources or key in self._sources):
+            return self.get(key)
+        if name not in self._svg_sources:
+            raise KeyError(f"SVG 资源 '{name}' 未登记。")
+        if handle is not None:
+            # get_svg_async() 的结果要在 UI 线程交付时才可用，在此等待会死锁：
+            # 尽量取消后台任务，改为同步光栅化并直接完成句柄，之后交付的结果会被 on_loaded() 丢弃
+            handle.future.cancel()
+            del self._pending[key]
+        hook = self._svg_sources[name][1]
+        source = (self.rasterize_svg, (name, size), hook)
+        try:
+            surface = hook(self.rasterize_svg(name, size))
+        except Exception as e:
+            if handle is not None:
+                self.complete(handle, error=e)
+            raise
+        self._svg_sizes[name].add(size)
+        self.store(key, surface, source)
+        if handle is not None:
+            self.complete(handle, surface)
+        return surface
+
+    def get_svg_async(self, name: str, size: int, placeholder: fantas.Surface | None = None, executor: fantas.Executor | None = None) -> ImageHandle:
+        """
+        在后台获取 SVG 图像资源在某个尺寸下的光栅化结果。
+        Args:
+            name (str): register_svg() 登记的资源名称。
+            size (int): 图像最长边大小（像素）。
+            placeholder (fantas.Surface | None, optional): 完成前显示的占位图，默认为 1x1 的全透明图像。
+            executor (fantas.Executor | None, optional): 执行光栅化的执行器，默认为 fantas.thread_executor。
+        Returns:
+            ImageHandle: 图像句柄。
+        Raises:
+            KeyError: SVG 资源未登记。
+        """
+        if name not in self._svg_sources:
+            raise KeyError(f"SVG 资源 '{name}' 未登记。")
+        self._svg_sizes[name].add(size)
+        return self.load_async(f"{name}@{size}", self._svg_sources[name][1], placeholder, executor, True, self.rasterize_svg, name, size)
+
+    def rasterize_svg(self, name: str, size: int) -> fantas.Surface:
+        """
+        光栅化 SVG 图像资源（不执行转换钩子），设置了 svg_cache_dir 时优先读取磁盘缓存并写回光栅化结果。
+        可以在工作线程中调用。
+        Args:
+            name (str): 资源名称。
+            size (int): 图像最长边大小（像素）。
+        Returns:
+            fantas.Surface: 光栅化后的图像。
+        """
+        path = self._svg_sources[name][0]
+        if path.__class__ is fantas.BundleEntry:
+            # 资源包中的 SVG：从内存映射读取，哈希在打包时已经计算
+            digest = path.digest
+            path = path.open()
+        cache_dir = self.svg_cache_dir
+        if cache_dir is None:
+            return fantas.image.load_sized_svg(path, (size, size))
+        if isinstance(path, Path):
+            digest = self.get_file_hash(path)
+        cache_path = cache_dir / f"{digest}_{size}.png"
+        if cache_path.is_file():
+            try:
+                return fantas.image.load(cache_path)
+            except fantas.pygame.error:
+                pass    # 缓存文件损坏，重新光栅化
+        surface = fantas.image.load_sized_svg(path, (size, size))
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # 同一个进程中可能有多个线程同时写同一个缓存文件（同步与异步获取同一尺寸、内容相同的 SVG）
+            temp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp.png")
+            fantas.image.save(surface, temp)
+            os.replace(temp, cache_path)
+        except (OSError, fantas.pygame.error):
+            pass        # 写缓存失败不影响加载
+        return surface
+
+    def get_file_hash(self, path: Path) -> str:
+        """
+        计算文件内容的 sha256，文件的修改时间和大小不变时使用缓存的结果。
+        Args:
+            path (Path): 文件路径。
+        Returns:
+            str: 十六进制的 sha256。
+        """
+        stat = path.stat()
+        cached = self._file_hashes.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._file_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def set_svg_cache_dir(self, path: Path | None):
+        """
+        设置 SVG 光栅化结果的磁盘缓存目录，缓存文件名为 'SVG 文件的 sha256_尺寸.png'，SVG 文件修改后自动失效。
+        Args:
+            path (Path | None): 缓存目录，不存在时在第一次写入时创建，为 None 表示不使用磁盘缓存。
+        """
+        self.svg_cache_dir = None if path is None else Path(path)
+
+    def load_bundle(self, bundle: fantas.AssetBundle, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_alpha_hook, lazy: bool = True):
+        """
+        登记资源包中的所有图像资源，它们都是可重新加载的。SVG 条目登记为多尺寸 SVG 资源。
+        预解码的像素已经是显示格式，直接使用内存映射作为像素缓冲区，不执行转换钩子。
+        Args:
+            bundle (fantas.AssetBundle): 资源包。
+            hook (Callable[[fantas.Surface], fantas.Surface], optional): 编码的位图与 SVG 的转换钩子，默认为 image_convert_alpha_hook。
+            lazy (bool, optional): 是否在第一次 get() 时才解码位图，默认为 True。
+        """
+        for entry in bundle.get_entries("bitmap", "pixels", "svg"):
+            if entry.kind == "svg":
+                self.register_svg(entry, hook=hook)
+                continue
+            source = (entry.load_surface, (), hook if entry.kind == "bitmap" else image_keep_hook)
+            if not lazy:
+                self.store(entry.name, source[2](entry.load_surface()), source)
+                continue
+            # 只登记来源，第一次 get() 时解码
+            self.discard(entry.name)
+            stats = self._stats.get(entry.name)
+            if stats is None:
+                self._stats[entry.name] = stats = ResourceStats(entry.name)
+            stats.reloadable = True
+            self._sources[entry.name] = source
+
+    def load_bitmap_async(self, path: Path, alias: str = None, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_hook, placeholder: fantas.Surface | None = None, executor: fantas.Executor | None = None, reloadable: bool = False) -> ImageHandle:
+        """
+        在后台工作池中解码位图图像资源，立即返回一个以占位图填充的句柄。
+        解码完成后，转换钩子在 UI 线程中执行（由执行器分批交付，每帧最多 deliver_limit 个），随后替换句柄中的 Surface 并登记资源。
+        Args:
+            path (Path): 图像文件路径。
+            alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
+            hook (Callable[[fantas.Surface], fantas.Surface], optional): 图像转换钩子函数，默认为 image_convert_hook。
+            placeholder (fantas.Surface | None, optional): 占位图，默认为 1x1 的全透明图像。
+            executor (fantas.Executor | None, optional): 执行解码的执行器，默认为 fantas.thread_executor。
+            reloadable (bool, optional): 是否可以在超出字节预算时被淘汰，并在下一次 get() 时从 path 重新加载。
+        Returns:
+            ImageHandle: 图像句柄，同名资源正在加载时返回同一个句柄，已经加载过时返回已完成的句柄。
+        """
+        if not isinstance(path, Path):
+            path = Path(path)
+        return self.load_async(alias if alias else path.stem, hook, placeholder, executor, reloadable, fantas.image.load, path)
+
+    def load_svg_async(self, path: Path, alias: str = None, size: int = 64, hook: Callable[[fantas.Surface], fantas.Surface] = image_convert_alpha_hook, placeholder: fantas.Surface | None = None, executor: fantas.Executor | None = None, reloadable: bool = False) -> ImageHandle:
+        """
+        在后台工作池中光栅化 SVG 图像资源，立即返回一个以占位图填充的句柄，用法同 load_bitmap_async()。
+        Args:
+            path (Path): SVG 文件路径。
+            alias (str, optional): 资源别名，默认为 None，使用文件名作为资源名称。
+            size (int, optional): 图像最长边大小，默认为 64 像素。
+            hook (Callable[[fantas.Surface], fantas.Surface], optional): 图像转换钩子函数，默认为 image_convert_alpha_hook。
+            placeholder (fantas.Surface | None, optional): 占位图，默认为 1x1 的全透明图像。
+            executor (fantas.Executor | None, optional): 执行光栅化的执行器，默认为 fantas.thread_executor。
+            reloadable (bool, optional): 是否可以在超出字节预算时被淘汰，并在下一次 get() 时从 path 重新加载。
+        Returns:
+            ImageHandle: 图像句柄。
         """
         if not isinstance(path, Path):
             path = Path(path)
-        self._resources[alias if alias else path.stem] = hook(fantas.image.load_sized_svg(path, size))
+        return self.load_async(alias if alias else path.stem, hook, placeholder, executor, reloadable, fantas.image.load_sized_svg, path, (size, size))
+
+    def load_async(self, name: str, hook: Callable[[fantas.Surface], fantas.Surface], placeholder: fantas.Surface | None, executor: fantas.Executor | None, reloadable: bool, func: Callable[..., fantas.Surface], /, *args) -> ImageHandle:
+        """
+        在后台工作池中执行图像加载函数，立即返回一个以占位图填充的句柄。
+        Args:
+            name (str): 资源名称。
+            hook (Callable[[fantas.Surface], fantas.Surface]): 图像转换钩子函数，在 UI 线程中执行。
+            placeholder (fantas.Surface | None): 占位图，为 None 时使用 1x1 的全透明图像。
+            executor (fantas.Executor | None): 执行器，为 None 时使用 fantas.thread_executor。
+            reloadable (bool): 是否可以在超出字节预算时被淘汰并重新加载。
+            func (Callable[..., fantas.Surface]): 图像加载函数，在工作池中执行。
+            args (tuple): 图像加载函数的参数。
+        Returns:
+            ImageHandle: 图像句柄。
+        """
+        handle = self._pending.get(name)
+        if handle is not None:
+            return handle
+        if name in self._resources:
+            handle = ImageHandle(name, self.get(name))
+            handle.ready = True
+            return handle
+        handle = ImageHandle(name, placeholder if placeholder is not None else get_default_placeholder())
+        handle.loader = self
+        self._pending[name] = handle
+        if executor is None:
+            executor = fantas.thread_executor
+        source = (func, args, hook) if reloadable else None
+        handle.future = executor.submit(lambda future: self.on_loaded(handle, source, hook, future), func, *args)
+        return handle
+
+    def on_loaded(self, handle: ImageHandle, source: tuple | None, hook: Callable[[fantas.Surface], fantas.Surface], future: Future):
+        """
+        异步加载完成时在 UI 线程中调用，执行转换钩子并替换句柄中的 Surface。
+        Args:
+            handle (ImageHandle): 图像句柄。
+            source (tuple | None): (加载函数, 参数, 转换钩子)，为 None 表示不可重新加载。
+            hook (Callable[[fantas.Surface], fantas.Surface]): 图像转换钩子函数。
+            future (Future): 后台任务的 Future 对象。
+        """
+        # 句柄已经被 get_svg() 同步完成，丢弃后台的结果
+        if handle.done:
+            return
+        if self._pending.get(handle.name) is handle:
+            del self._pending[handle.name]
+        try:
+            surface = hook(future.result())
+        except Exception as e:
+            self.complete(handle, error=e)
+        else:
+            self.store(handle.name, surface, source)
+            self.complete(handle, surface)
+
+    def complete(self, handle: ImageHandle, surface: fantas.Surface | None = None, error: BaseException | None = None):
+        """
+        在 UI 线程中完成图像句柄：替换句柄中的 Surface 或记录异常，并调用完成回调。
+        Args:
+            handle (ImageHandle): 图像句柄。
+            surface (fantas.Surface | None, optional): 加载完成的图像。
+            error (BaseException | None, optional): 加载失败时的异常。
+        """
+        if error is not None:
+            handle.error = error
+        else:
+            handle.surface = surface
+            handle.ready = True
+        callbacks = handle.callbacks
+        handle.callbacks = []
+        for callback in callbacks:
+            callback(handle)
+
+    def get_handle(self, name: str) -> ImageHandle:
+        """
+        根据名称获取图像句柄：正在异步加载时返回加载中的句柄，已经加载时返回已完成的句柄。
+        Args:
+            name (str): 资源名称。
+        Returns:
+            ImageHandle: 图像句柄。
+        Raises:
+            KeyError: 如果资源未加载也不在加载中则引发此异常。
+        """
+        handle = self._pending.get(name)
+        if handle is not None:
+            return handle
+        handle = ImageHandle(name, self.get(name))
+        handle.ready = True
+        return handle
+
+    def get_pending_count(self) -> int:
+        """
+        获取正在异步加载的图像数量。
+        Returns:
+            int: 正在加载的图像数量。
+        """
+        return len(self._pending)
 images = ImageLoader()
 
+@dataclass(slots=True)
+class AtlasRegion:
+    """
+    纹理图集中的一块区域，可以直接作为 fantas.Image 的 surface 使用。
+    IGNORE 填充模式下直接从图集页面绘制（连续的绘制会被渲染器合并为一次 Surface.blits()），其他填充模式使用子 Surface。
+    Args:
+        atlas: 所属的纹理图集。
+        name : 区域名称。
+        page : 所在页面的序号。
+        rect : 在页面中的矩形区域。
+    """
+    atlas: TextureAtlas = field(repr=False)
+    name : str
+    page : int
+    rect : fantas.IntRect
+
+    subsurface: fantas.Surface | None = field(default=None, init=False, repr=False)    # 子 Surface 缓存
+
+    @property
+    def page_surface(self) -> fantas.Surface:
+        """ 所在的页面。 """
+        return self.atlas.pages[self.page]
+
+    @property
+    def surface(self) -> fantas.Surface:
+        """ 区域的子 Surface（与页面共享像素数据）。 """
+        if self.subsurface is None:
+            self.subsurface = self.page_surface.subsurface(self.rect)
+        return self.subsurface
+
+    def get_size(self) -> tuple[int, int]:
+        """
+        获取区域的尺寸。
+        Returns:
+            tuple[int, int]: (宽, 高)。
+        """
+        return self.rect.size
+
+@dataclass(slots=True)
+class TextureAtlas:
+    """
+    纹理图集，用天际线（skyline）算法把大量小图像（图标、缩略图）装入少数几张大 Surface，
+    减少逐个绘制的开销。页面装满后自动新建页面。
+    Args:
+        page_size: 页面边长（像素）。
+        padding  : 区域之间的间隔（像素），避免缩放时采样到相邻区域。
+    """
+    page_size: int = 1024
+    padding  : int = 1
+
+    pages   : list[fantas.Surface]        = field(default_factory=list, init=False, repr=False)    # 页面
+    skylines: list[list[list[int]]]       = field(default_factory=list, init=False, repr=False)    # 每个页面的天际线 [[x, y, 宽], ...]，按 x 排序
+    regions : dict[str, AtlasRegion]      = field(default_factory=dict, init=False, repr=False)    # 区域名称 -> 区域
+
+    def __post_init__(self):
+        if self.page_size <= 0:
+            raise ValueError("页面边长必须大于 0。")
+        if self.padding < 0:
+            raise ValueError("区域间隔不能小于 0。")
+
+    def get(self, name: str) -> AtlasRegion:
+        """
+        根据名称获取区域。
+        Args:
+            name (str): 区域名称。
+        Returns:
+            AtlasRegion: 区域。
+        Raises:
+            KeyError: 区域不存在。
+        """
+        if name not in self.regions:
+            raise KeyError(f"图集区域 '{name}' 不存在。")
+        return self.regions[name]
+
+    def add(self, name: str, surface: fantas.Surface) -> AtlasRegion:
+        """
+        把一个图像装入图集，像素数据会被复制（保留逐像素透明度、颜色键和整体透明度）。
+        Args:
+            name (str): 区域名称。
+            surface (fantas.Surface): 图像。
+        Returns:
+            AtlasRegion: 图像所在的区域。
+        Raises:
+            ValueError: 区域名称已存在，或图像比页面还大。
+        """
+        if name in self.regions:
+            raise ValueError(f"图集区域 '{name}' 已存在。")
+        w, h = surface.get_size()
+        padding = self.padding
+        size = self.page_size
+        if w + padding > size or h + padding > size:
+            raise ValueError(f"图像 '{name}' 的尺寸 {w}x{h} 超出了图集页面的边长 {size}。")
+        for page, skyline in enumerate(self.skylines):
+            position = self.find_position(skyline, w + padding, h + padding)
+            if position is not None:
+                break
+        else:
+            page = len(self.pages)
+            self.pages.append(fantas.Surface((size, size), fantas.SRCALPHA))
+            self.skylines.append(skyline := [[0, 0, size]])
+            position = self.find_position(skyline, w + padding, h + padding)
+        index, x, y = position
+        self.place(skyline, index, x, y, w + padding, h + padding)
+        # 页面是全透明的，相加即复制，不会像普通 blit 那样与页面混合
+        self.pages[page].blit(self.normalize(surface), (x, y), special_flags=fantas.BLEND_RGBA_ADD)
+        self.regions[name] = region = AtlasRegion(self, name, page, fantas.IntRect(x, y, w, h))
+        return region
+
+    @staticmethod
+    def normalize(surface: fantas.Surface) -> fantas.Surface:
+        """
+        把带颜色键或整体透明度的图像转换为只用逐像素透明度表示的图像。
+        BLEND_RGBA_ADD 会忽略颜色键和整体透明度，直接相加会让颜色键像素变成不透明的、
+        让 set_alpha() 的图像变成全透明的。
+        Args:
+            surface (fantas.Surface): 图像。
+        Returns:
+            fantas.Surface: 转换后的图像，不需要转换时返回原图像。
+        """
+        alpha = surface.get_alpha()
+        colorkey = surface.get_colorkey()
+        if colorkey is None and (alpha is None or alpha == 255):
+            return surface
+        result = fantas.Surface(surface.get_size(), fantas.SRCALPHA)
+        # 去掉整体透明度后贴到全透明图像上：颜色键像素被跳过，其余像素原样复制
+        opaque = surface.copy()
+        opaque.set_alpha(None)
+        result.blit(opaque, (0, 0))
+        if alpha is not None and alpha < 255:
+            # 把整体透明度乘进透明通道
+            result.fill((255, 255, 255, alpha), special_flags=fantas.BLEND_RGBA_MULT)
+        return result
+
+    def add_many(self, items: dict[str, fantas.Surface]) -> dict[str, AtlasRegion]:
+        """
+        把多个图像装入图集，按高度从大到小装入以减少浪费。
+        Args:
+            items (dict[str, fantas.Surface]): 区域名称 -> 图像。
+        Returns:
+            dict[str, AtlasRegion]: 区域名称 -> 区域。
+        """
+        order = sorted(items.items(), key=lambda item: (item[1].get_height(), item[1].get_width()), reverse=True)
+        return {name: self.add(name, surface) for name, surface in order}
+
+    def find_position(self, skyline: list[list[int]], w: int, h: int) -> tuple[int, int, int] | None:
+        """
+        在天际线上寻找放置位置（最低优先，其次最左）。
+        Args:
+            skyline (list[list[int]]): 天际线。
+            w (int): 宽度（包括间隔）。
+            h (int): 高度（包括间隔）。
+        Returns:
+            tuple[int, int, int] | None: (天际线线段序号, x, y)，放不下时返回 None。
+        """
+        size = self.page_size
+        best = None
+        for i, (x, _, _) in enumerate(skyline):
+            if x + w > size:
+                break
+            # 区域底边是它覆盖的所有线段中最高的
+            y = 0
+            remain = w
+            j = i
+            while remain > 0:
+                segment = skyline[j]
+                if segment[1] > y:
+                    y = segment[1]
+                remain -= segment[2]
+                j += 1
+            if y + h <= size and (best is None or y < best[2]):
+                best = (i, x, y)
+        return best
+
+    @staticmethod
+    def place(skyline: list[list[int]], index: int, x: int, y: int, w: int, h: int):
+        """
+        在天际线上放置一个区域并更新天际线。
+        Args:
+            skyline (list[list[int]]): 天际线。
+            index (int): find_position() 返回的线段序号。
+            x (int): 区域左边。
+            y (int): 区域底边（天际线高度）。
+            w (int): 宽度（包括间隔）。
+            h (int): 高度（包括间隔）。
+        """
+        skyline.insert(index, [x, y + h, w])
+        # 裁掉被新线段覆盖的线段
+        end = x + w
+        i = index + 1
+        while i < len(skyline):
+            segment = skyline[i]
+            if segment[0] >= end:
+                break
+            shrink = end - segment[0]
+            if segment[2] <= shrink:
+                del skyline[i]
+                continue
+            segment[0] += shrink
+            segment[2] -= shrink
+            break
+        # 合并相同高度的相邻线段
+        i = 0
+        while i < len(skyline) - 1:
+            if skyline[i][1] == skyline[i + 1][1]:
+                skyline[i][2] += skyline[i + 1][2]
+                del skyline[i + 1]
+            else:
+                i += 1
+
+    def get_usage(self) -> float:
+        """
+        获取图集的空间利用率。
+        Returns:
+            float: 所有区域的面积之和与所有页面面积之比，没有页面时为 0。
+        """
+        if not self.pages:
+            return 0.0
+        used = sum(region.rect.width * region.rect.height for region in self.regions.values())
+        return used / (len(self.pages) * self.page_size * self.page_size)
+
 @dataclass(slots=True)
 class FontLoader(ResourceLoader[fantas.Font]):
     """ 字体资源加载器。 """
@@ -98,6 +887,18 @@ class FontLoader(ResourceLoader[fantas.Font]):
         font.kerning = True
         self._resources[alias if alias else path.stem] = font
 
+    def load_bundle(self, bundle: fantas.AssetBundle):
+        """
+        加载资源包中的所有字体，字体数据直接从内存映射中读取。
+        Args:
+            bundle (fantas.AssetBundle): 资源包。
+        """
+        for entry in bundle.get_entries("font"):
+            font = fantas.Font(entry.open())
+            font.origin = True
+            font.kerning = True
+            self._resources[entry.name] = font
+
     _default_sysfont: fantas.Font | None = None
     def get_default_sysfont(self) -> fantas.Font:
         """ 获取默认系统字体。 """
@@ -124,6 +925,15 @@ class ColorLoader(ResourceLoader[fantas.Color]):
             name (str, optional): 资源名称，默认为 None，使用颜色字符串作为资源名称。
         """
         self._resources[name if name else color] = fantas.Color(color)
+
+    def load_bundle(self, bundle: fantas.AssetBundle):
+        """
+        加载资源包中的所有颜色。
+        Args:
+            bundle (fantas.AssetBundle): 资源包。
+        """
+        for entry in bundle.get_entries("color"):
+            self._resources[entry.name] = fantas.Color(entry.value)
     
     def load_preset_colors(self):
         """ 加载预设颜色。 """
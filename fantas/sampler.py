@@ -0,0 +1,217 @@
+from __future__ import annotations
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FrameType
+
+import fantas
+
+__all__ = (
+    "Sampler",
+    "SamplingProfiler",
+)
+
+@dataclass(slots=True)
+class SamplingProfiler:
+    """
+    采样分析器，由后台线程按照固定频率抓取目标线程（默认主线程）的调用栈，按主循环阶段聚合，
+    可以导出为火焰图工具（flamegraph.pl、speedscope、Perfetto）使用的折叠栈格式。
+    主循环阶段来自 DebugTimer：两次 DebugTimer.record() 之间的采样归入后一次记录的标签；
+    没有 DebugTimer 提交（如 mainloop()）时，超过 commit_timeout_ns 的采样归入 'Main'。
+    Args:
+        interval         : 采样间隔（秒）。
+        thread_id        : 被采样的线程 ID，为 None 表示主线程。
+        max_depth        : 每个调用栈最多保留的帧数（从最内层算起）。
+        commit_timeout_ns: 等待阶段标签的最长时间（纳秒）。
+    """
+    interval         : float      = 0.005
+    thread_id        : int | None = None
+    max_depth        : int        = 128
+    commit_timeout_ns: int        = 500_000_000
+
+    counts     : dict[tuple[str, ...], int] = field(default_factory=dict, init=False, repr=False)           # (阶段, 最外层帧, ..., 最内层帧) -> 采样数
+    pending    : list[tuple[str, ...]]      = field(default_factory=list, init=False, repr=False)           # 等待阶段标签的调用栈
+    last_commit: int                        = field(default_factory=fantas.get_time_ns, init=False, repr=False)    # 上一次提交阶段标签的时间点（纳秒）
+    samples    : int                        = field(default=0, init=False)                                  # 采样总数
+    names      : dict[CodeType, str]        = field(default_factory=dict, init=False, repr=False)           # 代码对象 -> 帧名称缓存
+    lock       : threading.Lock             = field(default_factory=threading.Lock, init=False, repr=False)    # 保护 counts 和 pending
+    thread     : threading.Thread | None    = field(default=None, init=False, repr=False)                   # 采样线程
+    stop_event : threading.Event            = field(default_factory=threading.Event, init=False, repr=False)    # 停止采样线程的事件
+
+    def __post_init__(self):
+        if self.interval <= 0:
+            raise ValueError("采样间隔必须大于 0。")
+        if self.thread_id is None:
+            self.thread_id = threading.main_thread().ident
+
+    def start(self):
+        """
+        启动采样线程，已经启动时什么也不做。
+        """
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="FantasSampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        停止采样线程，并把尚未提交的采样归入 'Main'。
+        """
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(1.0)
+        self.thread = None
+        self.commit("Main")
+
+    def run(self):
+        """
+        采样线程的主函数。
+        """
+        # 简化引用
+        current_frames = sys._current_frames
+        get_time_ns = fantas.get_time_ns
+        wait = self.stop_event.wait
+        interval = self.interval
+        thread_id = self.thread_id
+        while not wait(interval):
+            frame = current_frames().get(thread_id)
+            if frame is None:
+                break
+            stack = self.extract(frame)
+            del frame
+            with self.lock:
+                self.pending.append(stack)
+                self.samples += 1
+            # 没有 DebugTimer 提交阶段标签
+            if get_time_ns() - self.last_commit > self.commit_timeout_ns:
+                self.commit("Main")
+
+    def extract(self, frame: FrameType) -> tuple[str, ...]:
+        """
+        提取调用栈。
+        Args:
+            frame (FrameType): 最内层的帧。
+        Returns:
+            tuple[str, ...]: 从最外层到最内层的帧名称（'文件名:限定名称'）。
+        """
+        names = self.names
+        stack = []
+        depth = self.max_depth
+        while frame is not None and depth:
+            code = frame.f_code
+            name = names.get(code)
+            if name is None:
+                names[code] = name = f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+            stack.append(name)
+            frame = frame.f_back
+            depth -= 1
+        stack.reverse()
+        return tuple(stack)
+
+    def commit(self, label: str):
+        """
+        把上一次提交之后的采样归入一个主循环阶段，由 DebugTimer.record() 调用。
+        Args:
+            label (str): 阶段标签。
+        """
+        with self.lock:
+            pending = self.pending
+            self.pending = []
+            self.last_commit = fantas.get_time_ns()
+            counts = self.counts
+            for stack in pending:
+                key = (label, *stack)
+                counts[key] = counts.get(key, 0) + 1
+
+    def phase_counts(self) -> dict[str, int]:
+        """
+        获取每个主循环阶段的采样数。
+        Returns:
+            dict[str, int]: 阶段标签 -> 采样数。
+        """
+        result = {}
+        with self.lock:
+            for key, count in self.counts.items():
+                result[key[0]] = result.get(key[0], 0) + count
+        return result
+
+    def collapsed(self) -> str:
+        """
+        转换为折叠栈格式，每行是 '阶段;最外层帧;...;最内层帧 采样数'。
+        Returns:
+            str: 折叠栈文本。
+        """
+        with self.lock:
+            items = sorted(self.counts.items())
+        return "".join(f"{';'.join(key)} {count}\n" for key, count in items)
+
+    def dump(self, path: Path | str):
+        """
+        导出为折叠栈格式的文本文件。
+        Args:
+            path (Path | str): 文件路径。
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.collapsed())
+
+    def clear(self):
+        """
+        清空所有采样。
+        """
+        with self.lock:
+            self.counts.clear()
+            self.pending.clear()
+            self.samples = 0
+            self.last_commit = fantas.get_time_ns()
+
+class Sampler:
+    """
+    全局采样开关，封装采样分析器的启动、停止与导出。
+    没有启动采样时，DebugTimer.record() 只多一次属性检查。
+    """
+    profiler: SamplingProfiler | None = None    # 当前的采样分析器，为 None 表示没有在采样
+
+    @staticmethod
+    def start(interval: float = 0.005, max_depth: int = 128) -> SamplingProfiler:
+        """
+        开始采样主线程，已经在采样时会继续使用原来的分析器。
+        Args:
+            interval  (float): 采样间隔（秒）。
+            max_depth (int)  : 每个调用栈最多保留的帧数。
+        Returns:
+            SamplingProfiler: 采样分析器。
+        """
+        if Sampler.profiler is None:
+            Sampler.profiler = SamplingProfiler(interval, max_depth=max_depth)
+            Sampler.profiler.start()
+        return Sampler.profiler
+
+    @staticmethod
+    def stop() -> SamplingProfiler | None:
+        """
+        停止采样。
+        Returns:
+            SamplingProfiler | None: 停止前的采样分析器，可以继续导出。
+        """
+        profiler = Sampler.profiler
+        Sampler.profiler = None
+        if profiler is not None:
+            profiler.stop()
+        return profiler
+
+    @staticmethod
+    def dump(path: Path | str):
+        """
+        把当前采样分析器的采样导出为折叠栈格式的文本文件，不会停止采样。
+        Args:
+            path (Path | str): 文件路径。
+        Raises:
+            RuntimeError: 没有在采样。
+        """
+        if Sampler.profiler is None:
+            raise RuntimeError("没有在采样，请先调用 fantas.Sampler.start()。")
+        Sampler.profiler.dump(path)
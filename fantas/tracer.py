@@ -0,0 +1,133 @@
+from __future__ import annotations
+import os
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fantas
+
+__all__ = (
+    "Tracer",
+    "TraceRecorder",
+)
+
+@dataclass(slots=True)
+class TraceRecorder:
+    """
+    追踪记录器，把时间片段（主循环阶段、事件监听器、帧函数、渲染命令）记录在有界环形缓冲区中，
+    缓冲区满了之后最旧的片段会被覆盖，可以随时导出为 Chrome Trace Event 格式的 JSON，在 Perfetto 或 chrome://tracing 中查看。
+    Args:
+        capacity: 环形缓冲区最多保存的片段数量。
+    """
+    capacity: int = 200_000
+
+    spans     : deque = field(init=False, repr=False)                           # 片段环形缓冲区 [(名称, 类别, 开始时间点（纳秒）, 结束时间点（纳秒）, 线程 ID, 参数字典 | None), ...]
+    total     : int   = field(default=0, init=False)                            # 记录过的片段总数（包括已被覆盖的）
+    start_time: int   = field(default_factory=fantas.get_time_ns, init=False)   # 开始记录的时间点（纳秒），导出时作为时间零点
+
+    def __post_init__(self):
+        self.spans = deque(maxlen=self.capacity)
+
+    def add(self, name: str, category: str, start: int, end: int, args: dict | None = None):
+        """
+        记录一个时间片段。
+        Args:
+            name     (str)        : 片段名称。
+            category (str)        : 片段类别（phase、event、framefunc、render）。
+            start    (int)        : 开始时间点（纳秒，fantas.get_time_ns()）。
+            end      (int)        : 结束时间点（纳秒）。
+            args     (dict | None): 附加参数，会显示在 Perfetto 的详情面板中。
+        """
+        self.spans.append((name, category, start, end, threading.get_ident(), args))
+        self.total += 1
+
+    @property
+    def dropped(self) -> int:
+        """ 已被覆盖的片段数量。 """
+        return self.total - len(self.spans)
+
+    def clear(self):
+        """
+        清空所有片段。
+        """
+        self.spans.clear()
+        self.total = 0
+        self.start_time = fantas.get_time_ns()
+
+    def to_chrome_trace(self) -> dict:
+        """
+        转换为 Chrome Trace Event 格式（完整事件 "X"，时间单位为微秒）。
+        Returns:
+            dict: 可以直接序列化为 JSON 的追踪数据。
+        """
+        pid = os.getpid()
+        start_time = self.start_time
+        threads = {}
+        trace_events = []
+        append = trace_events.append
+        for name, category, start, end, tid, args in tuple(self.spans):
+            event = {"name": name, "cat": category, "ph": "X", "ts": (start - start_time) / 1e3, "dur": (end - start) / 1e3, "pid": pid, "tid": tid}
+            if args:
+                event["args"] = args
+            append(event)
+            threads.setdefault(tid, None)
+        # 线程名称元数据
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for tid in threads:
+            append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": names.get(tid, str(tid))}})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": {"version": fantas.__version__, "dropped": self.dropped}}
+
+    def dump(self, path: Path | str):
+        """
+        导出为 Chrome Trace Event 格式的 JSON 文件。
+        Args:
+            path (Path | str): 文件路径。
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file, ensure_ascii=False, separators=(",", ":"))
+
+class Tracer:
+    """
+    全局追踪开关，封装追踪记录器的启动、停止与导出。
+    没有启动追踪时，被追踪的代码路径只多一次属性检查。
+    """
+    recorder: TraceRecorder | None = None    # 当前的追踪记录器，为 None 表示没有在追踪
+
+    @staticmethod
+    def start(capacity: int = 200_000) -> TraceRecorder:
+        """
+        开始追踪，已经在追踪时会继续使用原来的记录器。
+        Args:
+            capacity (int): 环形缓冲区最多保存的片段数量。
+        Returns:
+            TraceRecorder: 追踪记录器。
+        """
+        if Tracer.recorder is None:
+            Tracer.recorder = TraceRecorder(capacity)
+        return Tracer.recorder
+
+    @staticmethod
+    def stop() -> TraceRecorder | None:
+        """
+        停止追踪。
+        Returns:
+            TraceRecorder | None: 停止前的追踪记录器，可以继续导出。
+        """
+        recorder = Tracer.recorder
+        Tracer.recorder = None
+        return recorder
+
+    @staticmethod
+    def dump(path: Path | str):
+        """
+        把当前追踪记录器中的片段导出为 Chrome Trace Event 格式的 JSON 文件，不会停止追踪。
+        Args:
+            path (Path | str): 文件路径。
+        Raises:
+            RuntimeError: 没有在追踪。
+        """
+        if Tracer.recorder is None:
+            raise RuntimeError("没有在追踪，请先调用 fantas.Tracer.start()。")
+        Tracer.recorder.dump(path)
@@ -13,7 +13,7 @@ def create_UDP_socket(host: str = '127.0.0.1', port: int = 0, timeout: float = N
     Args:
         host (str, optional): 绑定的主机地址，默认为 '127.0.0.1'。
         port (int, optional): 绑定的端口号，默认为 0，表示自动分配端口。
-        timeout (float, optional): 套接字超时时间，默认为 None，表示阻塞模式。
+        timeout (float, optional): 套接字超时时间，默认为 None，表示阻塞模式，为 0 时表示非阻塞模式。
     """
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     udp_socket.bind((host, port))
@@ -30,15 +30,21 @@ def get_socket_port(socket: socket.socket) -> int:
     """
     return socket.getsockname()[1]
 
-def udp_send_data(udp_socket: socket.socket, data: bytes, addr: tuple[str, int]):
+def udp_send_data(udp_socket: socket.socket, data: bytes, addr: tuple[str, int]) -> bool:
     """
     通过 UDP 套接字发送数据。
     Args:
         udp_socket (socket.socket): 目标 UDP 套接字。
         data (bytes): 要发送的数据字节。
         addr (tuple[str, int]): 目标地址，包含主机和端口号。
+    Returns:
+        bool: 是否发送成功，非阻塞模式下发送缓冲区已满时返回 False（数据被丢弃）。
     """
-    udp_socket.sendto(data, addr)
+    try:
+        udp_socket.sendto(data, addr)
+    except BlockingIOError:
+        return False
+    return True
 
 def udp_receive_data(udp_socket: socket.socket, buffer_size: int = 65535) -> tuple[bytes, tuple[str, int]]:
     """
@@ -47,11 +53,11 @@ def udp_receive_data(udp_socket: socket.socket, buffer_size: int = 65535) -> tup
         udp_socket (socket.socket): 目标 UDP 套接字。
         buffer_size (int, optional): 接收缓冲区大小，默认为 65535 字节。
     Returns:
-        tuple[bytes, tuple[str, int]]: 接收到的数据字节和发送方地址。
+        tuple[bytes, tuple[str, int]]: 接收到的数据字节和发送方地址，超时或者非阻塞模式下没有数据时返回 (None, None)。
     """
     try:
         data, addr = udp_socket.recvfrom(buffer_size)
-    except socket.timeout:
+    except (socket.timeout, BlockingIOError):
         return None, None
     except ConnectionResetError:
         return None, None
@@ -129,11 +129,11 @@ class Image(UI):
     """
     图像显示类。
     Args:
-        surface  : 显示的 Surface 对象。
+        surface  : 显示的 Surface 对象，也可以是异步加载的图像句柄（加载完成前显示占位图）或纹理图集中的区域。
         rect     : 矩形区域。
         fill_mode: 填充模式。
     """
-    surface  : fantas.Surface
+    surface  : fantas.Surface | fantas.ImageHandle | fantas.AtlasRegion
     rect     : fantas.RectLike = None
     fill_mode: fantas.FillMode = fantas.FillMode.IGNORE
 
@@ -143,7 +143,22 @@ class Image(UI):
         """ 初始化 Image 实例 """
         self.command = fantas.SurfaceRenderCommand(creator=self)
         if self.rect is None:
-            self.rect = fantas.Rect((0, 0), self.surface.get_size())
+            surface = self.surface
+            if isinstance(surface, fantas.ImageHandle):
+                # 尚未加载完成时尺寸取自占位图，加载完成后改为图像的尺寸
+                if not surface.done:
+                    surface.add_done_callback(self.fit_loaded_surface)
+                surface = surface.surface
+            self.rect = fantas.Rect((0, 0), surface.get_size())
+
+    def fit_loaded_surface(self, handle: fantas.ImageHandle):
+        """
+        异步加载完成时把由占位图决定的矩形区域改为图像的尺寸，图像已经不再使用这个句柄或加载失败时不改变。
+        Args:
+            handle (fantas.ImageHandle): 加载完成的图像句柄。
+        """
+        if handle.ready and self.surface is handle:
+            self.rect.size = handle.surface.get_size()
 
     def create_render_commands(self, offset: fantas.Point = (0, 0)):
         """
@@ -158,7 +173,20 @@ class Image(UI):
         offset = rect.topleft
         # 生成 Surface 渲染命令
         c = self.command
-        c.surface = self.surface
+        surface = self.surface
+        if surface.__class__ is fantas.ImageHandle:
+            surface = surface.surface
+        if surface.__class__ is fantas.AtlasRegion:
+            if self.fill_mode is fantas.FillMode.IGNORE:
+                # 直接从图集页面绘制，便于渲染器合并
+                c.surface = surface.page_surface
+                c.area = surface.rect
+            else:
+                c.surface = surface.surface
+                c.area = None
+        else:
+            c.surface = surface
+            c.area = None
         c.fill_mode = self.fill_mode
         c.dest_rect = rect
         yield c
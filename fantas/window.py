@@ -1,5 +1,7 @@
 from __future__ import annotations
+import os
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
 import fantas
@@ -10,6 +12,7 @@ __all__ = (
     "Window",
     "MultiWindow",
     "DebugTimer",
+    "AdaptiveFps",
 )
 
 @dataclass(slots=True)
@@ -26,6 +29,10 @@ class WindowConfig:
         mouse_focus (bool): 窗口是否在创建时获得鼠标焦点。
         input_focus (bool): 窗口是否在创建时获得输入焦点。
         allow_high_dpi (bool): 是否允许高 DPI 显示。
+        on_demand (bool): 是否按需重绘，仅在 MultiWindow 帧调度模式下生效，启用后只有窗口被标记失效时才会重绘。
+        adaptive_fps (bool): 是否启用自适应帧率，根据帧耗时和系统负载在 min_fps 与 fps 之间调整实际帧率。
+        min_fps (int): 自适应帧率的下限。
+        metrics (bool): 是否在主循环中记录常驻指标（帧数、掉帧数、阶段耗时、渲染命令数等），开销很低，默认开启。
     """
     title          : str                   = "Fantas Window"
     window_size    : fantas.IntPoint       = (1280, 720)
@@ -36,6 +43,10 @@ class WindowConfig:
     mouse_focus    : bool                  = True
     input_focus    : bool                  = True
     allow_high_dpi : bool                  = True
+    on_demand      : bool                  = False
+    adaptive_fps   : bool                  = False
+    min_fps        : int                   = 15
+    metrics        : bool                  = True
 
 class Window(PygameWindow):
     """
@@ -66,6 +77,23 @@ class Window(PygameWindow):
         self.renderer     : fantas.Renderer     = fantas.Renderer(self)    # 窗口的渲染器对象
         self.root_ui      : fantas.WindowRoot   = fantas.WindowRoot(window=self)      # 窗口的根 UI 元素
         self.event_handler: fantas.EventHandler = fantas.EventHandler(window=self)    # 窗口的事件处理器对象
+        # 帧调度相关状态（仅在 MultiWindow 帧调度模式下使用）
+        self.on_demand       : bool = window_config.on_demand    # 是否按需重绘
+        self.invalidated     : bool = True                       # 是否已被标记失效（需要重绘）
+        self.next_deadline   : int  = 0                          # 下一帧的截止时间点（纳秒）
+        self.missed_deadlines: int  = 0                          # 错过的截止时间次数（跳过的帧数）
+        # 自适应帧率控制器，未启用时为 None
+        self.adaptive_fps: AdaptiveFps | None = AdaptiveFps(min_fps=window_config.min_fps, max_fps=window_config.fps) if window_config.adaptive_fps else None
+        # 事件轨迹录制器，需要在进入主循环之前设置
+        self.event_recorder: fantas.EventRecorder | None = None
+        # 帧耗时统计，mainloop() 中需要手动设置，mainloop_debug() 会自动创建
+        self.frame_stats: fantas.FrameStats | None = None
+        # 常驻指标，未启用时为 None
+        self.metrics: fantas.FrameMetrics | None = fantas.FrameMetrics() if window_config.metrics else None
+        # 指标导出器，需要在进入主循环之前设置
+        self.metrics_exporter: fantas.MetricsExporter | None = None
+        # 内存增长跟踪器，mainloop() 中需要手动设置，mainloop_debug() 在启用内存统计时会自动创建
+        self.memory_tracker: fantas.MemoryTracker | None = None
 
         # 方便访问根 UI 元素的方法
         self.append: Callable = self.root_ui.append
@@ -77,6 +105,12 @@ class Window(PygameWindow):
         self.add_event_listener   : Callable = self.event_handler.add_event_listener
         self.remove_event_listener: Callable = self.event_handler.remove_event_listener
 
+    def invalidate(self):
+        """
+        标记窗口失效，在 MultiWindow 帧调度模式下，窗口会在下一个截止时间到达时重绘。
+        """
+        self.invalidated = True
+
     def mainloop(self):
         """
         进入窗口的主事件循环，直到窗口关闭。
@@ -91,6 +125,17 @@ class Window(PygameWindow):
         root_ui = self.root_ui
         screen = self.screen
         flip = self.flip
+        get_time_ns = fantas.get_time_ns
+        adaptive_fps = self.adaptive_fps
+        frame_stats = self.frame_stats
+        metrics = self.metrics
+        metrics_exporter = self.metrics_exporter if metrics is not None else None
+        queue = self.renderer.queue
+        memory_tracker = self.memory_tracker
+        measure = adaptive_fps is not None or frame_stats is not None or metrics is not None
+        # 录制事件轨迹
+        if self.event_recorder is not None:
+            get = self.event_recorder.wrap(get)
         # 清空事件队列
         fantas.event.clear()
         # 预生成传递路径缓存
@@ -99,17 +144,45 @@ class Window(PygameWindow):
         while self.running:
             # 限制帧率
             tick(self.fps)
+            if measure:
+                frame_start = get_time_ns()
             # 处理事件
-            for event in get():
+            events = get()
+            for event in events:
                 handle_event(event)
+            if metrics is not None:
+                event_end = get_time_ns()
             # 运行帧函数
             run_framefuncs()
+            if metrics is not None:
+                framefunc_end = get_time_ns()
             # 生成渲染命令
             pre_render(root_ui)
+            if metrics is not None:
+                pre_render_end = get_time_ns()
             # 渲染窗口
             render(screen)
             # 更新窗口显示
             flip()
+            if measure:
+                frame_end = get_time_ns()
+                frame_ns = frame_end - frame_start
+                # 记录常驻指标
+                if metrics is not None:
+                    metrics.record_frame(frame_start, event_end, framefunc_end, pre_render_end, frame_end, len(events), len(queue), self.fps)
+                    if metrics_exporter is not None:
+                        metrics_exporter.poll(metrics)
+                # 记录帧耗时
+                if frame_stats is not None:
+                    frame_stats.record_frame(frame_ns, self.fps)
+                # 根据帧耗时调整帧率
+                if adaptive_fps is not None:
+                    self.fps = adaptive_fps.update(frame_ns)
+            # 跟踪内存增长
+            if memory_tracker is not None:
+                memory_tracker.poll(root_ui)
+        if self.event_recorder is not None:
+            self.event_recorder.close()
         self.destroy()
 
     def mainloop_debug(self):
@@ -128,8 +201,16 @@ class Window(PygameWindow):
         flip = self.flip
         EVENTLOG = fantas.DebugFlag.EVENTLOG
         TIMERECORD = fantas.DebugFlag.TIMERECORD
+        MOUSEMAGNIFY = fantas.DebugFlag.MOUSEMAGNIFY
+        RENDERPROFILE = fantas.DebugFlag.RENDERPROFILE
+        MEMORY = fantas.DebugFlag.MEMORY
         DEBUGRECEIVED = fantas.DEBUGRECEIVED
-        send_debug_data = fantas.Debug.send_debug_data
+        send_event_log = fantas.Debug.send_event_log
+        send_time_records = fantas.Debug.send_time_records
+        flush_debug = fantas.Debug.flush
+        # 录制事件轨迹
+        if self.event_recorder is not None:
+            get = self.event_recorder.wrap(get)
         # 清空事件队列
         fantas.event.clear()
         # 预生成传递路径缓存
@@ -139,12 +220,26 @@ class Window(PygameWindow):
         # 监听调试输出事件
         self.add_event_listener(fantas.DEBUGRECEIVED, root_ui, True, self.handle_debug_received_event)
         # 监听鼠标移动事件
+        self.mouse_magnify_pos = None
         if fantas.DebugFlag.MOUSEMAGNIFY in fantas.Debug.debug_flag:
             self.mouse_magnify_ratio = 8
             self.add_event_listener(fantas.MOUSEMOTION, root_ui, True, self.debug_send_mouse_surface)
+        # 统计帧耗时
+        if self.frame_stats is None:
+            self.frame_stats = fantas.FrameStats()
+        frame_stats = self.frame_stats
+        # 分析渲染开销
+        if RENDERPROFILE in fantas.Debug.debug_flag and self.renderer.profiler is None:
+            self.renderer.profiler = fantas.RenderProfiler()
+        # 跟踪内存增长
+        if MEMORY in fantas.Debug.debug_flag and self.memory_tracker is None:
+            self.memory_tracker = fantas.MemoryTracker(interval_ns=1_000_000_000)
+        memory_tracker = self.memory_tracker
         # 创建调试计时器
         self.debug_timer = debug_timer = DebugTimer()
         record = debug_timer.record
+        # 批量发送调试消息，每帧结束时统一发送
+        fantas.Debug.batching = True
         # === 调试 ===
 
         # 主循环
@@ -163,7 +258,7 @@ class Window(PygameWindow):
                 # 发送事件信息到调试窗口
                 record("Event")
                 if EVENTLOG in fantas.Debug.debug_flag and event.type != DEBUGRECEIVED:
-                    send_debug_data(str(event), prompt="EventLog")
+                    send_event_log(event)
                 record("Debug")
                 # === 调试 ===
 
@@ -194,13 +289,34 @@ class Window(PygameWindow):
 
             # === 调试 ===
             record("Render")
-            # 发送计时记录到调试窗口
+            # 记录帧耗时（整帧不计空闲和调试）
+            frame_stats.record(debug_timer.time_records, self.fps)
+            # 根据帧耗时调整帧率
+            if self.adaptive_fps is not None:
+                self.fps = self.adaptive_fps.update(frame_stats.histograms["Frame"].last)
+            # 发送计时记录和帧耗时统计到调试窗口
             if TIMERECORD in fantas.Debug.debug_flag:
-                send_debug_data(debug_timer.time_records, prompt="TimeRecord")
-            # 清空计时记录
+                send_time_records(debug_timer.time_records)
+                fantas.Debug.send_frame_stats(frame_stats)
+            # 发送鼠标放大镜截图
+            if MOUSEMAGNIFY in fantas.Debug.debug_flag:
+                self.debug_capture_mouse_surface()
+            # 发送渲染开销
+            if RENDERPROFILE in fantas.Debug.debug_flag and self.renderer.profiler is not None:
+                fantas.Debug.send_render_profile(self.renderer.profiler)
+            # 发送内存占用
+            if memory_tracker is not None and memory_tracker.poll(root_ui) and MEMORY in fantas.Debug.debug_flag:
+                fantas.Debug.send_memory_report(memory_tracker)
+            # 一次性发送这一帧的所有调试消息
+            flush_debug()
+            # 清空计时记录，发送耗时计入下一帧的调试时间
             debug_timer.clear()
+            record("Debug")
             # === 调试 ===
 
+        fantas.Debug.batching = False
+        if self.event_recorder is not None:
+            self.event_recorder.close()
         self.destroy()
 
     def handle_debug_received_event(self, event: fantas.Event):
@@ -210,33 +326,44 @@ class Window(PygameWindow):
             event (fantas.Event): 触发此事件的 fantas.Event 实例。
         """
         self.debug_timer.record("Event")
+        DebugMessage = fantas.DebugMessage
         while not fantas.Debug.queue.empty():
             data = fantas.Debug.queue.get()
-            if data[0] == "CloseDebugWindow":
-                fantas.Debug.delete_debug_flag(data[1])
-            elif data[0] == "SetMouseMagnifyRatio":
+            if data[0] is DebugMessage.CLOSEDEBUGWINDOW:
+                fantas.Debug.delete_debug_flag(fantas.DebugFlag(data[1]))
+                # 渲染开销窗口关闭后停止分析
+                if data[1] == fantas.DebugFlag.RENDERPROFILE.value:
+                    self.renderer.profiler = None
+            elif data[0] is DebugMessage.SETMOUSEMAGNIFYRATIO:
                 self.mouse_magnify_ratio = data[1]
-                pass
-            else:
-                print(f"[{data[0]}]", end='')
-                for d in data[1:]:
-                    print(f" {d}", end='')
-                print()
+            elif data[0] is DebugMessage.TEXT:
+                print(f"[{data[1]}] {data[2]}")
         self.debug_timer.record("Debug")
 
     def debug_send_mouse_surface(self, event: fantas.Event):
         """
-        发送当前鼠标所在位置的 Surface 截图到调试窗口。
+        记录鼠标位置，在这一帧渲染完成后截图并发送到调试窗口。
         Args:
             event (fantas.Event): 触发此事件的 fantas.Event 实例。
         """
+        # 尚未发送的截图被合并
+        if self.mouse_magnify_pos is not None:
+            fantas.Debug.count_coalesced(fantas.DebugMessage.MOUSEMAGNIFYFRAME)
+        self.mouse_magnify_pos = event.pos
+
+    def debug_capture_mouse_surface(self):
+        """
+        发送当前鼠标所在位置的 Surface 截图到调试窗口，由调试主循环在每帧结束时调用。
+        截图受调试窗口帧率限制，被限制时保留鼠标位置，之后的帧再发送。
+        """
+        if self.mouse_magnify_pos is None:
+            return
         # 获取鼠标位置附近的 Surface 截图
-        self.debug_timer.record("Event")
         size = 256 // self.mouse_magnify_ratio
-        pos = list(event.pos)
+        pos = list(self.mouse_magnify_pos)
         pos[0] = fantas.math.clamp(pos[0], 0, self.size[0] - 1)
         pos[1] = fantas.math.clamp(pos[1], 0, self.size[1] - 1)
-        rect = fantas.IntRect(event.pos[0] - size // 2, event.pos[1] - size // 2, size, size)
+        rect = fantas.IntRect(pos[0] - size // 2, pos[1] - size // 2, size, size)
         if rect.left < 0:
             rect.left = 0
         if rect.top < 0:
@@ -246,23 +373,33 @@ class Window(PygameWindow):
         if rect.bottom > self.size[1]:
             rect.bottom = self.size[1]
         # 发送到调试窗口
-        fantas.Debug.send_debug_data(pos[0] - rect.left, pos[1] - rect.top, self.screen.subsurface(rect).convert_alpha().get_buffer().raw, prompt="MouseMagnify")
-        self.debug_timer.record("Debug")
+        if fantas.Debug.send_mouse_surface(self.screen, rect, pos[0] - rect.left, pos[1] - rect.top):
+            self.mouse_magnify_pos = None
 
 class MultiWindow:
     """
     多窗口管理类，用于管理多个窗口实例。
     """
-    def __init__(self, *windows: Window, fps: int = 60):
+    def __init__(self, *windows: Window, fps: int = 60, parallel_render: bool = False, render_workers: int | None = None, paced: bool = False):
         """
         初始化 MultiWindow 实例。
         Args:
-            *windows (Window): 可变数量的 Window 实例，表示要管理的多个窗口。
-        """
-        self.fps    : int               = fps                                          # 窗口帧率设置
-        self.clock  : fantas.time.Clock = fantas.time.Clock()                          # 用于控制帧率的时钟对象
-        self.windows: dict[int, Window] = {window.id: window for window in windows}    # 管理的窗口字典，键为窗口 ID，值为 Window 实例
-        self.running: bool              = True                                         # 多窗口运行状态标志
+            *windows        (Window)    : 可变数量的 Window 实例，表示要管理的多个窗口。
+            fps             (int)       : 主循环帧率，默认为 60，帧调度模式下不使用。
+            parallel_render (bool)      : 是否在工作线程中并行渲染各个窗口，默认为 False。
+            render_workers  (int | None): 并行渲染的工作线程数量，None 表示窗口数量减一（主线程也会参与渲染）。
+            paced           (bool)      : 是否启用帧调度模式，每个窗口按照自己的帧率（Window.fps）独立重绘，默认为 False。
+        """
+        self.fps            : int               = fps                                          # 窗口帧率设置
+        self.clock          : fantas.time.Clock = fantas.time.Clock()                          # 用于控制帧率的时钟对象
+        self.windows        : dict[int, Window] = {window.id: window for window in windows}    # 管理的窗口字典，键为窗口 ID，值为 Window 实例
+        self.running        : bool              = True                                         # 多窗口运行状态标志
+        self.parallel_render: bool              = parallel_render                              # 是否并行渲染各个窗口
+        self.render_workers : int | None        = render_workers                               # 并行渲染的工作线程数量
+        self.render_pool    : ThreadPoolExecutor | None = None                                 # 并行渲染线程池，进入主循环时创建
+        self.paced          : bool              = paced                                        # 是否启用帧调度模式
+        self.frame_stats    : fantas.FrameStats | None = None                                  # 帧耗时统计，mainloops_debug() 会自动创建
+        self.memory_tracker : fantas.MemoryTracker | None = None                               # 内存增长跟踪器，mainloops_debug() 在启用内存统计时会自动创建
 
     def append(self, window: Window):
         """
@@ -323,10 +460,50 @@ class MultiWindow:
             left += window.size[0] + padding
             bottom = max(bottom, top + window.size[1] + padding)
 
+    def start_render_pool(self):
+        """
+        如果启用了并行渲染，则创建并行渲染线程池。
+        """
+        if self.parallel_render and self.render_pool is None:
+            workers = self.render_workers if self.render_workers is not None else max(1, len(self.windows) - 1)
+            self.render_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fantas-render")
+
+    def stop_render_pool(self):
+        """
+        关闭并行渲染线程池。
+        """
+        if self.render_pool is not None:
+            self.render_pool.shutdown(wait=True)
+            self.render_pool = None
+
+    def render_windows_parallel(self, windows: list[Window]):
+        """
+        并行执行多个窗口的渲染命令队列，全部完成后再依次更新窗口显示。
+        渲染命令需要事先在主线程中生成（pre_render）。
+        Args:
+            windows (list[Window]): 要渲染的窗口列表。
+        """
+        if not windows:
+            return
+        # 其余窗口交给工作线程渲染，最后一个窗口由主线程自己渲染
+        submit = self.render_pool.submit
+        futures = [submit(window.renderer.render, window.screen) for window in windows[:-1]]
+        window = windows[-1]
+        window.renderer.render(window.screen)
+        # 屏障：等待所有窗口渲染完成，工作线程中的异常会在这里重新抛出
+        for future in futures:
+            future.result()
+        # 更新窗口显示（必须在主线程）
+        for window in windows:
+            window.flip()
+
     def mainloops(self):
         """
         进入所有管理窗口的主事件循环，直到所有窗口关闭。
         """
+        if self.paced:
+            self.mainloops_paced()
+            return
         # 简化引用
         tick = self.clock.tick
         get = fantas.event.get
@@ -339,6 +516,10 @@ class MultiWindow:
             window.root_ui.build_pass_path_cache()
             # 注册关闭事件监听器
             window.add_event_listener(fantas.WINDOWCLOSE, window.root_ui, True, self.handle_window_close_event)
+        # 创建并行渲染线程池
+        self.start_render_pool()
+        render_pool = self.render_pool
+        render_windows_parallel = self.render_windows_parallel
         # 主循环
         while self.running:
             # 限制帧率
@@ -359,13 +540,117 @@ class MultiWindow:
             # 运行帧函数
             run_framefuncs()
             # 渲染所有窗口
+            if render_pool is None:
+                for window in windows.values():
+                    # 生成渲染命令
+                    window.renderer.pre_render(window.root_ui)
+                    # 渲染窗口
+                    window.renderer.render(window.screen)
+                    # 更新窗口显示
+                    window.flip()
+            else:
+                window_list = list(windows.values())
+                # 在主线程生成渲染命令
+                for window in window_list:
+                    window.renderer.pre_render(window.root_ui)
+                # 并行渲染并更新窗口显示
+                render_windows_parallel(window_list)
+        self.stop_render_pool()
+
+    def mainloops_paced(self):
+        """
+        以帧调度模式进入所有管理窗口的主事件循环，直到所有窗口关闭。
+        每个窗口按照自己的帧率独立重绘：主循环精确休眠到最早的截止时间，
+        只重绘截止时间已到达的窗口（按需重绘的窗口还需要被标记失效），并统计错过的截止时间。
+        """
+        # 简化引用
+        get = fantas.event.get
+        get_time_ns = fantas.get_time_ns
+        sleep_until_ns = fantas.sleep_until_ns
+        windows = self.windows
+        run_framefuncs = fantas.run_framefuncs
+        # 清空事件队列
+        fantas.event.clear()
+        now = get_time_ns()
+        for window in windows.values():
+            # 预生成传递路径缓存
+            window.root_ui.build_pass_path_cache()
+            # 注册关闭事件监听器
+            window.add_event_listener(fantas.WINDOWCLOSE, window.root_ui, True, self.handle_window_close_event)
+            # 初始化调度状态
+            window.invalidated = True
+            window.next_deadline = now
+        # 创建并行渲染线程池
+        self.start_render_pool()
+        render_pool = self.render_pool
+        render_windows_parallel = self.render_windows_parallel
+        # 主循环
+        while self.running:
+            # 休眠到最早的截止时间
+            sleep_until_ns(min(window.next_deadline for window in windows.values()))
+            # 处理事件
+            for event in get():
+                # 如果事件关联到特定窗口，则只传递给该窗口并标记其失效，否则传递给所有窗口
+                if hasattr(event, 'window'):
+                    window = event.window
+                else:
+                    window = None
+                if window is not None:
+                    window.invalidated = True
+                    window.event_handler.handle_event(event)
+                else:
+                    for window in windows.values():
+                        window.event_handler.handle_event(event)
+            # 运行帧函数
+            run_framefuncs()
+            # 挑选截止时间已到达的窗口，并安排下一个截止时间
+            now = get_time_ns()
+            due_windows = []
             for window in windows.values():
-                # 生成渲染命令
-                window.renderer.pre_render(window.root_ui)
-                # 渲染窗口
-                window.renderer.render(window.screen)
-                # 更新窗口显示
-                window.flip()
+                if now < window.next_deadline:
+                    continue
+                # 按需重绘且没有被标记失效的窗口不需要这一帧，也就谈不上错过截止时间
+                needs_frame = window.invalidated or not window.on_demand
+                if window.fps <= 0:
+                    # 不限帧率：每次唤醒都到期，没有截止时间可以错过
+                    window.next_deadline = now
+                else:
+                    period = 1_000_000_000 // window.fps
+                    late = now - window.next_deadline
+                    if late >= period:
+                        # 错过了至少一个完整周期，重新对齐到当前时间
+                        if needs_frame:
+                            window.missed_deadlines += late // period
+                        window.next_deadline = now + period
+                    else:
+                        window.next_deadline += period
+                if needs_frame:
+                    window.invalidated = False
+                    due_windows.append(window)
+            # 渲染窗口
+            if render_pool is None:
+                for window in due_windows:
+                    # 生成渲染命令
+                    window.renderer.pre_render(window.root_ui)
+                    # 渲染窗口
+                    window.renderer.render(window.screen)
+                    # 更新窗口显示
+                    window.flip()
+            else:
+                # 在主线程生成渲染命令
+                for window in due_windows:
+                    window.renderer.pre_render(window.root_ui)
+                # 并行渲染并更新窗口显示
+                render_windows_parallel(due_windows)
+        self.stop_render_pool()
+
+    def get_missed_deadlines(self) -> dict[int, int]:
+        """
+        获取各个窗口在帧调度模式下错过的截止时间次数。
+        Returns:
+            dict[int, int]: 键为窗口 ID，值为错过的截止时间次数。
+        """
+        return {window_id: window.missed_deadlines for window_id, window in self.windows.items()}
 
     def mainloops_debug(self):
         """
@@ -384,8 +669,25 @@ class MultiWindow:
         record = debug_timer.record
         EVENTLOG = fantas.DebugFlag.EVENTLOG
         TIMERECORD = fantas.DebugFlag.TIMERECORD
+        MOUSEMAGNIFY = fantas.DebugFlag.MOUSEMAGNIFY
+        RENDERPROFILE = fantas.DebugFlag.RENDERPROFILE
+        MEMORY = fantas.DebugFlag.MEMORY
         DEBUGRECEIVED = fantas.DEBUGRECEIVED
-        send_debug_data = fantas.Debug.send_debug_data
+        send_event_log = fantas.Debug.send_event_log
+        send_time_records = fantas.Debug.send_time_records
+        flush_debug = fantas.Debug.flush
+        # 批量发送调试消息，每帧结束时统一发送
+        fantas.Debug.batching = True
+        # 统计帧耗时
+        if self.frame_stats is None:
+            self.frame_stats = fantas.FrameStats()
+        frame_stats = self.frame_stats
+        # 所有窗口共用一个渲染开销分析器（它是线程安全的，可以并行渲染）
+        render_profiler = fantas.RenderProfiler() if RENDERPROFILE in fantas.Debug.debug_flag else None
+        # 所有窗口共用一个内存增长跟踪器
+        if MEMORY in fantas.Debug.debug_flag and self.memory_tracker is None:
+            self.memory_tracker = fantas.MemoryTracker(interval_ns=1_000_000_000)
+        memory_tracker = self.memory_tracker
         # 清空事件队列
         fantas.event.clear()
         for window in windows.values():
@@ -398,11 +700,21 @@ class MultiWindow:
             # 共用计时器
             window.debug_timer = debug_timer
             # 监听调试输出事件
-            window.add_event_listener(fantas.DEBUGRECEIVED, window.root_ui, True, window.read_debug_output)
+            window.add_event_listener(fantas.DEBUGRECEIVED, window.root_ui, True, window.handle_debug_received_event)
             # 监听鼠标移动事件
+            window.mouse_magnify_pos = None
             if fantas.DebugFlag.MOUSEMAGNIFY in fantas.Debug.debug_flag:
+                window.mouse_magnify_ratio = 8
                 window.add_event_listener(fantas.MOUSEMOTION, window.root_ui, True, window.debug_send_mouse_surface)
+            # 分析渲染开销
+            if render_profiler is not None:
+                window.renderer.profiler = render_profiler
             # === 调试 ===
+        # 创建并行渲染线程池
+        self.start_render_pool()
+        render_pool = self.render_pool
+        render_windows_parallel = self.render_windows_parallel
+
         # === 调试 ===
         # 重置调试计时器
         debug_timer.reset()
@@ -424,7 +736,7 @@ class MultiWindow:
                 # 发送事件信息到调试窗口
                 record("Event")
                 if EVENTLOG in fantas.Debug.debug_flag and event.type != DEBUGRECEIVED:
-                    send_debug_data(str(event), "EventLog")
+                    send_event_log(event)
                 record("Debug")
                 # === 调试 ===
 
@@ -441,6 +753,11 @@ class MultiWindow:
 
             # === 调试 ===
             record("Event")
+            # 渲染开销窗口关闭后停止所有窗口的分析（调试事件只由其中一个窗口处理）
+            if render_profiler is not None and RENDERPROFILE not in fantas.Debug.debug_flag:
+                for window in windows.values():
+                    window.renderer.profiler = None
+                render_profiler = None
             # === 调试 ===
 
             # 运行帧函数
@@ -451,31 +768,67 @@ class MultiWindow:
             # === 调试 ===
 
             # 渲染所有窗口
-            for window in windows.values():
-                # 生成渲染命令
-                window.renderer.pre_render(window.root_ui)
+            if render_pool is None:
+                for window in windows.values():
+                    # 生成渲染命令
+                    window.renderer.pre_render(window.root_ui)
+
+                    # === 调试 ===
+                    record("PreRender")
+                    # === 调试 ===
+
+                    # 渲染窗口
+                    window.renderer.render(window.screen)
+                    # 更新窗口显示
+                    window.flip()
+
+                    # === 调试 ===
+                    record("Render")
+                    # === 调试 ===
+            else:
+                window_list = list(windows.values())
+                # 在主线程生成渲染命令
+                for window in window_list:
+                    window.renderer.pre_render(window.root_ui)
 
                 # === 调试 ===
                 record("PreRender")
                 # === 调试 ===
 
-                # 渲染窗口
-                window.renderer.render(window.screen)
-                # 更新窗口显示
-                window.flip()
+                # 并行渲染并更新窗口显示
+                render_windows_parallel(window_list)
 
                 # === 调试 ===
                 record("Render")
                 # === 调试 ===
 
             # === 调试 ===
-            # 发送计时记录到调试窗口
+            # 记录帧耗时（整帧不计空闲和调试）
+            frame_stats.record(debug_timer.time_records, self.fps)
+            # 发送计时记录和帧耗时统计到调试窗口
             if TIMERECORD in fantas.Debug.debug_flag:
-                send_debug_data(debug_timer.time_records, "TimeRecord")
-            # 清空计时记录
+                send_time_records(debug_timer.time_records)
+                fantas.Debug.send_frame_stats(frame_stats)
+            # 发送鼠标放大镜截图
+            if MOUSEMAGNIFY in fantas.Debug.debug_flag:
+                for window in windows.values():
+                    window.debug_capture_mouse_surface()
+            # 发送渲染开销
+            if RENDERPROFILE in fantas.Debug.debug_flag and render_profiler is not None:
+                fantas.Debug.send_render_profile(render_profiler)
+            # 发送内存占用
+            if memory_tracker is not None and memory_tracker.poll(*(window.root_ui for window in windows.values())) and MEMORY in fantas.Debug.debug_flag:
+                fantas.Debug.send_memory_report(memory_tracker)
+            # 一次性发送这一帧的所有调试消息
+            flush_debug()
+            # 清空计时记录，发送耗时计入下一帧的调试时间
             debug_timer.clear()
+            record("Debug")
             # === 调试 ===
 
+        fantas.Debug.batching = False
+        self.stop_render_pool()
+
 @dataclass(slots=True)
 class DebugTimer:
     """
@@ -493,6 +846,12 @@ class DebugTimer:
         """
         current_time = fantas.get_time_ns()
         self.time_records[label] = self.time_records.get(label, 0) + current_time - self.last_time
+        # 追踪时把这一段记录为主循环阶段片段
+        if fantas.Tracer.recorder is not None and current_time > self.last_time:
+            fantas.Tracer.recorder.add(label, "phase", self.last_time, current_time)
+        # 采样时把这一段的采样归入这个阶段
+        if fantas.Sampler.profiler is not None:
+            fantas.Sampler.profiler.commit(label)
         self.last_time = current_time
 
     def reset(self):
@@ -507,3 +866,78 @@ class DebugTimer:
         清空所有时间记录，但不更新上一次记录的时间点。
         """
         self.time_records.clear()
+
+@dataclass(slots=True)
+class AdaptiveFps:
+    """
+    自适应帧率控制器，根据帧耗时和系统负载在上下限之间按倍数调整帧率（比如 60 -> 30 -> 15）。
+    动画应该基于时间（如 fantas.KeyFrameBase），基于帧数的帧函数（如 fantas.FramerBase）会随帧率变化而变慢。
+    Args:
+        min_fps    : 帧率下限。
+        max_fps    : 帧率上限。
+        interval_ns: 评估间隔（纳秒），每隔这么久根据这段时间的平均帧耗时调整一次帧率。
+        high_usage : 平均帧耗时占帧预算的比例超过这个值时降低帧率。
+        low_usage  : 提高帧率后的预计占比低于这个值时才会提高帧率。
+        high_load  : 每核平均系统负载超过这个值时降低帧率。
+        low_load   : 每核平均系统负载低于这个值时才会提高帧率。
+    """
+    min_fps    : int   = 15
+    max_fps    : int   = 60
+    interval_ns: int   = 500_000_000
+    high_usage : float = 0.75
+    low_usage  : float = 0.5
+    high_load  : float = 1.0
+    low_load   : float = 0.7
+
+    fps         : int = field(init=False)                                                   # 当前帧率
+    busy_ns     : int = field(default=0, init=False, repr=False)                            # 当前评估区间内的累计帧耗时（纳秒）
+    frames      : int = field(default=0, init=False, repr=False)                            # 当前评估区间内的帧数
+    start_time  : int = field(default_factory=fantas.get_time_ns, init=False, repr=False)   # 当前评估区间的开始时间点（纳秒）
+    raise_streak: int = field(default=0, init=False, repr=False)                            # 连续满足提高帧率条件的评估次数
+
+    def __post_init__(self):
+        """ 初始化 AdaptiveFps 实例 """
+        self.fps = self.max_fps
+
+    def update(self, busy_ns: int) -> int:
+        """
+        记录一帧的耗时，并在评估间隔到达时调整帧率。
+        Args:
+            busy_ns (int): 这一帧的耗时（纳秒），不包括等待下一帧的空闲时间。
+        Returns:
+            int: 当前应使用的帧率。
+        """
+        self.busy_ns += busy_ns
+        self.frames += 1
+        now = fantas.get_time_ns()
+        if now - self.start_time < self.interval_ns:
+            return self.fps
+        # 平均帧耗时占当前帧预算的比例
+        usage = self.busy_ns / self.frames * self.fps / 1e9
+        load = get_system_load()
+        self.busy_ns = self.frames = 0
+        self.start_time = now
+        if usage > self.high_usage or load > self.high_load:
+            # 过载，立即降低帧率
+            self.raise_streak = 0
+            self.fps = max(self.min_fps, self.fps // 2)
+        elif self.fps < self.max_fps and usage * 2 < self.low_usage and load < self.low_load:
+            # 连续两次评估都有余量才提高帧率，避免来回振荡
+            self.raise_streak += 1
+            if self.raise_streak >= 2:
+                self.raise_streak = 0
+                self.fps = min(self.max_fps, self.fps * 2)
+        else:
+            self.raise_streak = 0
+        return self.fps
+
+def get_system_load() -> float:
+    """
+    获取每核平均系统负载（最近 1 分钟），不支持的平台（如 Windows）返回 0.0。
+    Returns:
+        float: 每核平均系统负载。
+    """
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0